@@ -0,0 +1,187 @@
+"""Local OpenAI-compatible Chat Completions stub for offline load testing.
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream=true`` SSE) and
+``GET /v1/models`` with latency, token rate, upstream errors and 429 rate
+limits drawn from a :class:`~backend.services.latency_sim.LatencyProfile`.
+Point the real ``OpenAIProvider`` at it with
+``OPENAI_BASE_URL=http://localhost:8100/v1`` to benchmark the chat path's
+throughput, retry and concurrency behaviour without paying for API calls.
+
+Run it with ``scripts/openai_stub_server.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+
+from backend.services.latency_sim import LatencyProfile, estimate_tokens
+
+DEFAULT_REPLY = (
+    "This is a simulated Smart Finance Coach reply from the local OpenAI stub. "
+    "Consider trimming discretionary categories first and revisiting your savings target next month."
+)
+
+
+class StubMessage(BaseModel):
+    role: str
+    content: Optional[str] = None
+
+    model_config = ConfigDict(extra="allow")
+
+
+class StubChatCompletionRequest(BaseModel):
+    """Subset of the Chat Completions request body the stub understands."""
+
+    model: str
+    messages: List[StubMessage]
+    stream: bool = False
+    max_tokens: Optional[int] = None
+
+    model_config = ConfigDict(extra="allow")
+
+
+class StubStats:
+    """Counters exposed at ``GET /stub/stats`` to check what the client observed."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rate_limited = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+def _reply_tokens(reply: str, max_tokens: Optional[int]) -> List[str]:
+    words = reply.split(" ")
+    tokens = [word if index == 0 else f" {word}" for index, word in enumerate(words)]
+    return tokens[:max_tokens] if max_tokens else tokens
+
+
+def _error_response(
+    status_code: int, message: str, error_type: str, headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "param": None, "code": None}},
+        headers=headers,
+    )
+
+
+def create_stub_app(profile: Optional[LatencyProfile] = None, reply: str = DEFAULT_REPLY) -> FastAPI:
+    """Build the stub ASGI app for a given latency/failure profile."""
+
+    profile = profile or LatencyProfile()
+    stats = StubStats()
+    app = FastAPI(title="OpenAI Chat Completions stub")
+    app.state.profile = profile
+    app.state.stats = stats
+
+    @app.get("/v1/models")
+    async def list_models() -> Dict[str, Any]:
+        return {"object": "list", "data": [{"id": "stub-model", "object": "model", "owned_by": "stub"}]}
+
+    @app.get("/stub/stats")
+    async def stub_stats() -> Dict[str, int]:
+        return stats.as_dict()
+
+    @app.post("/v1/chat/completions", response_model=None)
+    async def chat_completions(request: StubChatCompletionRequest) -> Any:
+        stats.requests += 1
+        outcome = profile.draw_outcome()
+        if outcome == "rate_limited":
+            stats.rate_limited += 1
+            return _error_response(
+                429,
+                "Rate limit reached for requests (simulated).",
+                "requests",
+                headers={"Retry-After": f"{profile.retry_after_s:g}"},
+            )
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            if outcome == "error":
+                await asyncio.sleep(profile.first_token_delay_s())
+                stats.errors += 1
+                return _error_response(
+                    500, "The server had an error processing your request (simulated).", "server_error"
+                )
+
+            prompt_tokens = sum(estimate_tokens(message.content or "") for message in request.messages)
+            tokens = _reply_tokens(reply, request.max_tokens)
+            completion_id = f"chatcmpl-stub-{uuid4().hex[:16]}"
+            created = int(time.time())
+
+            if request.stream:
+                return StreamingResponse(
+                    _stream_chunks(profile, stats, completion_id, created, request.model, tokens),
+                    media_type="text/event-stream",
+                )
+
+            await asyncio.sleep(profile.completion_delay_s(len(tokens)))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": request.model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": prompt_tokens + len(tokens),
+                },
+            }
+        finally:
+            if not request.stream or outcome != "ok":
+                stats.in_flight -= 1
+
+    return app
+
+
+async def _stream_chunks(
+    profile: LatencyProfile,
+    stats: StubStats,
+    completion_id: str,
+    created: int,
+    model: str,
+    tokens: List[str],
+) -> AsyncIterator[bytes]:
+    def chunk(delta: Dict[str, str], finish_reason: Optional[str] = None) -> bytes:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+    try:
+        await asyncio.sleep(profile.first_token_delay_s())
+        yield chunk({"role": "assistant", "content": ""})
+        token_delay = profile.token_delay_s()
+        for token in tokens:
+            yield chunk({"content": token})
+            if token_delay:
+                await asyncio.sleep(token_delay)
+        yield chunk({}, finish_reason="stop")
+        yield b"data: [DONE]\n\n"
+    finally:
+        stats.in_flight -= 1
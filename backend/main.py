@@ -1,5 +1,7 @@
+import asyncio
 import os
-from typing import List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
 
 import uvicorn
 from fastapi import FastAPI
@@ -8,6 +10,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.routes.chat import router as chat_router
 from backend.routes.health import router as health_router
 from backend.routes.personas import router as personas_router
+from backend.services.ai_client import warm_up_provider
+from backend.services.offload import shutdown_offload_executor
+from backend.services.profiling import ProfilingMiddleware
 
 
 def get_allowed_origins() -> List[str]:
@@ -27,8 +32,37 @@ def get_allowed_origins() -> List[str]:
     return default_origins
 
 
+def enable_slow_callback_detection() -> None:
+    """Log event-loop callbacks slower than ``ASYNCIO_SLOW_CALLBACK_MS`` (development guard)."""
+
+    threshold_ms = os.getenv("ASYNCIO_SLOW_CALLBACK_MS")
+    if not threshold_ms:
+        return
+    loop = asyncio.get_running_loop()
+    loop.set_debug(True)
+    loop.slow_callback_duration = float(threshold_ms) / 1000
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    enable_slow_callback_detection()
+    # Pay provider client/TLS setup at startup instead of on the first chat. It runs in
+    # the background: an unreachable provider can take timeout x retries to give up,
+    # and startup must not wait for that.
+    warmup = None
+    if os.getenv("AI_WARMUP", "1").strip().lower() not in {"0", "false", "no"}:
+        warmup = asyncio.create_task(asyncio.to_thread(warm_up_provider), name="ai-provider-warmup")
+    app.state.provider_warmup = warmup
+    try:
+        yield
+    finally:
+        if warmup is not None:
+            warmup.cancel()
+        shutdown_offload_executor()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Smart Finance Coach API", version="0.1.0")
+    app = FastAPI(title="Smart Finance Coach API", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -36,7 +70,10 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing", "X-Profile-Id"],
     )
+    # Opt-in per-request span timings / cProfile / stack samples (X-Profile header or PROFILE_SAMPLE_RATE).
+    app.add_middleware(ProfilingMiddleware)
 
     app.include_router(health_router)
     app.include_router(chat_router)
@@ -1,7 +1,7 @@
 from datetime import date
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class Persona(BaseModel):
@@ -22,6 +22,16 @@ class TransactionRecord(BaseModel):
     amount: float
     type: Literal["income", "expense"]
     essential: bool = False
+    # Set when the ledger has a currency column; ``amount`` is then in the base currency.
+    currency: Optional[str] = None
+    original_amount: Optional[float] = None
+
+
+class TransactionPage(BaseModel):
+    """One page of a persona's transactions plus the cursor for the next page."""
+
+    items: List[TransactionRecord]
+    next_cursor: Optional[str] = None
 
 
 class MonthlyOverview(BaseModel):
@@ -41,6 +51,31 @@ class CategorySummary(BaseModel):
     essential: bool
 
 
+class CategoryRanking(BaseModel):
+    """Expense categories for one month ranked by spend, biggest first."""
+
+    month: str
+    categories: List[CategorySummary]
+
+
+class CategoryMover(BaseModel):
+    """Month-over-month spend change for one category."""
+
+    name: str
+    previous: float
+    latest: float
+    change: float
+    change_pct: Optional[float] = None
+
+
+class CategoryMovers(BaseModel):
+    """Categories with the largest spend change between two months."""
+
+    month: str
+    previous_month: Optional[str] = None
+    movers: List[CategoryMover]
+
+
 class GoalsSummary(BaseModel):
     """Savings goal comparison derived from income and spending totals."""
 
@@ -48,12 +83,73 @@ class GoalsSummary(BaseModel):
     current_savings_rate: float
 
 
+class RecurringTransaction(BaseModel):
+    """Transaction series repeating on a regular cadence (bills, subscriptions, paychecks)."""
+
+    description: str
+    category: str
+    type: Literal["income", "expense"]
+    cadence: Literal["weekly", "monthly", "yearly"]
+    amount: float
+    monthly_amount: float
+    occurrences: int
+    first_date: date
+    last_date: date
+    next_date: date
+    active: bool
+    # Set for foreign-currency series, which recur in ``original_amount``; ``amount`` is then the latest
+    # occurrence converted to the base currency.
+    currency: Optional[str] = None
+    original_amount: Optional[float] = None
+
+
 class FinanceSummary(BaseModel):
     """High-level finance snapshot returned to the frontend dashboard."""
 
     monthly_overview: List[MonthlyOverview]
     categories: List[CategorySummary]
     goals: GoalsSummary
+    recurring: List[RecurringTransaction] = Field(default_factory=list)
+    # Server-issued content hash; chat requests can send it back as ``summaryRef``.
+    fingerprint: Optional[str] = None
+
+
+class BudgetAdjustment(BaseModel):
+    """Percentage change applied to matching category totals in a what-if scenario."""
+
+    category: Optional[str] = None
+    type: Literal["income", "expense"] = "expense"
+    essential: Optional[bool] = None
+    change_pct: float = Field(..., ge=-100)
+
+
+class SimulationScenario(BaseModel):
+    """Named set of budget adjustments evaluated against a persona's aggregates."""
+
+    name: Optional[str] = None
+    adjustments: List[BudgetAdjustment] = Field(default_factory=list)
+
+
+class SimulationRequest(BaseModel):
+    """Batch of what-if scenarios; drop projected summaries to compare savings rates only."""
+
+    scenarios: List[SimulationScenario] = Field(..., min_length=1, max_length=1000)
+    include_summary: bool = True
+
+
+class ScenarioResult(BaseModel):
+    """Projected savings goals (and optionally the full summary) for one scenario."""
+
+    name: Optional[str] = None
+    goals: GoalsSummary
+    summary: Optional[FinanceSummary] = None
+
+
+class SimulationResponse(BaseModel):
+    """Baseline goals alongside the projection for every requested scenario."""
+
+    baseline: GoalsSummary
+    scenarios: List[ScenarioResult]
 
 
 class ChatMessage(BaseModel):
@@ -76,6 +172,7 @@ class ChatRequest(BaseModel):
     persona_id: str = Field(..., alias="personaId", min_length=1)
     messages: List[ChatMessage]
     summary: Optional[FinanceSummary] = None
+    summary_ref: Optional[str] = Field(None, alias="summaryRef", min_length=1)
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -85,6 +182,12 @@ class ChatRequest(BaseModel):
             raise ValueError("At least one message is required.")
         return value
 
+    @model_validator(mode="after")
+    def summary_or_ref(self) -> "ChatRequest":
+        if self.summary is not None and self.summary_ref is not None:
+            raise ValueError("Send either summary or summaryRef, not both.")
+        return self
+
 
 class ChatMetadata(BaseModel):
     """Metadata about the model response."""
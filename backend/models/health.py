@@ -1,6 +1,40 @@
+from typing import Dict
+
 from pydantic import BaseModel
 
 
 class HealthStatus(BaseModel):
     status: str
     message: str
+
+
+class ModelLatencyStats(BaseModel):
+    """Observed provider latency and routing counts for one model."""
+
+    selected: int
+    completed: int
+    failed: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+
+
+class ModelStatsResponse(BaseModel):
+    models: Dict[str, ModelLatencyStats]
+
+
+class AdmissionStats(BaseModel):
+    """Chat admission controller state for monitoring queue depth and the adaptive limit."""
+
+    limit: int
+    in_flight: int
+    queue_depth: int
+    max_queue: int
+    latency_ewma_ms: float
+    admitted: int
+    queued: int
+    completed: int
+    failed: int
+    rejected_queue_full: int
+    shed_deadline: int
+    shed_timeout: int
@@ -1,20 +1,26 @@
-import json
 import logging
+import math
 from time import perf_counter
-from typing import Dict, List
+from typing import Annotated, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
-from backend.models.finance import ChatMessage, ChatMetadata, ChatRequest, ChatResponse
+from backend.models.finance import ChatMessage, ChatMetadata, ChatRequest, ChatResponse, FinanceSummary
+from backend.services.admission import AdmissionRejected, chat_admission
 from backend.services.ai_client import (
     ProviderConfigError,
+    ProviderRateLimitedError,
     ProviderUnavailableError,
     generate_chat,
     load_ai_config,
+    select_model,
 )
-from backend.services.analytics import get_finance_summary
+from backend.services.analytics import StaleSummaryRefError, get_finance_summary_async, resolve_summary_ref_async
+from backend.services.codec import decode_model, dumps_indented
 from backend.services.finance_loader import Persona, list_personas
+from backend.services.profiling import profiled, span
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 logger = logging.getLogger(__name__)
@@ -24,6 +30,8 @@ _HISTORY_LIMIT = 12
 
 _PERSONAS: List[Persona] = list_personas()
 _PERSONA_BY_ID: Dict[str, Persona] = {persona.id: persona for persona in _PERSONAS}
+# persona_id -> (summary fingerprint, system prompt) for server-issued summaries.
+_SYSTEM_PROMPTS: Dict[str, Tuple[str, str]] = {}
 
 
 def _validate_persona(persona_id: str) -> Persona:
@@ -36,9 +44,7 @@ def _validate_persona(persona_id: str) -> Persona:
 
 
 def _build_system_prompt(persona: Persona, summary_json: dict) -> str:
-    context_block = json.dumps(
-        {"persona": persona.model_dump(), "finance_summary": summary_json}, indent=2
-    )
+    context_block = dumps_indented({"persona": persona.model_dump(), "finance_summary": summary_json})
     logger.info(
         "Constructed system prompt",
         extra={
@@ -60,65 +66,157 @@ def _build_system_prompt(persona: Persona, summary_json: dict) -> str:
     )
 
 
+def _system_prompt_for(persona: Persona, summary: FinanceSummary, trusted: bool) -> str:
+    # Server-issued summaries are immutable per fingerprint, so their prompt is built once.
+    # Client-supplied summaries are always re-serialized: their fingerprint is not verified.
+    fingerprint = summary.fingerprint if trusted else None
+    if fingerprint:
+        cached = _SYSTEM_PROMPTS.get(persona.id)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+    with span("model_dump"):
+        summary_payload = summary.model_dump(mode="json", exclude={"fingerprint"})
+    system_prompt = _build_system_prompt(persona, summary_payload)
+    if fingerprint:
+        _SYSTEM_PROMPTS[persona.id] = (fingerprint, system_prompt)
+    return system_prompt
+
+
 def _prepare_history(messages: List[ChatMessage]) -> List[Dict[str, str]]:
     history = [msg for msg in messages if msg.role in {"user", "assistant"}]
     trimmed = history[-_HISTORY_LIMIT:]
     return [{"role": msg.role, "content": msg.content} for msg in trimmed]
 
 
-@router.post("/", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+async def _decode_chat_request(http_request: Request) -> ChatRequest:
+    # Validate straight from the body bytes instead of json.loads + model_validate.
+    return decode_model(ChatRequest, await http_request.body())
+
+
+DecodedChatRequest = Annotated[ChatRequest, Depends(_decode_chat_request)]
+
+_CHAT_REQUEST_SCHEMA = ChatRequest.model_json_schema(ref_template="#/components/schemas/{model}")
+_CHAT_REQUEST_SCHEMA.pop("$defs", None)
+
+
+@router.post(
+    "/",
+    response_model=ChatResponse,
+    openapi_extra={
+        "requestBody": {"required": True, "content": {"application/json": {"schema": _CHAT_REQUEST_SCHEMA}}}
+    },
+)
+async def chat(
+    request: DecodedChatRequest,
+    request_timeout_ms: Optional[float] = Header(None, alias="X-Request-Timeout-Ms", gt=0),
+) -> ChatResponse:
     if len(request.messages) > _MAX_MESSAGES:
         raise HTTPException(
             status_code=400,
             detail=f"Too many messages in request (max {_MAX_MESSAGES}).",
         )
 
-    persona = _validate_persona(request.persona_id)
-
-    summary_source = "request" if request.summary else "loader"
-    summary = request.summary or get_finance_summary(request.persona_id)
-    summary_payload = summary.model_dump()
-
-    system_prompt = _build_system_prompt(persona, summary_payload)
-    history = _prepare_history(request.messages)
+    with span("validate_persona"):
+        persona = _validate_persona(request.persona_id)
+
+    with span("get_finance_summary"):
+        if request.summary_ref:
+            summary_source = "ref"
+            try:
+                summary = await resolve_summary_ref_async(request.persona_id, request.summary_ref)
+            except StaleSummaryRefError as exc:
+                raise HTTPException(status_code=409, detail=str(exc)) from exc
+        elif request.summary:
+            summary_source = "request"
+            summary = request.summary
+        else:
+            summary_source = "loader"
+            summary = await get_finance_summary_async(request.persona_id)
+
+    with span("build_system_prompt"):
+        system_prompt = _system_prompt_for(persona, summary, trusted=summary_source != "request")
+    with span("prepare_history"):
+        history = _prepare_history(request.messages)
     if not history:
         raise HTTPException(status_code=400, detail="At least one user message is required.")
 
     try:
         config = load_ai_config()
+        selection = select_model(messages=history, system_prompt=system_prompt, config=config)
         logger.info(
             "Resolved AI configuration",
             extra={
                 "provider": config.provider,
-                "model": config.model,
+                "model": selection.model,
+                "routed": selection.routed,
+                "prompt_tokens": selection.prompt_tokens,
                 "history_count": len(history),
                 "summary_source": summary_source,
             },
         )
 
+        timeout_s = request_timeout_ms / 1000 if request_timeout_ms else None
+        with span("admission_wait"):
+            ticket = await chat_admission.acquire(timeout_s)
+
         start = perf_counter()
-        reply = generate_chat(
-            messages=history, system_prompt=system_prompt, model=config.model
-        )
-        latency_ms = int((perf_counter() - start) * 1000)
+        # None until the call settles: a cancellation (client hang-up, request timeout)
+        # leaves it unset so the slot is returned without any AIMD signal.
+        provider_ok: Optional[bool] = None
+        try:
+            with span("generate_chat"):
+                # Run the blocking SDK call off the event loop so other requests keep flowing.
+                reply = await run_in_threadpool(
+                    profiled(generate_chat), messages=history, system_prompt=system_prompt, model=selection.model
+                )
+            provider_ok = True
+        except ProviderConfigError:
+            # Misconfiguration says nothing about upstream capacity.
+            provider_ok = True
+            raise
+        except Exception:
+            provider_ok = False
+            raise
+        finally:
+            latency_ms = int((perf_counter() - start) * 1000)
+            if provider_ok is None:
+                chat_admission.abandon(ticket)
+            else:
+                chat_admission.release(ticket, ok=provider_ok, latency_ms=latency_ms)
         logger.info(
             "AI chat completion finished",
             extra={
                 "persona_id": request.persona_id,
                 "provider": config.provider,
-                "model": config.model,
+                "model": selection.model,
                 "latency_ms": latency_ms,
                 "history_count": len(history),
             },
         )
+    except AdmissionRejected as exc:
+        logger.warning(
+            "Chat request shed by admission control",
+            extra={"persona_id": request.persona_id, "reason": exc.reason, **chat_admission.snapshot()},
+        )
+        raise HTTPException(
+            status_code=429,
+            detail="The coach is handling too many conversations right now. Please retry shortly.",
+            headers={"Retry-After": str(exc.retry_after_s)},
+        ) from exc
     except ProviderConfigError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except ProviderRateLimitedError as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=str(exc),
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after_s)))},
+        ) from exc
     except ProviderUnavailableError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
     content = reply.strip() or "I could not generate a response. Please try again."
     message = ChatMessage(id=str(uuid4()), role="assistant", content=content)
-    metadata = ChatMetadata(provider=config.provider, model=config.model, latency_ms=latency_ms)
+    metadata = ChatMetadata(provider=config.provider, model=selection.model, latency_ms=latency_ms)
 
     return ChatResponse(message=message, metadata=metadata)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-from backend.models.health import HealthStatus
+from backend.models.health import AdmissionStats, HealthStatus, ModelStatsResponse
+from backend.services.admission import chat_admission
+from backend.services.ai_client import model_latency
 from backend.services.health import get_health_status
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -10,3 +12,15 @@ router = APIRouter(prefix="/health", tags=["health"])
 async def health_check() -> HealthStatus:
     """Return basic health information to verify the server is running."""
     return get_health_status()
+
+
+@router.get("/models", response_model=ModelStatsResponse)
+async def model_stats() -> ModelStatsResponse:
+    """Return per-model routing counts and observed provider latency."""
+    return ModelStatsResponse(models=model_latency.snapshot())
+
+
+@router.get("/chat-admission", response_model=AdmissionStats)
+async def chat_admission_stats() -> AdmissionStats:
+    """Return the chat route's concurrency limit, in-flight count and queue depth."""
+    return AdmissionStats(**chat_admission.snapshot())
@@ -1,18 +1,33 @@
-from typing import Dict, List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from backend.models.finance import FinanceSummary, Persona
-from backend.services.analytics import get_finance_summary
+from backend.models.finance import (
+    CategoryMovers,
+    CategoryRanking,
+    FinanceSummary,
+    Persona,
+    SimulationRequest,
+    SimulationResponse,
+    TransactionPage,
+)
+from backend.services.analytics import get_category_rankings_async, get_finance_summary, get_finance_summary_async
+from backend.services.category_rankings import CategoryRankingIndex
+from backend.services.codec import EncodedModelCache
 from backend.services.finance_loader import list_personas
+from backend.services.simulation import simulate_scenarios_async
+from backend.services.transaction_index import InvalidCursorError, TransactionQuery, query_transactions_async
 
 router = APIRouter(prefix="/personas", tags=["personas"])
 
 _PERSONAS: List[Persona] = list_personas()
 _PERSONA_IDS = {persona.id for persona in _PERSONAS}
-_SUMMARY_CACHE: Dict[str, FinanceSummary] = {
-    persona.id: get_finance_summary(persona.id) for persona in _PERSONAS
-}
+_ENCODED_SUMMARIES = EncodedModelCache()
+
+# Warm the summary cache at import time. With SUMMARY_SHARED_CACHE_PATH set, only
+# the first worker computes; the rest map the summaries it published.
+for _persona in _PERSONAS:
+    get_finance_summary(_persona.id)
 
 
 def _ensure_persona_exists(persona_id: str) -> None:
@@ -27,7 +42,97 @@ async def get_personas() -> List[Persona]:
 
 
 @router.get("/{persona_id}/summary", response_model=FinanceSummary)
-async def get_persona_summary(persona_id: str) -> FinanceSummary:
-    """Return the precomputed finance summary for a specific persona."""
+async def get_persona_summary(persona_id: str) -> Response:
+    """Return the cached finance summary for a specific persona."""
+    _ensure_persona_exists(persona_id)
+    # The summary object only changes on invalidation, so its JSON is encoded once and reused.
+    body = _ENCODED_SUMMARIES.encode(persona_id, await get_finance_summary_async(persona_id))
+    return Response(content=body, media_type="application/json")
+
+
+def _resolve_ranking_month(rankings: CategoryRankingIndex, month: Optional[str]) -> str:
+    if month is None:
+        # Same "latest month" as the summary, even when it only has income so far.
+        if rankings.latest_month is None:
+            raise HTTPException(status_code=404, detail="No transactions recorded for this persona.")
+        return rankings.latest_month
+    if month not in rankings.months:
+        raise HTTPException(status_code=404, detail=f"No expenses recorded for month '{month}'.")
+    return month
+
+
+@router.get("/{persona_id}/categories", response_model=CategoryRanking)
+async def get_persona_category_ranking(
+    persona_id: str,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    limit: Optional[int] = Query(None, ge=1, le=100),
+) -> CategoryRanking:
+    """Return the month's expense categories ranked by spend (latest month by default)."""
+    _ensure_persona_exists(persona_id)
+    rankings = await get_category_rankings_async(persona_id)
+    resolved = _resolve_ranking_month(rankings, month)
+    return CategoryRanking(month=resolved, categories=rankings.top(resolved, limit))
+
+
+@router.get("/{persona_id}/categories/movers", response_model=CategoryMovers)
+async def get_persona_category_movers(
+    persona_id: str,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    limit: int = Query(5, ge=1, le=100),
+) -> CategoryMovers:
+    """Return the categories whose spend changed most versus the previous month."""
+    _ensure_persona_exists(persona_id)
+    rankings = await get_category_rankings_async(persona_id)
+    resolved = _resolve_ranking_month(rankings, month)
+    previous_month = rankings.previous_month(resolved)
+    return CategoryMovers(
+        month=resolved,
+        previous_month=previous_month,
+        movers=rankings.movers(resolved, limit, previous_month=previous_month),
+    )
+
+
+@router.get("/{persona_id}/transactions", response_model=TransactionPage)
+async def get_persona_transactions(
+    persona_id: str,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    category: Optional[str] = None,
+    type: Optional[Literal["income", "expense"]] = None,
+    essential: Optional[bool] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort: Literal["date", "amount"] = "date",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+) -> TransactionPage:
+    """Return one page of a persona's transactions from the sorted transaction index."""
+    _ensure_persona_exists(persona_id)
+    query = TransactionQuery(
+        month=month,
+        category=category,
+        type=type,
+        essential=essential,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        sort=sort,
+        order=order,
+        limit=limit,
+        cursor=cursor,
+    )
+    try:
+        return await query_transactions_async(persona_id, query)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.post("/{persona_id}/simulate", response_model=SimulationResponse)
+async def simulate_persona_budget(persona_id: str, request: SimulationRequest) -> SimulationResponse:
+    """Project the persona's summary under one or more what-if budget scenarios."""
     _ensure_persona_exists(persona_id)
-    return _SUMMARY_CACHE[persona_id]
+    try:
+        return await simulate_scenarios_async(persona_id, request.scenarios, include_summary=request.include_summary)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
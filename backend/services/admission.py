@@ -0,0 +1,232 @@
+"""Adaptive concurrency limiting and admission queueing for upstream-bound routes.
+
+:class:`AdmissionController` caps how many requests may call the provider at
+once. The cap adapts with AIMD feedback from observed provider latency: each
+on-target completion while the limit is saturated grows it by ``1/limit``
+(about +1 per full window), and a slow or failed call shrinks it
+multiplicatively, at most once per cooldown so one slow burst is not
+punished repeatedly.
+
+Requests over the limit wait in a bounded FIFO queue. A request is shed
+immediately, without queueing, when the queue is full or when its expected
+wait already exceeds its deadline; queued requests that outlive their
+deadline are shed as well. Every rejection carries a ``retry_after_s`` hint
+derived from the current queue depth and latency.
+
+Configuration for the chat route's ``chat_admission`` controller (environment, read at import):
+``CHAT_CONCURRENCY_INITIAL`` (8), ``CHAT_CONCURRENCY_MIN`` (1),
+``CHAT_CONCURRENCY_MAX`` (32), ``CHAT_QUEUE_SIZE`` (64),
+``CHAT_QUEUE_TIMEOUT_MS`` (10000) and ``CHAT_LATENCY_TARGET_MS`` (5000).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Union
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after_s: int) -> None:
+        super().__init__(f"Request shed ({reason}); retry after {retry_after_s}s.")
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 32
+    max_queue: int = 64
+    queue_timeout_s: float = 10.0
+    latency_target_ms: float = 5000.0
+    backoff: float = 0.9
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        def number(name: str, default: float) -> float:
+            raw = os.getenv(name)
+            return float(raw) if raw else default
+
+        return cls(
+            initial_limit=int(number("CHAT_CONCURRENCY_INITIAL", cls.initial_limit)),
+            min_limit=int(number("CHAT_CONCURRENCY_MIN", cls.min_limit)),
+            max_limit=int(number("CHAT_CONCURRENCY_MAX", cls.max_limit)),
+            max_queue=int(number("CHAT_QUEUE_SIZE", cls.max_queue)),
+            queue_timeout_s=number("CHAT_QUEUE_TIMEOUT_MS", cls.queue_timeout_s * 1000) / 1000,
+            latency_target_ms=number("CHAT_LATENCY_TARGET_MS", cls.latency_target_ms),
+        )
+
+
+class AdmissionTicket:
+    """Handle for an admitted request; report the outcome via :meth:`AdmissionController.release`."""
+
+    __slots__ = ("started",)
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+
+
+class AdmissionController:
+    """AIMD concurrency limit with a bounded, deadline-aware wait queue.
+
+    Not thread-safe: use one controller per event loop (one per worker).
+    """
+
+    def __init__(self, config: Optional[AdmissionConfig] = None) -> None:
+        self.config = config or AdmissionConfig()
+        self._limit = float(min(max(self.config.initial_limit, self.config.min_limit), self.config.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._latency_ewma_ms = 0.0
+        self._last_decrease = 0.0
+        self._counters: Dict[str, int] = {
+            "admitted": 0,
+            "queued": 0,
+            "completed": 0,
+            "failed": 0,
+            "abandoned": 0,
+            "rejected_queue_full": 0,
+            "shed_deadline": 0,
+            "shed_timeout": 0,
+        }
+
+    @property
+    def limit(self) -> int:
+        return max(self.config.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.config.max_queue,
+            "latency_ewma_ms": round(self._latency_ewma_ms, 2),
+            **self._counters,
+        }
+
+    def _expected_wait_s(self, position: int) -> float:
+        latency_s = (self._latency_ewma_ms or self.config.latency_target_ms / 2) / 1000
+        return latency_s * position / max(1, self.limit)
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._expected_wait_s(len(self._waiters) + 1)))
+
+    def _reject(self, reason: str, counter: str) -> AdmissionRejected:
+        self._counters[counter] += 1
+        return AdmissionRejected(reason, self._retry_after())
+
+    async def acquire(self, timeout_s: Optional[float] = None) -> AdmissionTicket:
+        """Admit the caller or wait in the queue; raises :class:`AdmissionRejected` when shed."""
+
+        budget_s = self.config.queue_timeout_s if timeout_s is None else min(timeout_s, self.config.queue_timeout_s)
+
+        if self._in_flight < self.limit and not self._waiters:
+            return self._admit()
+
+        if len(self._waiters) >= self.config.max_queue:
+            raise self._reject("queue_full", "rejected_queue_full")
+        if self._expected_wait_s(len(self._waiters) + 1) > budget_s:
+            raise self._reject("deadline", "shed_deadline")
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._counters["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=budget_s)
+        except asyncio.TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                waiter.cancel()
+                self._remove_waiter(waiter)
+                raise self._reject("queue_timeout", "shed_timeout") from None
+            # Woken just as the timer fired: the slot is already ours, keep it.
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted but the caller went away: hand the slot to the next waiter.
+                self._in_flight -= 1
+                self._wake_waiters()
+            else:
+                waiter.cancel()
+                self._remove_waiter(waiter)
+            raise
+
+        # _wake_waiters already counted this request as in flight.
+        self._counters["admitted"] += 1
+        return AdmissionTicket()
+
+    def release(self, ticket: AdmissionTicket, *, ok: bool = True, latency_ms: Optional[float] = None) -> None:
+        """Return a slot and feed the observed latency back into the limit."""
+
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+        observed_ms = latency_ms if latency_ms is not None else (time.monotonic() - ticket.started) * 1000
+        self._counters["completed" if ok else "failed"] += 1
+        if self._latency_ewma_ms:
+            self._latency_ewma_ms = 0.8 * self._latency_ewma_ms + 0.2 * observed_ms
+        else:
+            self._latency_ewma_ms = observed_ms
+
+        if not ok or observed_ms > self.config.latency_target_ms:
+            self._decrease()
+        elif saturated:
+            self._limit = min(float(self.config.max_limit), self._limit + 1 / self._limit)
+
+        self._wake_waiters()
+
+    def abandon(self, ticket: AdmissionTicket) -> None:
+        """Return a slot without feedback, for callers that went away before the provider answered.
+
+        A client hang-up or deadline says nothing about upstream health, so
+        neither the latency estimate nor the limit moves.
+        """
+
+        self._in_flight -= 1
+        self._counters["abandoned"] += 1
+        self._wake_waiters()
+
+    def _admit(self) -> AdmissionTicket:
+        self._in_flight += 1
+        self._counters["admitted"] += 1
+        return AdmissionTicket()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        cooldown_s = self.config.latency_target_ms / 1000
+        if now - self._last_decrease < cooldown_s:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.config.min_limit), self._limit * self.config.backoff)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            # Resolve synchronously so the slot and the waiter's state never disagree.
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _remove_waiter(self, waiter: "asyncio.Future[None]") -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+# Shared by the chat route and the health/monitoring endpoint.
+chat_admission = AdmissionController(AdmissionConfig.from_env())
@@ -2,22 +2,33 @@
 
 Supports a pluggable provider model keyed off the AI_PROVIDER environment
 variable. Currently supports:
-- mock: deterministic demo replies
-- openai: OpenAI Chat Completions API via the official SDK
+- mock: deterministic demo replies, optionally with simulated latency/failures
+- openai: OpenAI Chat Completions API via the official SDK (point
+  ``OPENAI_BASE_URL`` at ``scripts/openai_stub_server.py`` for offline load tests)
 """
 
 from __future__ import annotations
 
 import importlib.util
+import json
 import logging
 import os
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Type
+from functools import lru_cache
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Type
+
+from backend.services.latency_sim import LatencyProfile, estimate_tokens
+from backend.services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 ChatMessage = Mapping[str, str]
 
+_chat_flight: SingleFlight[str] = SingleFlight()
+
 
 @dataclass
 class AIConfig:
@@ -26,6 +37,13 @@ class AIConfig:
     provider: str
     model: str
     openai_api_key: Optional[str]
+    openai_base_url: Optional[str] = None
+    openai_max_retries: Optional[int] = None
+    openai_timeout_s: Optional[float] = None
+
+
+_openai_clients: Dict[Tuple[Any, ...], Any] = {}
+_openai_clients_lock = threading.Lock()
 
 
 class ProviderConfigError(Exception):
@@ -36,22 +54,131 @@ class ProviderUnavailableError(Exception):
     """Raised when the configured provider cannot serve requests."""
 
 
+class ProviderRateLimitedError(ProviderUnavailableError):
+    """Raised when the provider is rate limiting; ``retry_after_s`` is its suggested back-off."""
+
+    def __init__(self, message: str, retry_after_s: float) -> None:
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """One entry of the ``AI_MODEL_ROUTES`` table; ``None`` limits are unbounded."""
+
+    model: str
+    max_prompt_tokens: Optional[int] = None
+    max_history: Optional[int] = None
+
+    def accepts(self, prompt_tokens: int, history_length: int) -> bool:
+        if self.max_prompt_tokens is not None and prompt_tokens > self.max_prompt_tokens:
+            return False
+        if self.max_history is not None and history_length > self.max_history:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class ModelSelection:
+    """Outcome of routing a prompt to a model, kept for logging and metrics."""
+
+    model: str
+    prompt_tokens: int
+    history_length: int
+    routed: bool
+
+
+class ModelLatencyTracker:
+    """Thread-safe record of observed provider latency and routing counts per model."""
+
+    def __init__(self, window: int = 256) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _counters(self, model: str) -> Dict[str, int]:
+        return self._counts.setdefault(model, {"selected": 0, "completed": 0, "failed": 0})
+
+    def record_selection(self, model: str) -> None:
+        with self._lock:
+            self._counters(model)["selected"] += 1
+
+    def record(self, model: str, latency_ms: float, *, failed: bool = False) -> None:
+        with self._lock:
+            self._counters(model)["failed" if failed else "completed"] += 1
+            if not failed:
+                self._samples.setdefault(model, deque(maxlen=self._window)).append(latency_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result: Dict[str, Dict[str, float]] = {}
+            for model, counters in self._counts.items():
+                ordered = sorted(self._samples.get(model, ()))
+                result[model] = {
+                    **counters,
+                    "p50_ms": _percentile(ordered, 0.5),
+                    "p95_ms": _percentile(ordered, 0.95),
+                    "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+model_latency = ModelLatencyTracker()
+
+
 class BaseAIProvider:
     """Protocol-like base class for AI providers."""
 
     def generate_chat(self, *, messages: Iterable[ChatMessage], system_prompt: str, model: Optional[str] = None) -> str:
         raise NotImplementedError
 
+    def warm_up(self) -> None:
+        """Open connections ahead of the first request; providers without one are no-ops."""
+
+
+_MOCK_REPLY = (
+    "This is a mock Smart Finance Coach reply for demo purposes only. "
+    "The conversation and finance data are fictional."
+)
+
 
 class MockAIProvider(BaseAIProvider):
-    """Deterministic mock provider for demos and tests."""
+    """Deterministic mock provider for demos and tests.
+
+    Replies instantly unless a latency profile is supplied; see
+    ``MOCK_LATENCY_MS`` and related variables in the README.
+    """
+
+    def __init__(self, latency: Optional[LatencyProfile] = None) -> None:
+        self.latency = latency or LatencyProfile()
 
     def generate_chat(self, *, messages: Iterable[ChatMessage], system_prompt: str, model: Optional[str] = None) -> str:
         logger.debug("MockAIProvider invoked with %d messages", len(list(messages)))
-        return (
-            "This is a mock Smart Finance Coach reply for demo purposes only. "
-            "The conversation and finance data are fictional."
-        )
+        if self.latency.enabled:
+            self._simulate_provider_call()
+        return _MOCK_REPLY
+
+    def _simulate_provider_call(self) -> None:
+        outcome = self.latency.draw_outcome()
+        time.sleep(self.latency.completion_delay_s(estimate_tokens(_MOCK_REPLY)))
+        if outcome == "rate_limited":
+            raise ProviderRateLimitedError(
+                "The AI provider is rate limiting requests. Please try again later.", self.latency.retry_after_s
+            )
+        if outcome == "error":
+            raise ProviderUnavailableError("The AI provider is currently unavailable. Please try again later.")
 
 
 class OpenAIProvider(BaseAIProvider):
@@ -66,11 +193,27 @@ class OpenAIProvider(BaseAIProvider):
         # Ensure the env var is set so the OpenAI client can pick it up.
         os.environ.setdefault("OPENAI_API_KEY", config.openai_api_key)
 
+        client_options: dict = {}
+        if config.openai_base_url:
+            client_options["base_url"] = config.openai_base_url
+        if config.openai_max_retries is not None:
+            client_options["max_retries"] = config.openai_max_retries
+        if config.openai_timeout_s is not None:
+            client_options["timeout"] = config.openai_timeout_s
+
+        # Reuse one SDK client (and its HTTP connection pool) per configuration
+        # so requests after warm-up skip TLS and connection setup.
+        client_key = (openai_client_class, config.openai_api_key, *sorted(client_options.items()))
+        with _openai_clients_lock:
+            client = _openai_clients.get(client_key)
+            if client is None:
+                client = openai_client_class(**client_options)
+                _openai_clients[client_key] = client
+
         # Note: we intentionally type this as Any so static type checkers
         # don't complain about dynamic attributes (e.g. `.chat`).
-        self.client: Any = openai_client_class()
-            
-            
+        self.client: Any = client
+
         self.api_error = api_error
         self.openai_error = openai_error
         self.default_model = config.model
@@ -99,6 +242,10 @@ class OpenAIProvider(BaseAIProvider):
         choice = completion.choices[0].message
         return choice.content or ""
 
+    def warm_up(self) -> None:
+        # A cheap authenticated request establishes DNS, TLS and a pooled connection.
+        self.client.models.list()
+
     @staticmethod
     def _load_openai_dependencies() -> Tuple[Type[object], Type[Exception], Type[Exception]]:
         if importlib.util.find_spec("openai") is None:
@@ -118,13 +265,40 @@ def load_ai_config() -> AIConfig:
     provider = os.getenv("AI_PROVIDER", "mock").lower()
     model = os.getenv("AI_MODEL", "gpt-4.1-mini")
     api_key = os.getenv("OPENAI_API_KEY")
+    max_retries = os.getenv("OPENAI_MAX_RETRIES")
+    timeout_s = os.getenv("OPENAI_TIMEOUT_S")
+
+    return AIConfig(
+        provider=provider,
+        model=model,
+        openai_api_key=api_key,
+        openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
+        openai_max_retries=int(max_retries) if max_retries else None,
+        openai_timeout_s=float(timeout_s) if timeout_s else None,
+    )
 
-    return AIConfig(provider=provider, model=model, openai_api_key=api_key)
+
+@lru_cache(maxsize=8)
+def _mock_latency_profile(settings: Tuple[Optional[str], ...]) -> LatencyProfile:
+    # Cached per settings so a seeded profile keeps one random stream across calls.
+    return LatencyProfile.from_env("MOCK_")
+
+
+_MOCK_LATENCY_SETTINGS = (
+    "MOCK_LATENCY_MS",
+    "MOCK_LATENCY_DISTRIBUTION",
+    "MOCK_LATENCY_JITTER_MS",
+    "MOCK_TOKENS_PER_SECOND",
+    "MOCK_ERROR_RATE",
+    "MOCK_RATE_LIMIT_RATE",
+    "MOCK_SEED",
+)
 
 
 def _provider_for(config: AIConfig) -> BaseAIProvider:
     if config.provider == "mock":
-        return MockAIProvider()
+        settings = tuple(os.getenv(name) for name in _MOCK_LATENCY_SETTINGS)
+        return MockAIProvider(_mock_latency_profile(settings))
     if config.provider == "openai":
         return OpenAIProvider(config)
 
@@ -133,9 +307,95 @@ def _provider_for(config: AIConfig) -> BaseAIProvider:
     )
 
 
+def load_model_routes() -> List[ModelRoute]:
+    """Parse the ``AI_MODEL_ROUTES`` JSON table (ordered, first matching route wins)."""
+
+    raw = os.getenv("AI_MODEL_ROUTES")
+    if not raw:
+        return []
+    try:
+        entries = json.loads(raw)
+        return [
+            ModelRoute(
+                model=str(entry["model"]),
+                max_prompt_tokens=entry.get("max_prompt_tokens"),
+                max_history=entry.get("max_history"),
+            )
+            for entry in entries
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError) as exc:
+        raise ProviderConfigError(
+            "AI_MODEL_ROUTES must be a JSON list of objects with 'model' and optional "
+            "'max_prompt_tokens' / 'max_history' keys."
+        ) from exc
+
+
+def estimate_prompt_tokens(messages: Iterable[ChatMessage], system_prompt: str) -> int:
+    """Approximate prompt size in tokens (~4 characters per token)."""
+
+    characters = len(system_prompt) + sum(len(msg["content"]) for msg in messages)
+    return characters // 4 + 1
+
+
+def select_model(
+    *, messages: List[ChatMessage], system_prompt: str, config: Optional[AIConfig] = None
+) -> ModelSelection:
+    """Pick the first configured route that fits the prompt, else ``AI_MODEL``."""
+
+    config = config or load_ai_config()
+    prompt_tokens = estimate_prompt_tokens(messages, system_prompt)
+    history_length = len(messages)
+
+    selection = ModelSelection(
+        model=config.model, prompt_tokens=prompt_tokens, history_length=history_length, routed=False
+    )
+    for route in load_model_routes():
+        if route.accepts(prompt_tokens, history_length):
+            selection = ModelSelection(
+                model=route.model, prompt_tokens=prompt_tokens, history_length=history_length, routed=True
+            )
+            break
+
+    model_latency.record_selection(selection.model)
+    return selection
+
+
+def warm_up_provider() -> bool:
+    """Create the configured provider and pre-open its connection; never raises."""
+
+    config = load_ai_config()
+    start = time.perf_counter()
+    try:
+        _provider_for(config).warm_up()
+    except Exception as exc:
+        # Warm-up is best effort; the first chat retries the connection anyway.
+        logger.warning("AI provider warm-up failed: %s", exc, extra={"provider": config.provider})
+        return False
+
+    logger.info(
+        "AI provider warmed up",
+        extra={"provider": config.provider, "warmup_ms": int((time.perf_counter() - start) * 1000)},
+    )
+    return True
+
+
+def _chat_flight_key(
+    config: AIConfig, messages: List[ChatMessage], system_prompt: str, model: Optional[str]
+) -> Hashable:
+    return (
+        config.provider,
+        model or config.model,
+        system_prompt,
+        tuple((msg["role"], msg["content"]) for msg in messages),
+    )
+
+
 def generate_chat(*, messages: Iterable[ChatMessage], system_prompt: str, model: Optional[str] = None) -> str:
     """Generate a chat completion using the configured AI provider.
 
+    Identical prompts issued concurrently (same provider, model, system prompt
+    and history) are coalesced so only one request reaches the provider.
+
     Args:
         messages: Iterable of message dicts with keys ``role`` and ``content``.
         system_prompt: System instruction/preamble sent to the model.
@@ -146,6 +406,19 @@ def generate_chat(*, messages: Iterable[ChatMessage], system_prompt: str, model:
     """
 
     config = load_ai_config()
-    provider = _provider_for(config)
+    message_list = list(messages)
+    key = _chat_flight_key(config, message_list, system_prompt, model)
 
-    return provider.generate_chat(messages=messages, system_prompt=system_prompt, model=model)
+    def _call_provider() -> str:
+        provider = _provider_for(config)
+        selected_model = model or config.model
+        start = time.perf_counter()
+        try:
+            reply = provider.generate_chat(messages=message_list, system_prompt=system_prompt, model=model)
+        except ProviderUnavailableError:
+            model_latency.record(selected_model, (time.perf_counter() - start) * 1000, failed=True)
+            raise
+        model_latency.record(selected_model, (time.perf_counter() - start) * 1000)
+        return reply
+
+    return _chat_flight.do(key, _call_provider)
@@ -1,27 +1,74 @@
+import asyncio
+import hashlib
 from collections import defaultdict
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
 
 from backend.models.finance import (
-    CategorySummary,
     FinanceSummary,
     GoalsSummary,
     MonthlyOverview,
+    RecurringTransaction,
     TransactionRecord,
 )
-from backend.services.finance_loader import get_persona_target_rate, load_transactions
+from backend.services.category_rankings import CategoryRankingIndex
+from backend.services.finance_loader import (
+    GroupTotal,
+    frame_group_totals,
+    get_persona_target_rate,
+    get_storage_backend,
+    persona_data_path,
+    read_transactions_frame,
+)
+from backend.services.offload import run_blocking
+from backend.services.profiling import profiled
+from backend.services.recurring import detect_recurring, detect_recurring_records
+from backend.services.shared_cache import SharedSummaryCache, get_shared_summary_cache, shared_cache_version
+from backend.services.singleflight import SingleFlight
+from backend.services.transaction_index import invalidate_transaction_index
+from backend.services.transaction_store import get_transaction_store
+
+# Bump when the summary shape changes so clients holding old refs are told to refetch.
+SUMMARY_FINGERPRINT_VERSION = 2
 
 _summary_cache: Dict[str, FinanceSummary] = {}
+# (shared cache version, totals) so workers drop stale aggregates after a shared invalidation.
+_group_totals_cache: Dict[str, Tuple[int, List[GroupTotal]]] = {}
+_recurring_cache: Dict[str, Tuple[int, List[RecurringTransaction]]] = {}
+# Kept across invalidations: a refresh re-syncs the existing index instead of rebuilding it.
+_rankings_cache: Dict[str, Tuple[List[GroupTotal], CategoryRankingIndex]] = {}
+_summary_flight: SingleFlight[FinanceSummary] = SingleFlight()
+_group_totals_flight: SingleFlight[List[GroupTotal]] = SingleFlight()
+_recurring_flight: SingleFlight[List[RecurringTransaction]] = SingleFlight()
 
 
-def _aggregate_months(records: Iterable[TransactionRecord]) -> List[MonthlyOverview]:
-    monthly_totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"income": 0.0, "expense": 0.0})
+def _group_totals(records: Iterable[TransactionRecord]) -> List[GroupTotal]:
+    totals: Dict[Tuple[str, str, str], List[object]] = {}
 
     for record in records:
-        month_key = record.date.strftime("%Y-%m")
-        if record.type == "income":
-            monthly_totals[month_key]["income"] += record.amount
+        key = (record.date.strftime("%Y-%m"), record.type, record.category)
+        entry = totals.get(key)
+        if entry is None:
+            totals[key] = [record.amount, record.essential]
+        else:
+            entry[0] += record.amount
+            entry[1] = entry[1] or record.essential
+
+    return [
+        GroupTotal(month=month, type=kind, category=category, amount=float(amount), essential=bool(essential))
+        for (month, kind, category), (amount, essential) in totals.items()
+    ]
+
+
+def _aggregate_months(groups: Iterable[GroupTotal]) -> List[MonthlyOverview]:
+    monthly_totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"income": 0.0, "expense": 0.0})
+
+    for group in groups:
+        if group.type == "income":
+            monthly_totals[group.month]["income"] += group.amount
         else:
-            monthly_totals[month_key]["expense"] += record.amount
+            monthly_totals[group.month]["expense"] += group.amount
 
     monthly_overview = []
     for month in sorted(monthly_totals.keys()):
@@ -36,36 +83,24 @@ def _aggregate_months(records: Iterable[TransactionRecord]) -> List[MonthlyOverv
     return monthly_overview
 
 
-def _latest_month(records: Iterable[TransactionRecord]) -> str:
-    months = {record.date.strftime("%Y-%m") for record in records}
+def _latest_month(groups: Iterable[GroupTotal]) -> str:
+    months = {group.month for group in groups}
     return max(months) if months else ""
 
 
-def _aggregate_categories(records: Iterable[TransactionRecord], latest_month: str) -> List[CategorySummary]:
-    category_totals: Dict[str, Dict[str, object]] = defaultdict(lambda: {"amount": 0.0, "essential": False})
-
-    for record in records:
-        if record.type != "expense":
-            continue
-        if record.date.strftime("%Y-%m") != latest_month:
-            continue
-        category_data = category_totals[record.category]
-        category_data["amount"] += record.amount
-        category_data["essential"] = category_data["essential"] or record.essential
-
-    categories = [
-        CategorySummary(name=name, latest=values["amount"], essential=bool(values["essential"]))
-        for name, values in category_totals.items()
-    ]
-
-    categories.sort(key=lambda category: category.latest, reverse=True)
-    return categories
-
+def summarize_group_totals(
+    persona_id: str,
+    groups: List[GroupTotal],
+    rankings: Optional[CategoryRankingIndex] = None,
+    recurring: Optional[List[RecurringTransaction]] = None,
+) -> FinanceSummary:
+    """Build a finance summary from pre-aggregated (month, type, category) totals."""
 
-def compute_finance_summary(persona_id: str, transactions: List[TransactionRecord]) -> FinanceSummary:
-    monthly_overview = _aggregate_months(transactions)
-    latest_month = _latest_month(transactions)
-    categories = _aggregate_categories(transactions, latest_month)
+    monthly_overview = _aggregate_months(groups)
+    latest_month = _latest_month(groups)
+    if rankings is None:
+        rankings = CategoryRankingIndex.from_group_totals(groups)
+    categories = rankings.top(latest_month)
 
     latest_overview = next((item for item in monthly_overview if item.month == latest_month), None)
     income_latest = latest_overview.income if latest_overview else 0
@@ -77,16 +112,307 @@ def compute_finance_summary(persona_id: str, transactions: List[TransactionRecor
         current_savings_rate=(savings_latest / income_latest) if income_latest else 0,
     )
 
-    return FinanceSummary(monthly_overview=monthly_overview, categories=categories, goals=goals)
+    return FinanceSummary(
+        monthly_overview=monthly_overview, categories=categories, goals=goals, recurring=list(recurring or [])
+    )
 
 
-def get_finance_summary(persona_id: str) -> FinanceSummary:
-    if persona_id in _summary_cache:
-        return _summary_cache[persona_id]
+class StaleSummaryRefError(LookupError):
+    """Raised when a client's ``summaryRef`` no longer matches the persona's current summary."""
+
+
+def fingerprint_summary(persona_id: str, summary: FinanceSummary) -> str:
+    """Content hash of a summary, prefixed with the fingerprint format version."""
+
+    payload = summary.model_dump_json(exclude={"fingerprint"})
+    digest = hashlib.sha256(f"{persona_id}\n{payload}".encode("utf-8")).hexdigest()[:24]
+    return f"v{SUMMARY_FINGERPRINT_VERSION}.{digest}"
+
+
+def compute_finance_summary(persona_id: str, transactions: List[TransactionRecord]) -> FinanceSummary:
+    """Fingerprinted summary of already-loaded records, as served from the summary caches."""
+
+    return _summarize_persona(persona_id, _group_totals(transactions), recurring=detect_recurring_records(transactions))
+
+
+def _load_group_totals(persona_id: str) -> List[GroupTotal]:
+    if get_storage_backend() == "sqlite":
+        # Push the aggregation down to SQL instead of materializing every record.
+        return get_transaction_store().group_totals(persona_id)
+    # Aggregate the parsed (currency-normalized) frame directly; no per-row records.
+    return frame_group_totals(read_transactions_frame(persona_data_path(persona_id)))
+
+
+def _ledger_frame(persona_id: str) -> pd.DataFrame:
+    if get_storage_backend() == "sqlite":
+        return get_transaction_store().transaction_frame(persona_id)
+    return read_transactions_frame(persona_data_path(persona_id))
+
+
+def _load_recurring(persona_id: str) -> List[RecurringTransaction]:
+    return detect_recurring(_ledger_frame(persona_id))
+
+
+def _load_ledger(persona_id: str) -> Tuple[List[GroupTotal], List[RecurringTransaction]]:
+    """Group totals and recurring series from a single read of the persona ledger."""
+
+    if get_storage_backend() == "sqlite":
+        store = get_transaction_store()
+        return store.group_totals(persona_id), detect_recurring(store.transaction_frame(persona_id))
+    frame = read_transactions_frame(persona_data_path(persona_id))
+    return frame_group_totals(frame), detect_recurring(frame)
+
+
+def get_group_totals(persona_id: str) -> List[GroupTotal]:
+    """Return the cached per-(month, type, category) totals behind a persona's summary."""
+
+    version = shared_cache_version()
+    cached = _group_totals_cache.get(persona_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    def load() -> List[GroupTotal]:
+        groups = _load_group_totals(persona_id)
+        _group_totals_cache[persona_id] = (version, groups)
+        return groups
+
+    # Concurrent misses (e.g. /simulate and /categories on a cold persona) share a single load.
+    return _group_totals_flight.do(persona_id, load)
+
+
+async def get_group_totals_async(persona_id: str) -> List[GroupTotal]:
+    """Awaitable :func:`get_group_totals`; a cache miss is loaded on the offload pool."""
+
+    version = shared_cache_version()
+    cached = _group_totals_cache.get(persona_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    async def load() -> List[GroupTotal]:
+        groups = await run_blocking(_load_group_totals, persona_id)
+        _group_totals_cache[persona_id] = (version, groups)
+        return groups
+
+    return await _group_totals_flight.do_async(persona_id, load)
+
+
+def get_recurring(persona_id: str) -> List[RecurringTransaction]:
+    """Return the cached recurring series (bills, subscriptions, paychecks) in a persona's ledger."""
+
+    version = shared_cache_version()
+    cached = _recurring_cache.get(persona_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    def load() -> List[RecurringTransaction]:
+        recurring = _load_recurring(persona_id)
+        _recurring_cache[persona_id] = (version, recurring)
+        return recurring
+
+    return _recurring_flight.do(persona_id, load)
+
+
+async def get_recurring_async(persona_id: str) -> List[RecurringTransaction]:
+    """Awaitable :func:`get_recurring`; a cache miss is detected on the offload pool."""
+
+    version = shared_cache_version()
+    cached = _recurring_cache.get(persona_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    async def load() -> List[RecurringTransaction]:
+        recurring = await run_blocking(_load_recurring, persona_id)
+        _recurring_cache[persona_id] = (version, recurring)
+        return recurring
+
+    return await _recurring_flight.do_async(persona_id, load)
 
-    transactions = load_transactions(persona_id)
-    summary = compute_finance_summary(persona_id, transactions)
+
+def _get_ledger(persona_id: str) -> Tuple[List[GroupTotal], List[RecurringTransaction]]:
+    version = shared_cache_version()
+    groups = _group_totals_cache.get(persona_id)
+    recurring = _recurring_cache.get(persona_id)
+    if (groups is None or groups[0] != version) and (recurring is None or recurring[0] != version):
+        # Both cold: read the ledger once for both instead of once per cache.
+        loaded_groups, loaded_recurring = _load_ledger(persona_id)
+        _group_totals_cache[persona_id] = (version, loaded_groups)
+        _recurring_cache[persona_id] = (version, loaded_recurring)
+        return loaded_groups, loaded_recurring
+    return get_group_totals(persona_id), get_recurring(persona_id)
+
+
+def category_rankings_for(persona_id: str, groups: List[GroupTotal]) -> CategoryRankingIndex:
+    """Return the persona's cached category rankings, synced to ``groups`` without loading anything."""
+
+    cached = _rankings_cache.get(persona_id)
+    if cached is not None and cached[0] is groups:
+        return cached[1]
+
+    if cached is not None:
+        rankings = cached[1]
+        rankings.sync(groups)
+    else:
+        rankings = CategoryRankingIndex.from_group_totals(groups)
+    _rankings_cache[persona_id] = (groups, rankings)
+    return rankings
+
+
+def get_category_rankings(persona_id: str) -> CategoryRankingIndex:
+    """Return the persona's per-month category rankings, synced to its current group totals."""
+
+    return category_rankings_for(persona_id, get_group_totals(persona_id))
+
+
+async def get_category_rankings_async(persona_id: str) -> CategoryRankingIndex:
+    """Awaitable :func:`get_category_rankings`; loading the group totals is offloaded."""
+
+    # Rank the totals we awaited: re-reading them through the sync getter could join a
+    # thread-blocking flight on the event loop if the shared version moved meanwhile.
+    return category_rankings_for(persona_id, await get_group_totals_async(persona_id))
+
+
+def _build_finance_summary(persona_id: str) -> FinanceSummary:
+    # A previous flight may have populated the cache between our miss and joining.
+    cached = _summary_cache.get(persona_id)
+    if cached is not None:
+        return cached
+
+    summary = _compute_persona_summary(persona_id)
 
     _summary_cache[persona_id] = summary
     # TODO: add periodic refresh strategy if CSV data is updated while the server is running
     return summary
+
+
+def _summarize_persona(
+    persona_id: str,
+    groups: List[GroupTotal],
+    rankings: Optional[CategoryRankingIndex] = None,
+    recurring: Optional[List[RecurringTransaction]] = None,
+) -> FinanceSummary:
+    summary = summarize_group_totals(persona_id, groups, rankings, recurring)
+    summary.fingerprint = fingerprint_summary(persona_id, summary)
+    return summary
+
+
+def _compute_persona_summary(persona_id: str) -> FinanceSummary:
+    groups, recurring = _get_ledger(persona_id)
+    return _summarize_persona(persona_id, groups, category_rankings_for(persona_id, groups), recurring)
+
+
+def _load_and_summarize(persona_id: str) -> Tuple[List[GroupTotal], FinanceSummary]:
+    # Runs on the offload pool (possibly in another process), so it only returns
+    # picklable values and leaves caching to the caller.
+    groups, recurring = _load_ledger(persona_id)
+    return groups, _summarize_persona(persona_id, groups, recurring=recurring)
+
+
+def _shared_get_or_build(persona_id: str) -> FinanceSummary:
+    shared_cache = get_shared_summary_cache()
+    if shared_cache is None:
+        raise RuntimeError("SUMMARY_SHARED_CACHE_PATH is not set in the offload worker.")
+    return shared_cache.get_or_build(persona_id, _compute_persona_summary)
+
+
+async def _shared_get_async(shared_cache: SharedSummaryCache, persona_id: str) -> Optional[FinanceSummary]:
+    summary = shared_cache.peek(persona_id)
+    if summary is not None:
+        return summary
+    # Remapping after a version bump and decoding the blob fill this worker's private
+    # copy, so they run on a thread rather than the loop. Not run_blocking: a process
+    # pool would decode into the child's cache instead of ours.
+    return await asyncio.to_thread(profiled(shared_cache.get), persona_id)
+
+
+async def _build_finance_summary_async(persona_id: str) -> FinanceSummary:
+    cached = _summary_cache.get(persona_id)
+    if cached is not None:
+        return cached
+
+    groups, summary = await run_blocking(_load_and_summarize, persona_id)
+    _group_totals_cache[persona_id] = (0, groups)
+    _recurring_cache[persona_id] = (0, summary.recurring)
+    _summary_cache[persona_id] = summary
+    return summary
+
+
+def get_finance_summary(persona_id: str) -> FinanceSummary:
+    shared_cache = get_shared_summary_cache()
+    if shared_cache is not None:
+        # Workers share one published copy; the process-local cache is bypassed so
+        # every worker observes cross-process invalidations on its next lookup.
+        summary = shared_cache.get(persona_id)
+        if summary is not None:
+            return summary
+        return _summary_flight.do(
+            persona_id, lambda: shared_cache.get_or_build(persona_id, _compute_persona_summary)
+        )
+
+    cached = _summary_cache.get(persona_id)
+    if cached is not None:
+        return cached
+
+    # Concurrent misses for the same persona share a single load + compute.
+    return _summary_flight.do(persona_id, lambda: _build_finance_summary(persona_id))
+
+
+async def get_finance_summary_async(persona_id: str) -> FinanceSummary:
+    """Awaitable :func:`get_finance_summary` for async routes.
+
+    Cache hits return immediately. Misses are loaded and aggregated on the offload
+    pool, so the event loop keeps serving other requests meanwhile.
+    """
+
+    shared_cache = get_shared_summary_cache()
+    if shared_cache is not None:
+        summary = await _shared_get_async(shared_cache, persona_id)
+        if summary is not None:
+            return summary
+
+        async def build_shared() -> FinanceSummary:
+            built = await run_blocking(_shared_get_or_build, persona_id)
+            return await _shared_get_async(shared_cache, persona_id) or built
+
+        return await _summary_flight.do_async(persona_id, build_shared)
+
+    cached = _summary_cache.get(persona_id)
+    if cached is not None:
+        return cached
+    return await _summary_flight.do_async(persona_id, lambda: _build_finance_summary_async(persona_id))
+
+
+def _check_summary_ref(persona_id: str, summary: FinanceSummary, summary_ref: str) -> FinanceSummary:
+    if summary.fingerprint != summary_ref:
+        raise StaleSummaryRefError(
+            f"Summary reference '{summary_ref}' is out of date for persona '{persona_id}'; refetch the summary."
+        )
+    return summary
+
+
+def resolve_summary_ref(persona_id: str, summary_ref: str) -> FinanceSummary:
+    """Return the cached summary a client refers to, or raise if its ref is stale."""
+    return _check_summary_ref(persona_id, get_finance_summary(persona_id), summary_ref)
+
+
+async def resolve_summary_ref_async(persona_id: str, summary_ref: str) -> FinanceSummary:
+    """Awaitable :func:`resolve_summary_ref`."""
+    return _check_summary_ref(persona_id, await get_finance_summary_async(persona_id), summary_ref)
+
+
+def invalidate_finance_summary(persona_id: Optional[str] = None) -> None:
+    """Drop cached summaries for one persona (or all) in this and every sharing worker."""
+
+    if persona_id is None:
+        _summary_cache.clear()
+        _group_totals_cache.clear()
+        _recurring_cache.clear()
+    else:
+        _summary_cache.pop(persona_id, None)
+        _group_totals_cache.pop(persona_id, None)
+        _recurring_cache.pop(persona_id, None)
+    # The drill-down index is built from the same ledger, so it must not outlive the summary.
+    invalidate_transaction_index(persona_id)
+
+    shared_cache = get_shared_summary_cache()
+    if shared_cache is not None:
+        shared_cache.invalidate(persona_id)
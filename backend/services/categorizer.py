@@ -0,0 +1,228 @@
+"""Rule-based categorization of transactions that arrive without a category.
+
+Bank exports often carry only a description. Rows with a blank ``category``
+are labelled from an ordered rule table (``FINANCE_CATEGORY_RULES_PATH``,
+default ``data/category_rules.json``)::
+
+    [
+      {"category": "Groceries", "keywords": ["whole foods", "trader joe"], "essential": true},
+      {"category": "Coffee", "keywords": ["starbucks"], "max_amount": 25},
+      {"category": "Rent", "pattern": "^rent\\\\b", "type": "expense"}
+    ]
+
+A rule matches when any of its ``keywords`` appears as a whole word in the
+description (case-insensitive) or its ``pattern`` regex matches, and the
+optional ``type`` and ``min_amount`` / ``max_amount`` bounds hold. The first
+matching rule wins. Blank rows that no rule matches become ``Uncategorized``.
+
+All keywords are compiled into one alternation and scanned once per
+description. Text matching depends only on the description, so it runs once
+per distinct description and is memoized across loads. Amount and type bounds
+are then applied per row with vectorized masks.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Pattern, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.finance_loader import DATA_DIR
+
+UNCATEGORIZED = "Uncategorized"
+
+
+class CategoryRulesError(ValueError):
+    """Raised when the category rule table cannot be parsed."""
+
+
+def category_rules_path() -> Path:
+    return Path(os.getenv("FINANCE_CATEGORY_RULES_PATH") or DATA_DIR / "category_rules.json")
+
+
+@dataclass(frozen=True)
+class CategoryRule:
+    """One entry of the rule table; ``None`` bounds are unbounded."""
+
+    category: str
+    keywords: Tuple[str, ...] = ()
+    pattern: Optional[str] = None
+    type: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    essential: Optional[bool] = None
+
+    def accepts(self, amounts: np.ndarray, types: np.ndarray) -> np.ndarray:
+        mask = np.ones(len(amounts), dtype=bool)
+        if self.type is not None:
+            mask &= types == self.type
+        if self.min_amount is not None:
+            mask &= amounts >= self.min_amount
+        if self.max_amount is not None:
+            mask &= amounts <= self.max_amount
+        return mask
+
+
+def _whole_word(alternatives: Sequence[str]) -> str:
+    return r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)"
+
+
+class CategoryRuleSet:
+    """Ordered rules compiled into a single keyword matcher plus per-rule regexes."""
+
+    def __init__(self, rules: Sequence[CategoryRule]) -> None:
+        self.rules: Tuple[CategoryRule, ...] = tuple(rules)
+
+        keyword_rules: Dict[str, List[int]] = {}
+        for index, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                keyword_rules.setdefault(keyword.strip().lower(), []).append(index)
+        keyword_rules.pop("", None)
+        # Longest first so the scan reports the longest keyword starting at each position.
+        keywords = sorted(keyword_rules, key=len, reverse=True)
+        self._keywords: Optional[Pattern[str]] = (
+            re.compile(_whole_word([re.escape(keyword) for keyword in keywords])) if keywords else None
+        )
+        # A keyword hit implies every keyword it contains (e.g. "uber eats" contains "uber"), so credit
+        # those rules too instead of rescanning at shorter lengths.
+        self._keyword_hits: Dict[str, FrozenSet[int]] = {
+            keyword: frozenset(
+                index
+                for other, indexes in keyword_rules.items()
+                if len(other) <= len(keyword) and re.search(_whole_word([re.escape(other)]), keyword)
+                for index in indexes
+            )
+            for keyword in keywords
+        }
+        try:
+            self._patterns: Tuple[Tuple[int, Pattern[str]], ...] = tuple(
+                (index, re.compile(rule.pattern, re.IGNORECASE))
+                for index, rule in enumerate(self.rules)
+                if rule.pattern
+            )
+        except re.error as exc:
+            raise CategoryRulesError(f"Invalid category rule pattern: {exc}") from exc
+        self.candidates = lru_cache(maxsize=65_536)(self._text_candidates)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _text_candidates(self, description: str) -> Tuple[int, ...]:
+        """Indexes of the rules whose text matcher hits ``description``, in priority order."""
+
+        hits = set()
+        if self._keywords is not None:
+            text = description.lower()
+            position = 0
+            # Restart one character after each hit so overlapping keywords are all found.
+            while (match := self._keywords.search(text, position)) is not None:
+                hits.update(self._keyword_hits[match.group()])
+                position = match.start() + 1
+        hits.update(index for index, pattern in self._patterns if pattern.search(description))
+        return tuple(sorted(hits))
+
+    def categorize(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Fill blank categories in a transaction frame; other rows are left untouched."""
+
+        blank = (frame["category"] == "").to_numpy()
+        if not blank.any():
+            return frame
+        rows = np.flatnonzero(blank)
+        descriptions = frame["description"].to_numpy(dtype=object)[rows]
+        amounts = frame["amount"].to_numpy(dtype=float)[rows]
+        types = frame["type"].to_numpy(dtype=object)[rows]
+
+        description_codes, unique_descriptions = pd.factorize(descriptions, use_na_sentinel=False)
+        # Filled element-wise: np.array() would turn equal-length tuples into a 2-D array.
+        description_candidates = np.empty(len(unique_descriptions), dtype=object)
+        description_candidates[:] = [
+            self.candidates(description) if isinstance(description, str) and description else ()
+            for description in unique_descriptions
+        ]
+        candidate_codes, unique_candidates = pd.factorize(description_candidates, use_na_sentinel=False)
+        row_candidates = candidate_codes[description_codes]
+
+        assigned = np.full(len(rows), -1)
+        # Group rows by candidate tuple once; each group then walks its rules in priority order.
+        order = np.argsort(row_candidates, kind="stable")
+        counts = np.bincount(row_candidates, minlength=len(unique_candidates))
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        for code, candidates in enumerate(unique_candidates):
+            members = order[starts[code] : ends[code]]
+            for index in candidates:
+                if not len(members):
+                    break
+                accepted = self.rules[index].accepts(amounts[members], types[members])
+                assigned[members[accepted]] = index
+                members = members[~accepted]
+
+        categories = frame["category"].to_numpy(dtype=object, copy=True)
+        categories[rows] = np.array([rule.category for rule in self.rules] + [UNCATEGORIZED], dtype=object)[assigned]
+        frame = frame.assign(category=categories)
+        override = np.array([rule.essential is not None for rule in self.rules] + [False])[assigned]
+        if override.any():
+            essential = frame["essential"].to_numpy(dtype=bool, copy=True)
+            essential[rows[override]] = np.array([bool(rule.essential) for rule in self.rules] + [False])[
+                assigned[override]
+            ]
+            frame = frame.assign(essential=essential)
+        return frame
+
+
+def parse_category_rules(entries: object) -> CategoryRuleSet:
+    """Build a rule set from the decoded JSON rule table."""
+
+    try:
+        rules = [
+            CategoryRule(
+                category=str(entry["category"]),
+                keywords=tuple(str(keyword) for keyword in entry.get("keywords", ())),
+                pattern=entry.get("pattern"),
+                type=entry.get("type"),
+                min_amount=entry.get("min_amount"),
+                max_amount=entry.get("max_amount"),
+                essential=entry.get("essential"),
+            )
+            for entry in entries  # type: ignore[union-attr]
+        ]
+    except (TypeError, KeyError, AttributeError) as exc:
+        raise CategoryRulesError(
+            "Category rules must be a JSON list of objects with 'category' and optional 'keywords', "
+            "'pattern', 'type', 'min_amount', 'max_amount' and 'essential' keys."
+        ) from exc
+    if any(not rule.keywords and not rule.pattern for rule in rules):
+        raise CategoryRulesError("Every category rule needs 'keywords' or a 'pattern'.")
+    return CategoryRuleSet(rules)
+
+
+_rule_sets: Dict[Tuple[Path, int], CategoryRuleSet] = {}
+_rule_sets_lock = threading.Lock()
+
+
+def get_category_rules() -> CategoryRuleSet:
+    """Return the configured rule set (empty when no file exists), reloading it when the file changes."""
+
+    path = category_rules_path()
+    if not path.exists():
+        return CategoryRuleSet(())
+    key = (path, path.stat().st_mtime_ns)
+    with _rule_sets_lock:
+        rule_set = _rule_sets.get(key)
+        if rule_set is None:
+            try:
+                entries = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError as exc:
+                raise CategoryRulesError(f"Category rules at {path} are not valid JSON: {exc}") from exc
+            rule_set = parse_category_rules(entries)
+            _rule_sets.clear()
+            _rule_sets[key] = rule_set
+    return rule_set
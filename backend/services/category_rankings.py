@@ -0,0 +1,168 @@
+"""Per-month sorted category spend rankings.
+
+A :class:`CategoryRankingIndex` keeps, for every month of a persona's ledger,
+the expense categories ordered by total spend (descending, ties by name). It
+is built once from the grouped totals during aggregation, so "top k
+categories for month M" is a slice of an already sorted list (O(k)) instead
+of a sort per request.
+
+When the underlying totals change, :meth:`CategoryRankingIndex.sync` diffs
+the new totals against the index and repositions only the categories whose
+totals moved (or :meth:`CategoryRankingIndex.add` applies a single
+transaction), rather than rebuilding and re-sorting every month.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.models.finance import CategoryMover, CategorySummary
+from backend.services.finance_loader import GroupTotal
+
+_RankKey = Tuple[float, str]
+
+
+class _MonthRanking:
+    __slots__ = ("totals", "essential", "order")
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = {}
+        self.essential: Dict[str, bool] = {}
+        # Sorted by (-amount, name) so the biggest spend comes first.
+        self.order: List[_RankKey] = []
+
+    def set(self, category: str, amount: float, essential: bool) -> None:
+        previous = self.totals.get(category)
+        if previous is not None:
+            if previous == amount:
+                self.essential[category] = essential
+                return
+            del self.order[bisect_left(self.order, (-previous, category))]
+        self.totals[category] = amount
+        self.essential[category] = essential
+        insort(self.order, (-amount, category))
+
+    def remove(self, category: str) -> None:
+        previous = self.totals.pop(category)
+        self.essential.pop(category, None)
+        del self.order[bisect_left(self.order, (-previous, category))]
+
+    def top(self, k: Optional[int]) -> List[CategorySummary]:
+        keys = self.order if k is None else self.order[:k]
+        return [
+            CategorySummary(name=category, latest=-negative, essential=self.essential[category])
+            for negative, category in keys
+        ]
+
+
+def _expense_totals(groups: Iterable[GroupTotal]) -> Dict[str, Dict[str, Tuple[float, bool]]]:
+    months: Dict[str, Dict[str, Tuple[float, bool]]] = defaultdict(dict)
+    for group in groups:
+        if group.type != "expense":
+            continue
+        amount, essential = months[group.month].get(group.category, (0.0, False))
+        months[group.month][group.category] = (amount + group.amount, essential or group.essential)
+    return months
+
+
+class CategoryRankingIndex:
+    """Sorted expense totals per category for every month of a persona's ledger."""
+
+    def __init__(self) -> None:
+        self._months: Dict[str, _MonthRanking] = {}
+        # Latest month with any transaction, income included, matching the summary's "latest month".
+        self._latest_month: Optional[str] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_group_totals(cls, groups: Iterable[GroupTotal]) -> "CategoryRankingIndex":
+        index = cls()
+        index.sync(groups)
+        return index
+
+    @property
+    def months(self) -> List[str]:
+        with self._lock:
+            return sorted(self._months)
+
+    @property
+    def latest_month(self) -> Optional[str]:
+        """Latest month in the ledger, even if it only has income (its ranking is then empty)."""
+
+        with self._lock:
+            return self._latest_month
+
+    def top(self, month: str, k: Optional[int] = None) -> List[CategorySummary]:
+        """Return the ``k`` biggest expense categories for ``month`` (all when ``k`` is None)."""
+
+        with self._lock:
+            ranking = self._months.get(month)
+            return ranking.top(k) if ranking is not None else []
+
+    def movers(self, month: str, k: int, previous_month: Optional[str] = None) -> List[CategoryMover]:
+        """Return the ``k`` categories whose spend changed most versus the previous month."""
+
+        with self._lock:
+            current = self._months.get(month)
+            if current is None:
+                return []
+            if previous_month is None:
+                previous_month = self.previous_month(month)
+            previous = self._months.get(previous_month) if previous_month else None
+            previous_totals = previous.totals if previous is not None else {}
+
+            changes: List[CategoryMover] = []
+            for category in current.totals.keys() | previous_totals.keys():
+                latest = current.totals.get(category, 0.0)
+                before = previous_totals.get(category, 0.0)
+                changes.append(
+                    CategoryMover(
+                        name=category,
+                        previous=before,
+                        latest=latest,
+                        change=latest - before,
+                        change_pct=((latest - before) / before) if before else None,
+                    )
+                )
+        return heapq.nlargest(k, changes, key=lambda mover: (abs(mover.change), mover.name))
+
+    def previous_month(self, month: str) -> Optional[str]:
+        with self._lock:
+            earlier = [candidate for candidate in self._months if candidate < month]
+            return max(earlier) if earlier else None
+
+    def add(self, month: str, category: str, amount: float, essential: bool = False) -> None:
+        """Apply one expense transaction, repositioning only its category."""
+
+        with self._lock:
+            self._latest_month = max(month, self._latest_month or month)
+            ranking = self._months.setdefault(month, _MonthRanking())
+            total = ranking.totals.get(category, 0.0) + amount
+            ranking.set(category, total, essential or ranking.essential.get(category, False))
+
+    def sync(self, groups: Iterable[GroupTotal]) -> int:
+        """Bring the index in line with ``groups``; returns how many categories changed."""
+
+        groups = list(groups)
+        target = _expense_totals(groups)
+        changed = 0
+        with self._lock:
+            self._latest_month = max((group.month for group in groups), default=None)
+            for month in list(self._months):
+                if month not in target:
+                    changed += len(self._months.pop(month).totals)
+
+            for month, categories in target.items():
+                ranking = self._months.setdefault(month, _MonthRanking())
+                for category in [name for name in ranking.totals if name not in categories]:
+                    ranking.remove(category)
+                    changed += 1
+                for category, (amount, essential) in categories.items():
+                    if ranking.totals.get(category) != amount or ranking.essential.get(category) != essential:
+                        ranking.set(category, amount, essential)
+                        changed += 1
+        return changed
@@ -0,0 +1,65 @@
+"""JSON encode/decode helpers for the hot chat and summary paths.
+
+- :func:`decode_model` validates a request body straight from the raw bytes
+  with pydantic-core's JSON parser. This skips the intermediate ``dict``
+  FastAPI builds with ``json.loads``. The models, and therefore the
+  validation rules, are unchanged.
+- :class:`EncodedModelCache` keeps the encoded JSON of long-lived cached
+  models such as finance summaries. Repeat responses then send the same
+  bytes without serializing the model again.
+- :func:`dumps_indented` renders prompt context with ``orjson`` when it is
+  installed and with the stdlib ``json`` module otherwise.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import threading
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+else:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None  # type: ignore[assignment]
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def decode_model(model_type: Type[ModelT], body: bytes) -> ModelT:
+    """Validate ``body`` as ``model_type``, raising FastAPI's usual 422 error on failure."""
+
+    try:
+        return model_type.model_validate_json(body)
+    except ValidationError as exc:
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body) from None
+
+
+def dumps_indented(payload: Any) -> str:
+    """Serialize ``payload`` as two-space indented JSON."""
+
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, indent=2)
+
+
+class EncodedModelCache:
+    """Per-key cache of a model's JSON encoding, reused while the same model object is served."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[BaseModel, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def encode(self, key: str, model: BaseModel) -> bytes:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is model:
+            return entry[1]
+
+        body = model.model_dump_json().encode("utf-8")
+        with self._lock:
+            self._entries[key] = (model, body)
+        return body
@@ -1,6 +1,7 @@
-from datetime import datetime
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, List
 
 import pandas as pd
 
@@ -8,6 +9,8 @@ from backend.models.finance import Persona, TransactionRecord
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 
+STORAGE_BACKENDS = ("csv", "sqlite")
+
 _PERSONA_CONFIG: Dict[str, Dict[str, str]] = {
     "single": {
         "file": "persona_single_demo.csv",
@@ -30,6 +33,28 @@ _PERSONA_CONFIG: Dict[str, Dict[str, str]] = {
 }
 
 
+@dataclass(frozen=True)
+class GroupTotal:
+    """Summed amount for one (month, type, category) slice of a persona ledger."""
+
+    month: str
+    type: str
+    category: str
+    amount: float
+    essential: bool
+
+
+def get_storage_backend() -> str:
+    """Resolve the transaction storage backend from ``FINANCE_STORAGE_BACKEND``."""
+
+    backend = os.getenv("FINANCE_STORAGE_BACKEND", "csv").strip().lower() or "csv"
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Unsupported FINANCE_STORAGE_BACKEND '{backend}'. Supported backends: {', '.join(STORAGE_BACKENDS)}"
+        )
+    return backend
+
+
 def list_personas() -> List[Persona]:
     return [
         Persona(id=persona_id, name=config["name"], description=config["description"])
@@ -44,15 +69,21 @@ def get_persona_target_rate(persona_id: str) -> float:
     return float(config.get("target_savings_rate", 0.2))
 
 
-def _parse_essential(value: object) -> bool:
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
-        return bool(value)
-    if isinstance(value, str):
-        lowered = value.strip().lower()
-        return lowered in {"1", "true", "yes", "y"}
-    return False
+_TRUE_STRINGS = ("1", "true", "yes", "y")
+
+
+def _parse_essential(column: pd.Series) -> pd.Series:
+    if column.dtype == bool:
+        return column
+    if pd.api.types.is_numeric_dtype(column):
+        return column.fillna(0).astype(bool)
+    return column.astype("string").str.strip().str.lower().isin(_TRUE_STRINGS).fillna(False).astype(bool)
+
+
+def _text_column(frame: pd.DataFrame, name: str) -> pd.Series:
+    if name not in frame:
+        return pd.Series("", index=frame.index, dtype="string")
+    return frame[name].astype("string").str.strip().fillna("")
 
 
 def _ensure_data_dir_exists() -> None:
@@ -60,13 +91,9 @@ def _ensure_data_dir_exists() -> None:
         raise FileNotFoundError(f"Data directory not found: {DATA_DIR}")
 
 
-def _load_csv_rows(file_path: Path) -> Iterable[Dict[str, object]]:
-    data_frame = pd.read_csv(file_path)
-    for _, row in data_frame.iterrows():
-        yield row.to_dict()
+def persona_data_path(persona_id: str) -> Path:
+    """Return the CSV file backing a persona, validating that it exists."""
 
-
-def load_transactions(persona_id: str) -> List[TransactionRecord]:
     config = _PERSONA_CONFIG.get(persona_id)
     if not config:
         raise ValueError(f"Unknown persona id: {persona_id}")
@@ -76,19 +103,126 @@ def load_transactions(persona_id: str) -> List[TransactionRecord]:
     file_path = DATA_DIR / config["file"]
     if not file_path.exists():
         raise FileNotFoundError(f"Persona data not found: {file_path}")
+    return file_path
+
+
+def read_transactions_frame(file_path: Path) -> pd.DataFrame:
+    """Parse a persona CSV into a normalized frame with amounts in the base currency.
+
+    Columns: ``date`` (datetime64), ``description`` (None when blank),
+    ``category``, ``amount`` (base currency), ``type``, ``essential`` and, when
+    the file has a ``currency`` column, ``currency`` and ``original_amount``.
+    Blank categories are filled from the category rules (see
+    :mod:`backend.services.categorizer`).
+    """
+
+    raw = pd.read_csv(file_path, dtype={"description": "string", "category": "string", "currency": "string"})
+    frame = pd.DataFrame(index=raw.index)
+    frame["date"] = pd.to_datetime(raw["date"].astype(str), format="%Y-%m-%d")
+    description = _text_column(raw, "description")
+    frame["description"] = description.astype(object).where(description != "", None)
+    frame["category"] = _text_column(raw, "category").astype(object)
+    frame["amount"] = pd.to_numeric(raw.get("amount"), errors="coerce").fillna(0.0).astype(float)
+    kind = _text_column(raw, "type").str.lower()
+    frame["type"] = kind.where(kind != "", "expense").astype(object)
+    frame["essential"] = _parse_essential(raw["essential"]) if "essential" in raw else False
+
+    if "currency" in raw:
+        from backend.services.fx import get_base_currency
+
+        currency = _text_column(raw, "currency").str.upper()
+        frame["currency"] = currency.where(currency != "", get_base_currency()).astype(object)
+        frame["original_amount"] = frame["amount"]
+        frame["amount"] = frame["amount"] * _conversion_rates(frame)
+
+    if (frame["category"] == "").any():
+        from backend.services.categorizer import get_category_rules
+
+        frame = get_category_rules().categorize(frame)
+    return frame
+
+
+def _conversion_rates(frame: pd.DataFrame) -> "pd.Series":
+    # Imported lazily so ledgers without a currency column never load the FX table.
+    from backend.services.fx import get_base_currency, get_fx_rates
+
+    rates = pd.Series(1.0, index=frame.index)
+    foreign = frame["currency"] != get_base_currency()
+    if foreign.any():
+        rates[foreign] = get_fx_rates().rates_for(frame.loc[foreign, "currency"], frame.loc[foreign, "date"])
+    return rates
+
+
+def frame_group_totals(frame: pd.DataFrame) -> List[GroupTotal]:
+    """Sum a transaction frame into (month, type, category) totals in one vectorized pass."""
+
+    if frame.empty:
+        return []
+    # Group on the datetime64[M] value and format only the distinct months; strftime per row dominates otherwise.
+    grouped = (
+        frame.assign(month=frame["date"].to_numpy(dtype="datetime64[M]"))
+        .groupby(["month", "type", "category"], sort=False)
+        .agg(amount=("amount", "sum"), essential=("essential", "any"))
+    )
+    labels = {month: pd.Timestamp(month).strftime("%Y-%m") for month in grouped.index.levels[0]}
+    return [
+        GroupTotal(month=labels[month], type=kind, category=category, amount=float(amount), essential=bool(essential))
+        for (month, kind, category), amount, essential in zip(
+            grouped.index, grouped["amount"].to_numpy(), grouped["essential"].to_numpy(), strict=True
+        )
+    ]
+
+
+def read_transactions_csv(persona_id: str, file_path: Path) -> List[TransactionRecord]:
+    """Parse a persona CSV file into normalized transaction records."""
+
+    frame = read_transactions_frame(file_path)
+    if "currency" in frame:
+        currencies = frame["currency"].tolist()
+        original_amounts = frame["original_amount"].tolist()
+    else:
+        currencies = original_amounts = [None] * len(frame)
 
-    records: List[TransactionRecord] = []
-    for row in _load_csv_rows(file_path):
-        records.append(
-            TransactionRecord(
-                persona_id=persona_id,
-                date=datetime.strptime(str(row.get("date")), "%Y-%m-%d").date(),
-                description=str(row.get("description") or "").strip() or None,
-                category=str(row.get("category") or "").strip(),
-                amount=float(row.get("amount", 0) or 0),
-                type=str(row.get("type") or "expense").strip().lower(),
-                essential=_parse_essential(row.get("essential")),
-            )
+    return [
+        TransactionRecord(
+            persona_id=persona_id,
+            date=day,
+            description=description,
+            category=category,
+            amount=amount,
+            type=kind,
+            essential=essential,
+            currency=currency,
+            original_amount=original_amount,
+        )
+        for day, description, category, amount, kind, essential, currency, original_amount in zip(
+            frame["date"].dt.date,
+            frame["description"],
+            frame["category"],
+            frame["amount"].tolist(),
+            frame["type"],
+            frame["essential"].tolist(),
+            currencies,
+            original_amounts,
+            strict=True,
         )
+    ]
+
+
+def load_transactions(persona_id: str) -> List[TransactionRecord]:
+    if get_storage_backend() == "sqlite":
+        # Imported lazily so the SQLite store stays optional for CSV deployments.
+        from backend.services.transaction_store import get_transaction_store
+
+        return get_transaction_store().load_transactions(persona_id)
+
+    return read_transactions_csv(persona_id, persona_data_path(persona_id))
+
+
+async def load_transactions_async(persona_id: str) -> List[TransactionRecord]:
+    """Awaitable :func:`load_transactions` that reads and parses on the offload pool."""
+
+    # Imported lazily: the offload module is only needed by async callers.
+    from backend.services.offload import run_blocking
 
-    return records
+    return await run_blocking(load_transactions, persona_id)
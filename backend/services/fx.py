@@ -0,0 +1,136 @@
+"""Foreign-exchange normalization of transaction amounts to a base currency.
+
+Ledgers may carry an optional ``currency`` column. Amounts in any other
+currency than ``FINANCE_BASE_CURRENCY`` (default ``USD``) are converted with
+the most recent rate on or before the transaction date from a local rate table
+(``FINANCE_FX_RATES_PATH``, default ``data/fx_rates.csv``)::
+
+    date,currency,rate
+    2024-06-01,EUR,1.08
+
+``rate`` is the value of one unit of ``currency`` in the base currency.
+
+A whole ledger is converted in one vectorized pass. The distinct
+``(currency, date)`` pairs are resolved once with an as-of join, and every row
+then picks up its pair's rate by position. :meth:`FxRateTable.rate` is a
+single-pair lookup for callers holding one transaction.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_right
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.finance_loader import DATA_DIR
+
+
+class MissingFxRateError(ValueError):
+    """Raised when a transaction predates (or lacks) any rate for its currency."""
+
+
+def get_base_currency() -> str:
+    return (os.getenv("FINANCE_BASE_CURRENCY") or "USD").strip().upper()
+
+
+def fx_rates_path() -> Path:
+    return Path(os.getenv("FINANCE_FX_RATES_PATH") or DATA_DIR / "fx_rates.csv")
+
+
+class FxRateTable:
+    """Dated conversion rates into one base currency."""
+
+    def __init__(self, rates: pd.DataFrame, base_currency: str) -> None:
+        frame = rates.loc[:, ["date", "currency", "rate"]].copy()
+        frame["date"] = pd.to_datetime(frame["date"]).astype("datetime64[ns]")
+        frame["currency"] = frame["currency"].astype(str).str.strip().str.upper()
+        frame["rate"] = frame["rate"].astype(float)
+        self.base_currency = base_currency
+        self._rates = frame.sort_values("date", kind="stable").reset_index(drop=True)
+        self._by_currency: Dict[str, Tuple[Sequence[date], Sequence[float]]] = {
+            currency: (list(group["date"].dt.date), list(group["rate"]))
+            for currency, group in self._rates.groupby("currency", sort=False)
+        }
+
+    @classmethod
+    def from_csv(cls, path: Path, base_currency: Optional[str] = None) -> "FxRateTable":
+        return cls(pd.read_csv(path), base_currency or get_base_currency())
+
+    @property
+    def currencies(self) -> Tuple[str, ...]:
+        return tuple(self._by_currency)
+
+    def rate(self, currency: str, day: date) -> float:
+        """Rate for ``currency`` on ``day`` (as of the latest earlier quote)."""
+
+        if currency == self.base_currency:
+            return 1.0
+        dates, rates = self._by_currency.get(currency, ((), ()))
+        position = bisect_right(dates, day)
+        if position == 0:
+            raise MissingFxRateError(f"No {currency} rate on or before {day.isoformat()}.")
+        return rates[position - 1]
+
+    def rates_for(self, currencies: pd.Series, dates: pd.Series) -> np.ndarray:
+        """Vectorized as-of rate lookup for aligned currency and date columns."""
+
+        currency_values = currencies.to_numpy(dtype=object)
+        date_values = pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]")
+        foreign = currency_values != self.base_currency
+        result = np.ones(len(currency_values))
+        if not foreign.any():
+            return result
+
+        # Pack (currency code, day) into one int64 so the pairs factorize by hash, not as tuples.
+        currency_codes, currency_names = pd.factorize(currency_values[foreign])
+        days = date_values[foreign].astype("datetime64[D]").astype(np.int64)
+        first_day = days.min()
+        pair_codes, pair_keys = pd.factorize(currency_codes.astype(np.int64) << 32 | (days - first_day))
+        lookup = pd.DataFrame(
+            {
+                "currency": np.asarray(currency_names, dtype=object)[pair_keys >> 32],
+                "date": ((pair_keys & 0xFFFFFFFF) + first_day).astype("datetime64[D]").astype("datetime64[ns]"),
+                "pair": np.arange(len(pair_keys)),
+            }
+        ).sort_values("date", kind="stable")
+        joined = pd.merge_asof(lookup, self._rates, on="date", by="currency", direction="backward")
+
+        missing = joined["rate"].isna()
+        if missing.any():
+            first = joined.loc[missing].iloc[0]
+            raise MissingFxRateError(
+                f"No {first['currency']} rate on or before {pd.Timestamp(first['date']).date().isoformat()}."
+            )
+
+        pair_rates = np.empty(len(pair_keys))
+        pair_rates[joined["pair"].to_numpy()] = joined["rate"].to_numpy()
+        result[foreign] = pair_rates[pair_codes]
+        return result
+
+
+_tables: Dict[Tuple[Path, int, str], FxRateTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_fx_rates() -> FxRateTable:
+    """Return the configured rate table, reloading it when the file changes."""
+
+    path = fx_rates_path()
+    if not path.exists():
+        raise MissingFxRateError(
+            f"FX rate table not found at {path}; set FINANCE_FX_RATES_PATH to convert non-base currencies."
+        )
+    key = (path, path.stat().st_mtime_ns, get_base_currency())
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            table = FxRateTable.from_csv(path, key[2])
+            _tables.clear()
+            _tables[key] = table
+    return table
@@ -0,0 +1,115 @@
+"""Provider latency and failure simulation for offline load testing.
+
+A :class:`LatencyProfile` describes how a simulated chat provider behaves:
+time to first token drawn from a configurable distribution, a token
+generation rate, and injected upstream errors and 429 rate limits. It is used
+by ``MockAIProvider`` (via ``MOCK_*`` environment variables) and by the local
+OpenAI-compatible stub server in ``backend.devtools.openai_stub``.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+Distribution = Literal["fixed", "uniform", "normal", "lognormal"]
+Outcome = Literal["ok", "error", "rate_limited"]
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass
+class LatencyProfile:
+    """Latency, throughput and failure model for a simulated provider.
+
+    ``latency_ms`` is the mean time to first token. ``jitter_ms`` is the
+    half-width for ``uniform`` and the standard deviation for ``normal`` and
+    ``lognormal``. ``tokens_per_second`` of 0 means completions stream
+    instantly once the first token is ready.
+    """
+
+    latency_ms: float = 0.0
+    distribution: Distribution = "fixed"
+    jitter_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_s: float = 1.0
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unsupported latency distribution '{self.distribution}'. Supported: {', '.join(DISTRIBUTIONS)}"
+            )
+        self._rng = random.Random(self.seed)
+
+    @property
+    def enabled(self) -> bool:
+        timing = self.latency_ms or self.jitter_ms or self.tokens_per_second
+        return bool(timing or self.error_rate or self.rate_limit_rate)
+
+    def first_token_delay_s(self) -> float:
+        """Draw a time-to-first-token sample in seconds (never negative)."""
+
+        mean, jitter = self.latency_ms, self.jitter_ms
+        if self.distribution == "fixed" or not jitter:
+            delay_ms = mean
+        elif self.distribution == "uniform":
+            delay_ms = self._rng.uniform(mean - jitter, mean + jitter)
+        elif self.distribution == "normal":
+            delay_ms = self._rng.gauss(mean, jitter)
+        else:
+            # Parameterise the underlying normal so the lognormal has the requested mean/stddev.
+            if mean <= 0:
+                delay_ms = 0.0
+            else:
+                sigma_sq = math.log(1 + (jitter / mean) ** 2)
+                delay_ms = self._rng.lognormvariate(math.log(mean) - sigma_sq / 2, math.sqrt(sigma_sq))
+        return max(0.0, delay_ms) / 1000
+
+    def token_delay_s(self) -> float:
+        """Seconds between streamed tokens at the configured generation rate."""
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def completion_delay_s(self, completion_tokens: int) -> float:
+        """Total simulated latency for a non-streamed completion."""
+        return self.first_token_delay_s() + self.token_delay_s() * max(0, completion_tokens - 1)
+
+    def draw_outcome(self) -> Outcome:
+        """Decide whether this call succeeds, fails upstream or is rate limited."""
+
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return "ok"
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "LatencyProfile":
+        """Build a profile from ``<prefix>LATENCY_MS``, ``<prefix>ERROR_RATE`` and friends."""
+
+        def number(name: str, default: float) -> float:
+            raw = os.getenv(f"{prefix}{name}")
+            return float(raw) if raw else default
+
+        seed = os.getenv(f"{prefix}SEED")
+        return cls(
+            latency_ms=number("LATENCY_MS", 0.0),
+            distribution=(os.getenv(f"{prefix}LATENCY_DISTRIBUTION") or "fixed").lower(),  # type: ignore[arg-type]
+            jitter_ms=number("LATENCY_JITTER_MS", 0.0),
+            tokens_per_second=number("TOKENS_PER_SECOND", 0.0),
+            error_rate=number("ERROR_RATE", 0.0),
+            rate_limit_rate=number("RATE_LIMIT_RATE", 0.0),
+            retry_after_s=number("RETRY_AFTER_S", 1.0),
+            seed=int(seed) if seed else None,
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for simulated timings."""
+    return max(1, len(text) // 4)
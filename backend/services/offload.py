@@ -0,0 +1,88 @@
+"""Run blocking loader and analytics work off the event loop.
+
+Async routes must not read CSVs, query SQLite or aggregate a ledger on the
+event loop: a single cache miss would stall every other request on the
+worker. :func:`run_blocking` hands such work to a dedicated pool:
+
+- ``FINANCE_OFFLOAD_POOL``: ``thread`` (default) or ``process``
+- ``FINANCE_OFFLOAD_WORKERS``: pool size (default 4)
+
+A process pool moves CPU-heavy parsing off the GIL entirely. It requires
+module-level functions and picklable results, and module caches filled in a
+child are not visible to the server process, so callers cache the returned
+value themselves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from backend.services.profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+OFFLOAD_POOLS = ("thread", "process")
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def get_offload_pool_kind() -> str:
+    """Resolve the offload pool type from ``FINANCE_OFFLOAD_POOL``."""
+
+    kind = os.getenv("FINANCE_OFFLOAD_POOL", "thread").strip().lower() or "thread"
+    if kind not in OFFLOAD_POOLS:
+        raise ValueError(f"Unsupported FINANCE_OFFLOAD_POOL '{kind}'. Supported pools: {', '.join(OFFLOAD_POOLS)}")
+    return kind
+
+
+def _worker_count() -> int:
+    raw = os.getenv("FINANCE_OFFLOAD_WORKERS")
+    return max(1, int(raw)) if raw else 4
+
+
+def get_offload_executor() -> Executor:
+    """Return the process-wide offload pool, creating it on first use."""
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            kind = get_offload_pool_kind()
+            workers = _worker_count()
+            if kind == "process":
+                # spawn: forking a server process that already runs threads is unsafe.
+                _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="finance-offload")
+            logger.info("Started offload pool", extra={"pool": kind, "workers": workers})
+        return _executor
+
+
+def shutdown_offload_executor(wait: bool = True) -> None:
+    """Stop the offload pool; the next :func:`run_blocking` call starts a fresh one."""
+
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any) -> T:
+    """Await ``fn(*args)`` on the offload pool without blocking the event loop."""
+
+    loop = asyncio.get_running_loop()
+    executor = get_offload_executor()
+    if isinstance(executor, ThreadPoolExecutor):
+        # Closures cannot cross a process pool, but thread work can join the request's cProfile capture.
+        fn = profiled(fn)
+    return await loop.run_in_executor(executor, functools.partial(fn, *args))
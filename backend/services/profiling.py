@@ -0,0 +1,349 @@
+"""Opt-in per-request profiling for hot request paths.
+
+A request is profiled when it carries an ``X-Profile`` header or is picked by
+``PROFILE_SAMPLE_RATE`` (0.0-1.0, default 0). Profiled requests record named
+spans (see :func:`span`) and return them in a ``Server-Timing`` header; the
+breakdown is also logged. Header values select what else is captured:
+
+- ``1`` / ``spans``: span timings only
+- ``cprofile``: also a cProfile dump (``.prof``, open with snakeviz/pstats)
+- ``sample``: also a stack-sampling capture in collapsed-stack format
+  (``.folded``, feed to flamegraph.pl or speedscope)
+
+Dumps are only written when ``PROFILE_DIR`` is set. Because they write files
+and start profilers, the ``cprofile`` and ``sample`` header values are only
+honoured when ``PROFILE_ALLOW_HEADER`` is enabled; otherwise they fall back to
+``spans``. Only one capture of each kind runs at a time. Requests picked by the
+sample rate use ``PROFILE_SAMPLE_MODE`` (default ``spans``).
+
+cProfile only sees the thread it is enabled on. Blocking calls that a profiled
+request hands to a worker thread should be wrapped with :func:`profiled` so
+the dump covers them too.
+
+When a request is not profiled, :func:`span` costs one context variable
+lookup and the middleware passes the request straight through.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any, Awaitable, Callable, Dict, List, MutableMapping, Optional, Tuple, TypeVar
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_HEADER = "x-profile"
+PROFILE_MODES = ("spans", "cprofile", "sample")
+
+_HEADER_ALIASES = {"1": "spans", "true": "spans", "yes": "spans", "flamegraph": "sample"}
+
+# cProfile can only be active once per interpreter; concurrent requests skip the dump.
+_cprofile_lock = threading.Lock()
+# A sampler already sees every thread, so a second concurrent one would only add overhead.
+_sampler_lock = threading.Lock()
+
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("active_profile", default=None)
+_active_capture: ContextVar[Optional["_Capture"]] = ContextVar("active_capture", default=None)
+
+
+@dataclass
+class RequestProfile:
+    """Span timings and optional captures collected for one profiled request."""
+
+    mode: str
+    name: str
+    request_id: str = field(default_factory=lambda: uuid4().hex[:12])
+    spans: List[Tuple[str, float]] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    total_ms: float = 0.0
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.spans.append((name, duration_ms))
+
+    def server_timing(self) -> str:
+        entries = [f"{name};dur={duration:.2f}" for name, duration in self.spans]
+        entries.append(f"total;dur={self.total_ms:.2f}")
+        return ", ".join(entries)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+
+class _Span:
+    __slots__ = ("_profile", "_name", "_start")
+
+    def __init__(self, profile: RequestProfile, name: str) -> None:
+        self._profile = profile
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *_exc: object) -> None:
+        self._profile.record(self._name, (time.perf_counter() - self._start) * 1000)
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str) -> Any:
+    """Time a block as a named span of the active request profile, if any."""
+
+    profile = _active_profile.get()
+    if profile is None:
+        return _NOOP_SPAN
+    return _Span(profile, name)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _active_profile.get()
+
+
+def _sample_rate() -> float:
+    try:
+        return float(os.getenv("PROFILE_SAMPLE_RATE") or 0)
+    except ValueError:
+        return 0.0
+
+
+def _header_captures_allowed() -> bool:
+    return os.getenv("PROFILE_ALLOW_HEADER", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _profile_dir() -> Optional[Path]:
+    raw_dir = os.getenv("PROFILE_DIR")
+    return Path(raw_dir) if raw_dir else None
+
+
+def resolve_profile_mode(header_value: Optional[str]) -> Optional[str]:
+    """Decide whether (and how) to profile a request from its header and the sample rate."""
+
+    if header_value is not None:
+        mode = header_value.strip().lower()
+        mode = _HEADER_ALIASES.get(mode, mode)
+        if mode in PROFILE_MODES:
+            # Any client can send the header; only operators may let it write dumps or start samplers.
+            return mode if mode == "spans" or _header_captures_allowed() else "spans"
+
+    rate = _sample_rate()
+    if rate > 0 and random.random() < rate:
+        mode = (os.getenv("PROFILE_SAMPLE_MODE") or "spans").strip().lower()
+        return mode if mode in PROFILE_MODES else "spans"
+    return None
+
+
+class StackSampler:
+    """Background sampler that folds the stacks of other threads into counts."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = interval_s
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.samples[self._fold(names.get(thread_id, str(thread_id)), frame)] += 1
+
+    @staticmethod
+    def _fold(thread_name: str, frame: Optional[FrameType]) -> str:
+        stack: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ";".join(reversed(stack))
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class _Capture:
+    """cProfile or stack-sampling capture wrapped around a profiled request."""
+
+    def __init__(self, profile: RequestProfile) -> None:
+        self.profile = profile
+        self.output_dir = _profile_dir() if profile.mode != "spans" else None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._thread_profilers: List[cProfile.Profile] = []
+        self._thread_profilers_lock = threading.Lock()
+        self._sampler: Optional[StackSampler] = None
+
+    def start(self) -> None:
+        if self.output_dir is None:
+            return
+        if self.profile.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                logger.warning("Skipping cProfile capture; another request is already being profiled")
+                return
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile.mode == "sample":
+            if not _sampler_lock.acquire(blocking=False):
+                logger.warning("Skipping stack sampling; another request is already being sampled")
+                return
+            interval_ms = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS") or 5)
+            self._sampler = StackSampler(interval_ms / 1000)
+            self._sampler.start()
+
+    @property
+    def profiles_threads(self) -> bool:
+        return self._profiler is not None
+
+    def run_profiled(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``fn`` on the current (worker) thread under a profiler merged into this capture's dump."""
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread from the request's profiler and allows only one at a time.
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._thread_profilers_lock:
+                self._thread_profilers.append(profiler)
+
+    def stop(self) -> Optional[Path]:
+        if self.output_dir is None:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.profile.name}-{self.profile.request_id}"
+        if self._profiler is not None:
+            self._profiler.disable()
+            _cprofile_lock.release()
+            path = self.output_dir / f"{stem}.prof"
+            stats = pstats.Stats(self._profiler)
+            for profiler in self._thread_profilers:
+                stats.add(profiler)
+            stats.dump_stats(str(path))
+            return path
+        if self._sampler is not None:
+            self._sampler.stop()
+            _sampler_lock.release()
+            path = self.output_dir / f"{stem}.folded"
+            path.write_text(self._sampler.collapsed(), encoding="utf-8")
+            return path
+        return None
+
+
+def profiled(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``fn`` before handing it to a thread pool so the request's cProfile capture includes it.
+
+    Resolved on the calling thread; returns ``fn`` unchanged unless a cProfile capture is running.
+    """
+
+    capture = _active_capture.get()
+    if capture is None or not capture.profiles_threads:
+        return fn
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return capture.run_profiled(fn, *args, **kwargs)
+
+    return run
+
+
+Scope = MutableMapping[str, Any]
+ASGIApp = Callable[[Scope, Callable[[], Awaitable[Any]], Callable[[Any], Awaitable[None]]], Awaitable[None]]
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that activates a :class:`RequestProfile` for selected requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_value = _find_header(scope, PROFILE_HEADER.encode("latin-1"))
+        mode = resolve_profile_mode(header_value)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(mode=mode, name=_profile_name(scope))
+        capture = _Capture(profile)
+        token = _active_profile.set(profile)
+        capture_token = _active_capture.set(capture)
+        capture.start()
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                profile.total_ms = (time.perf_counter() - profile.started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                headers.append((b"x-profile-id", profile.request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _active_profile.reset(token)
+            _active_capture.reset(capture_token)
+            if not profile.total_ms:
+                profile.total_ms = (time.perf_counter() - profile.started) * 1000
+            dump_path = capture.stop()
+            logger.info(
+                "Request profile",
+                extra={
+                    "profile_id": profile.request_id,
+                    "path": scope.get("path"),
+                    "mode": profile.mode,
+                    "total_ms": round(profile.total_ms, 2),
+                    "spans": {name: round(duration, 2) for name, duration in profile.spans},
+                    "dump_path": str(dump_path) if dump_path else None,
+                },
+            )
+
+
+def _find_header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _profile_name(scope: Scope) -> str:
+    path = str(scope.get("path", "")).strip("/").replace("/", "_")
+    return path or "root"
@@ -0,0 +1,201 @@
+"""Recurring transaction and subscription detection.
+
+Transactions form a series when they share a normalized description
+(lowercased, with digits, punctuation and spaces dropped, so
+``NETFLIX.COM 8123`` and ``Netflix.com 9911`` match), a type and an amount to
+the cent. Foreign-currency rows are matched on their ``currency`` and
+``original_amount``, since the converted amount moves with the exchange rate.
+The ledger is sorted once by (series, date). The gaps between consecutive
+dates of a series are then classified into cadences with vectorized
+comparisons:
+
+- weekly:  6-8 days, at least 4 occurrences
+- monthly: 27-33 days, at least 3 occurrences
+- yearly:  358-372 days, at least 2 occurrences
+
+A series is recurring when at least 75% of its gaps share one cadence. It is
+``active`` when its last occurrence is recent enough, relative to the end of
+the ledger, that the next one is not overdue.
+"""
+
+from __future__ import annotations
+
+import string
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from backend.models.finance import RecurringTransaction, TransactionRecord
+from backend.services.fx import get_base_currency
+
+
+@dataclass(frozen=True)
+class Cadence:
+    """Gap range (in days) that identifies one recurrence period."""
+
+    name: str
+    min_gap: int
+    max_gap: int
+    min_occurrences: int
+    per_month: float
+    offset: pd.DateOffset
+
+
+CADENCES = (
+    Cadence("weekly", 6, 8, 4, 30.4375 / 7, pd.DateOffset(weeks=1)),
+    Cadence("monthly", 27, 33, 3, 1.0, pd.DateOffset(months=1)),
+    Cadence("yearly", 358, 372, 2, 1 / 12, pd.DateOffset(years=1)),
+)
+
+MIN_CADENCE_SHARE = 0.75
+
+_DROPPED_CHARACTERS = str.maketrans("", "", string.digits + string.punctuation + string.whitespace)
+
+
+def _normalized_descriptions(descriptions: pd.Series) -> np.ndarray:
+    """Series codes for each row's description; -1 for blank descriptions."""
+
+    codes, uniques = pd.factorize(descriptions.to_numpy(dtype=object))
+    # Normalize the distinct descriptions only, then map back through the codes.
+    normalized = np.empty(len(uniques), dtype=object)
+    normalized[:] = [str(description).lower().translate(_DROPPED_CHARACTERS) for description in uniques]
+    normalized_codes, normalized_uniques = pd.factorize(normalized)
+    normalized_codes[normalized_uniques[normalized_codes] == ""] = -1
+    return np.where(codes >= 0, normalized_codes[codes], -1)
+
+
+def detect_recurring(frame: pd.DataFrame) -> List[RecurringTransaction]:
+    """Find recurring series in a transaction frame, biggest monthly cost first.
+
+    ``frame`` needs ``date``, ``description``, ``category``, ``amount`` and
+    ``type`` columns (as produced by ``read_transactions_frame``), plus
+    optional ``currency`` and ``original_amount`` columns.
+    """
+
+    if frame.empty:
+        return []
+
+    descriptions = _normalized_descriptions(frame["description"])
+    kinds, kind_names = pd.factorize(frame["type"])
+    amounts = frame["amount"].to_numpy(dtype=float)
+    days = frame["date"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    if "currency" in frame and "original_amount" in frame:
+        original_amounts = frame["original_amount"].to_numpy(dtype=float)
+        # Base-currency rows (and rows without an original amount) recur in ``amount``; currency code -1.
+        foreign = ~np.isnan(original_amounts) & (frame["currency"] != get_base_currency()).to_numpy()
+        currencies, currency_names = pd.factorize(frame["currency"].where(foreign))
+        original_amounts = np.where(currencies >= 0, original_amounts, amounts)
+    else:
+        original_amounts = amounts
+        currencies, currency_names = np.full(len(frame), -1), pd.Index([])
+    cents = np.rint(original_amounts * 100).astype(np.int64)
+
+    described = np.flatnonzero(descriptions >= 0)
+    if len(described) < 2:
+        return []
+    # Fold (description, type, currency) and then cents into one dense series code, and sort once on
+    # (series, day) packed into a single int64 key. Each fold multiplies codes bounded by the row count,
+    # so the products cannot overflow.
+    label_codes = descriptions[described] * (len(kind_names) or 1) + kinds[described]
+    if len(currency_names):
+        label_codes, _ = pd.factorize(label_codes * (len(currency_names) + 1) + currencies[described] + 1)
+    cent_codes, _ = pd.factorize(cents[described])
+    series_codes, _ = pd.factorize(label_codes * (int(cent_codes.max()) + 1) + cent_codes)
+    first_day = days[described].min()
+    day_span = int(days[described].max() - first_day) + 1
+    sort_order = np.argsort(series_codes * day_span + (days[described] - first_day), kind="stable")
+    order = described[sort_order]
+    series_codes, cents, kinds, days = series_codes[sort_order], cents[order], kinds[order], days[order]
+    amounts, currencies = amounts[order], currencies[order]
+
+    starts_series = np.ones(len(order), dtype=bool)
+    starts_series[1:] = series_codes[1:] != series_codes[:-1]
+    series = np.cumsum(starts_series) - 1
+    series_count = int(series[-1]) + 1
+
+    # Gap i is the distance from row i to row i + 1 of the same series.
+    same_series = ~starts_series[1:]
+    gaps = np.diff(days)[same_series]
+    gap_series = series[1:][same_series]
+    gap_cadence = np.full(len(gaps), -1)
+    for code, cadence in enumerate(CADENCES):
+        gap_cadence[(gaps >= cadence.min_gap) & (gaps <= cadence.max_gap)] = code
+
+    gap_counts = np.bincount(gap_series, minlength=series_count)
+    matched = gap_cadence >= 0
+    cadence_counts = np.bincount(
+        gap_series[matched] * len(CADENCES) + gap_cadence[matched], minlength=series_count * len(CADENCES)
+    ).reshape(series_count, len(CADENCES))
+    dominant = cadence_counts.argmax(axis=1)
+    share = cadence_counts.max(axis=1) / np.maximum(gap_counts, 1)
+    occurrences = gap_counts + 1
+    min_occurrences = np.array([cadence.min_occurrences for cadence in CADENCES])[dominant]
+    recurring = (gap_counts > 0) & (share >= MIN_CADENCE_SHARE) & (occurrences >= min_occurrences)
+    if not recurring.any():
+        return []
+
+    first_rows = np.flatnonzero(starts_series)
+    last_rows = np.append(first_rows[1:], len(order)) - 1
+    selected = np.flatnonzero(recurring)
+    first_rows, last_rows, dominant = first_rows[selected], last_rows[selected], dominant[selected]
+    # Only the recurring series' rows are materialized; the rest never leave numpy.
+    last_descriptions = frame["description"].take(order[last_rows]).tolist()
+    last_categories = frame["category"].take(order[last_rows]).tolist()
+    first_dates = days[first_rows].astype("datetime64[D]").tolist()
+    last_dates = pd.to_datetime(days[last_rows].astype("datetime64[D]"))
+    next_dates = last_dates.copy()
+    for code, cadence in enumerate(CADENCES):
+        uses_cadence = dominant == code
+        if uses_cadence.any():
+            next_dates = next_dates.where(~uses_cadence, last_dates + cadence.offset)
+    max_overdue = np.array([cadence.max_gap - cadence.min_gap for cadence in CADENCES])[dominant]
+    active = (days.max() - next_dates.to_numpy(dtype="datetime64[D]").astype(np.int64)) <= max_overdue
+
+    results = []
+    for position, index in enumerate(selected):
+        cadence = CADENCES[dominant[position]]
+        last_row = last_rows[position]
+        foreign = currencies[last_row] >= 0
+        amount = round(float(amounts[last_row]), 2)
+        results.append(
+            RecurringTransaction(
+                description=str(last_descriptions[position]),
+                category=str(last_categories[position]),
+                type=kind_names[kinds[last_row]],
+                cadence=cadence.name,
+                amount=amount,
+                monthly_amount=round(amount * cadence.per_month, 2),
+                occurrences=int(occurrences[index]),
+                first_date=first_dates[position],
+                last_date=last_dates[position].date(),
+                next_date=next_dates[position].date(),
+                active=bool(active[position]),
+                currency=currency_names[currencies[last_row]] if foreign else None,
+                original_amount=cents[last_row] / 100 if foreign else None,
+            )
+        )
+    results.sort(key=lambda item: (-item.monthly_amount, item.description))
+    return results
+
+
+def detect_recurring_records(records: Iterable[TransactionRecord]) -> List[RecurringTransaction]:
+    """:func:`detect_recurring` over already-materialized transaction records."""
+
+    records = list(records)
+    frame = pd.DataFrame(
+        {
+            "date": pd.to_datetime([record.date for record in records]),
+            "description": pd.Series([record.description for record in records], dtype=object),
+            "category": [record.category for record in records],
+            "amount": np.array([record.amount for record in records], dtype=float),
+            "type": [record.type for record in records],
+            "currency": pd.Series([record.currency for record in records], dtype=object),
+            "original_amount": np.array(
+                [record.original_amount if record.original_amount is not None else np.nan for record in records],
+                dtype=float,
+            ),
+        }
+    )
+    return detect_recurring(frame)
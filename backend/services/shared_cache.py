@@ -0,0 +1,283 @@
+"""Cross-process finance summary cache backed by memory-mapped files.
+
+Enabled by setting ``SUMMARY_SHARED_CACHE_PATH``. Under ``uvicorn --workers N``
+every worker otherwise builds and holds its own summaries; with the shared
+cache the first worker to miss (or ``scripts/prebuild_summary_cache.py``)
+computes them once, and every worker maps the same file.
+
+Two files are used:
+
+- ``<path>``: the data file. A fixed header (magic, version, index length),
+  a JSON index of ``persona_id -> [offset, length]`` and the summary JSON
+  blobs. It is rewritten atomically (temp file + rename) on every publish.
+- ``<path>.ctl``: a tiny control file holding the current version counter.
+  Readers check it on every lookup with a single mmap read and only remap
+  the data file when the version moved, so invalidations are seen by all
+  workers on their next request.
+
+Writers serialise on an ``flock`` over ``<path>.lock``. Readers never take it.
+Reads are not zero-copy: the serialized blobs live once in the shared page
+cache, but every worker decodes a persona's blob into its own model, once per
+version, and keeps it until the version changes. Remapping and decoding are
+blocking work; async callers check :meth:`SharedSummaryCache.peek` on the loop
+and run :meth:`SharedSummaryCache.get` on a thread when it misses.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from backend.models.finance import FinanceSummary
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_DATA_MAGIC = b"SFCDATA1"
+_CTL_MAGIC = b"SFCCTL01"
+_DATA_HEADER = struct.Struct("<8sQQ")  # magic, version, index length
+_CTL_LAYOUT = struct.Struct("<8sQ")  # magic, version
+_MAX_REMAP_ATTEMPTS = 5
+
+_Index = Dict[str, Tuple[int, int]]
+
+
+class SharedSummaryCache:
+    """Versioned, file-backed summary cache shared by every worker process."""
+
+    def __init__(self, path: Path) -> None:
+        if fcntl is None:
+            raise RuntimeError("The shared summary cache requires a POSIX platform with fcntl.flock.")
+
+        self.path = path
+        self.control_path = path.with_name(path.name + ".ctl")
+        self.lock_path = path.with_name(path.name + ".lock")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._local_lock = threading.Lock()
+        self._version = -1
+        self._data_map: Optional[mmap.mmap] = None
+        self._index: _Index = {}
+        self._blob_start = 0
+        self._decoded: Dict[str, FinanceSummary] = {}
+
+        with self._writer_lock():
+            if not self.control_path.exists() or self.control_path.stat().st_size != _CTL_LAYOUT.size:
+                self.control_path.write_bytes(_CTL_LAYOUT.pack(_CTL_MAGIC, 0))
+            if not self.path.exists():
+                _, version = _CTL_LAYOUT.unpack(self.control_path.read_bytes())
+                self._write_data_file({}, version=version)
+
+        control_file = self.control_path.open("r+b")
+        try:
+            self._control_map = mmap.mmap(control_file.fileno(), _CTL_LAYOUT.size)
+        finally:
+            control_file.close()
+
+    @property
+    def version(self) -> int:
+        """Current published version, read straight from the shared control page."""
+        magic, version = _CTL_LAYOUT.unpack_from(self._control_map, 0)
+        if magic != _CTL_MAGIC:
+            raise RuntimeError(f"Corrupt shared cache control file: {self.control_path}")
+        return version
+
+    def get(self, persona_id: str) -> Optional[FinanceSummary]:
+        """Return the shared summary for ``persona_id`` or ``None`` if it is not published."""
+
+        with self._local_lock:
+            self._refresh()
+            cached = self._decoded.get(persona_id)
+            if cached is not None:
+                return cached
+
+            location = self._index.get(persona_id)
+            if location is None or self._data_map is None:
+                return None
+            offset, length = location
+            start = self._blob_start + offset
+            summary = FinanceSummary.model_validate_json(self._data_map[start : start + length])
+            self._decoded[persona_id] = summary
+            return summary
+
+    def peek(self, persona_id: str) -> Optional[FinanceSummary]:
+        """Return the summary this worker already decoded for the current version, else ``None``.
+
+        Never remaps or decodes, and does not wait for a thread that is doing so,
+        so it is safe to call on the event loop.
+        """
+
+        if self.version != self._version:
+            return None
+        return self._decoded.get(persona_id)
+
+    def get_or_build(self, persona_id: str, builder: Callable[[str], FinanceSummary]) -> FinanceSummary:
+        """Return the shared summary, computing and publishing it if no worker has yet."""
+
+        summary = self.get(persona_id)
+        if summary is not None:
+            return summary
+
+        with self._writer_lock():
+            # Another worker may have published while we waited for the lock.
+            summary = self.get(persona_id)
+            if summary is not None:
+                return summary
+
+            summary = builder(persona_id)
+            self._publish_locked({persona_id: summary.model_dump_json().encode("utf-8")}, replace=False)
+        # Hand back the mapped copy so later lookups in this worker return the same object.
+        return self.get(persona_id) or summary
+
+    def publish(self, summaries: Dict[str, FinanceSummary], *, replace: bool = False) -> int:
+        """Publish summaries for all workers and return the new version.
+
+        With ``replace=True`` personas not in ``summaries`` are dropped.
+        """
+
+        blobs = {persona_id: summary.model_dump_json().encode("utf-8") for persona_id, summary in summaries.items()}
+        with self._writer_lock():
+            return self._publish_locked(blobs, replace=replace)
+
+    def invalidate(self, persona_id: Optional[str] = None) -> int:
+        """Drop one persona (or every persona) and bump the version for all workers."""
+
+        with self._writer_lock():
+            blobs = {} if persona_id is None else self._current_blobs(exclude=persona_id)
+            return self._publish_locked(blobs, replace=True)
+
+    def close(self) -> None:
+        with self._local_lock:
+            if self._data_map is not None:
+                self._data_map.close()
+                self._data_map = None
+            self._control_map.close()
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        # flock is held per open file description, so this also serialises
+        # writer threads within a single worker.
+        with self.lock_path.open("a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        version = self.version
+        if version == self._version:
+            return
+
+        for _ in range(_MAX_REMAP_ATTEMPTS):
+            data_map, mapped_version, index, blob_start = self._map_data_file()
+            if mapped_version == version:
+                break
+            # A publish landed between reading the control page and the data file.
+            data_map.close()
+            version = self.version
+        else:
+            raise RuntimeError(f"Shared summary cache at {self.path} kept changing while remapping.")
+
+        if self._data_map is not None:
+            self._data_map.close()
+        self._data_map = data_map
+        self._index = index
+        self._blob_start = blob_start
+        self._decoded = {}
+        self._version = version
+        logger.debug("Mapped shared summary cache", extra={"version": version, "personas": len(index)})
+
+    def _map_data_file(self) -> Tuple[mmap.mmap, int, _Index, int]:
+        with self.path.open("rb") as data_file:
+            data_map = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = _DATA_HEADER.unpack_from(data_map, 0)
+        if magic != _DATA_MAGIC:
+            data_map.close()
+            raise RuntimeError(f"Corrupt shared summary cache file: {self.path}")
+        index_start = _DATA_HEADER.size
+        raw_index = json.loads(data_map[index_start : index_start + index_length])
+        index = {persona_id: (int(offset), int(length)) for persona_id, (offset, length) in raw_index.items()}
+        return data_map, version, index, index_start + index_length
+
+    def _current_blobs(self, exclude: Optional[str] = None) -> Dict[str, bytes]:
+        with self._local_lock:
+            self._refresh()
+            if self._data_map is None:
+                return {}
+            blobs: Dict[str, bytes] = {}
+            for persona_id, (offset, length) in self._index.items():
+                if persona_id == exclude:
+                    continue
+                start = self._blob_start + offset
+                blobs[persona_id] = self._data_map[start : start + length]
+            return blobs
+
+    def _publish_locked(self, blobs: Dict[str, bytes], *, replace: bool) -> int:
+        merged = blobs if replace else {**self._current_blobs(), **blobs}
+        version = self.version + 1
+        self._write_data_file(merged, version)
+        _CTL_LAYOUT.pack_into(self._control_map, 0, _CTL_MAGIC, version)
+        self._control_map.flush()
+        logger.info("Published shared summaries", extra={"version": version, "personas": len(merged)})
+        return version
+
+    def _write_data_file(self, blobs: Dict[str, bytes], version: int) -> None:
+        index: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for persona_id, blob in blobs.items():
+            index[persona_id] = (offset, len(blob))
+            offset += len(blob)
+        index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_DATA_HEADER.pack(_DATA_MAGIC, version, len(index_bytes)))
+                handle.write(index_bytes)
+                for blob in blobs.values():
+                    handle.write(blob)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+
+
+_shared_caches: Dict[Path, SharedSummaryCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_shared_summary_cache() -> Optional[SharedSummaryCache]:
+    """Return the shared cache configured by ``SUMMARY_SHARED_CACHE_PATH``, if any."""
+
+    raw_path = os.getenv("SUMMARY_SHARED_CACHE_PATH")
+    if not raw_path:
+        return None
+
+    path = Path(raw_path)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = SharedSummaryCache(path)
+            _shared_caches[path] = cache
+    return cache
+
+
+def shared_cache_version() -> int:
+    """Version of the configured shared cache (0 without one); it moves on every publish or invalidation."""
+
+    shared_cache = get_shared_summary_cache()
+    return shared_cache.version if shared_cache is not None else 0
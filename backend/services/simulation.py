@@ -0,0 +1,230 @@
+"""What-if budget simulation over cached month x category aggregates.
+
+A persona's grouped totals (the same ones behind its summary) are laid out
+once as a dense ``(group, month)`` matrix. A batch of scenarios becomes a
+``(scenario, group)`` matrix of scale factors, so projecting every scenario
+is two matrix products plus one element-wise multiply for the latest month;
+no transactions are reloaded and no summary is recomputed from scratch.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.finance import (
+    CategorySummary,
+    FinanceSummary,
+    GoalsSummary,
+    MonthlyOverview,
+    RecurringTransaction,
+    ScenarioResult,
+    SimulationResponse,
+    SimulationScenario,
+)
+from backend.services.analytics import get_group_totals, get_group_totals_async, get_recurring, get_recurring_async
+from backend.services.finance_loader import GroupTotal, get_persona_target_rate
+
+
+@dataclass
+class SimulationMatrix:
+    """Dense (type, category) x month layout of a persona's grouped totals."""
+
+    months: List[str]
+    types: List[str]
+    categories: List[str]
+    amounts: np.ndarray
+    present: np.ndarray
+    essential_latest: np.ndarray
+
+    @classmethod
+    def from_group_totals(cls, groups: Sequence[GroupTotal]) -> "SimulationMatrix":
+        months = sorted({group.month for group in groups})
+        month_index = {month: index for index, month in enumerate(months)}
+        key_index: Dict[Tuple[str, str], int] = {}
+        for group in groups:
+            key_index.setdefault((group.type, group.category), len(key_index))
+
+        amounts = np.zeros((len(key_index), len(months)))
+        present = np.zeros((len(key_index), len(months)), dtype=bool)
+        essential_latest = np.zeros(len(key_index), dtype=bool)
+        latest_column = len(months) - 1
+        for group in groups:
+            row = key_index[(group.type, group.category)]
+            column = month_index[group.month]
+            amounts[row, column] += group.amount
+            present[row, column] = True
+            if column == latest_column and group.essential:
+                essential_latest[row] = True
+
+        return cls(
+            months=months,
+            types=[kind for kind, _ in key_index],
+            categories=[category for _, category in key_index],
+            amounts=amounts,
+            present=present,
+            essential_latest=essential_latest,
+        )
+
+    def scale_factors(self, scenarios: Sequence[SimulationScenario]) -> np.ndarray:
+        """Build the (scenario, group) multiplier matrix; raises ``ValueError`` for unknown categories."""
+
+        factors = np.ones((len(scenarios), len(self.categories)))
+        types = np.array(self.types, dtype=object)
+        categories = np.array([category.lower() for category in self.categories], dtype=object)
+
+        for row, scenario in enumerate(scenarios):
+            for adjustment in scenario.adjustments:
+                mask = types == adjustment.type
+                if adjustment.category is not None:
+                    mask &= categories == adjustment.category.lower()
+                    if not mask.any():
+                        raise ValueError(f"Unknown {adjustment.type} category '{adjustment.category}'.")
+                if adjustment.essential is not None:
+                    mask &= self.essential_latest == adjustment.essential
+                factors[row, mask] *= 1 + adjustment.change_pct / 100
+        return factors
+
+
+@dataclass
+class SimulationProjection:
+    """Projected monthly totals and latest-month group spend for a batch of scenarios."""
+
+    income: np.ndarray
+    expense: np.ndarray
+    latest: np.ndarray
+
+    @property
+    def savings(self) -> np.ndarray:
+        return self.income - self.expense
+
+    def savings_rates(self) -> np.ndarray:
+        income_latest = self.income[:, -1]
+        savings_latest = self.savings[:, -1]
+        return np.divide(
+            savings_latest, income_latest, out=np.zeros_like(income_latest), where=income_latest != 0
+        )
+
+
+def project(matrix: SimulationMatrix, factors: np.ndarray) -> SimulationProjection:
+    """Apply a (scenario, group) factor matrix to the persona aggregates in one batch."""
+
+    if not matrix.months:
+        empty = np.zeros((factors.shape[0], 1))
+        return SimulationProjection(income=empty, expense=empty, latest=np.zeros_like(factors))
+
+    is_income = np.array([kind == "income" for kind in matrix.types], dtype=bool)
+    income = factors[:, is_income] @ matrix.amounts[is_income]
+    expense = factors[:, ~is_income] @ matrix.amounts[~is_income]
+    latest = factors * matrix.amounts[:, -1]
+    return SimulationProjection(income=income, expense=expense, latest=latest)
+
+
+def _projected_summary(
+    matrix: SimulationMatrix,
+    projection: SimulationProjection,
+    row: int,
+    goals: GoalsSummary,
+    recurring: List[RecurringTransaction],
+) -> FinanceSummary:
+    monthly_overview = [
+        MonthlyOverview(
+            month=month,
+            total=float(projection.expense[row, column]),
+            income=float(projection.income[row, column]),
+            savings=float(projection.income[row, column] - projection.expense[row, column]),
+        )
+        for column, month in enumerate(matrix.months)
+    ]
+    categories = [
+        CategorySummary(
+            name=matrix.categories[key],
+            latest=float(projection.latest[row, key]),
+            essential=bool(matrix.essential_latest[key]),
+        )
+        for key in range(len(matrix.categories))
+        if matrix.types[key] == "expense" and matrix.present[key, -1]
+    ]
+    # Same order as the ranking index behind the cached summary: biggest spend first, ties by name.
+    categories.sort(key=lambda category: (-category.latest, category.name))
+    # Budget adjustments scale aggregates, not individual bills, so the detected series carry over unchanged.
+    return FinanceSummary(
+        monthly_overview=monthly_overview, categories=categories, goals=goals, recurring=list(recurring)
+    )
+
+
+_matrix_cache: Dict[str, Tuple[List[GroupTotal], SimulationMatrix]] = {}
+
+
+def simulation_matrix_for(persona_id: str, groups: List[GroupTotal]) -> SimulationMatrix:
+    """Return the persona's cached matrix for ``groups``, rebuilt only when the totals were replaced."""
+
+    cached = _matrix_cache.get(persona_id)
+    if cached is not None and cached[0] is groups:
+        return cached[1]
+
+    matrix = SimulationMatrix.from_group_totals(groups)
+    _matrix_cache[persona_id] = (groups, matrix)
+    return matrix
+
+
+def get_simulation_matrix(persona_id: str) -> SimulationMatrix:
+    """Return the persona's matrix, rebuilt only when its cached group totals were replaced."""
+
+    return simulation_matrix_for(persona_id, get_group_totals(persona_id))
+
+
+def simulate_scenarios(
+    persona_id: str,
+    scenarios: Sequence[SimulationScenario],
+    include_summary: bool = True,
+    *,
+    groups: Optional[List[GroupTotal]] = None,
+    recurring: Optional[List[RecurringTransaction]] = None,
+) -> SimulationResponse:
+    """Project every scenario's savings goals (and summary) in a single vectorized batch.
+
+    ``groups`` and ``recurring`` default to the persona's cached aggregates; callers
+    that already hold them (the async path) pass them in so nothing is reloaded.
+    """
+
+    if groups is None:
+        groups = get_group_totals(persona_id)
+    matrix = simulation_matrix_for(persona_id, groups)
+    target_savings_rate = get_persona_target_rate(persona_id)
+
+    # Row 0 is the unadjusted baseline, evaluated in the same batch.
+    factors = np.vstack([np.ones((1, len(matrix.categories))), matrix.scale_factors(scenarios)])
+    projection = project(matrix, factors)
+    rates = projection.savings_rates()
+    if not include_summary:
+        recurring = []
+    elif recurring is None:
+        recurring = get_recurring(persona_id)
+
+    results: List[ScenarioResult] = []
+    for offset, scenario in enumerate(scenarios, start=1):
+        goals = GoalsSummary(target_savings_rate=target_savings_rate, current_savings_rate=float(rates[offset]))
+        summary: Optional[FinanceSummary] = None
+        if include_summary:
+            summary = _projected_summary(matrix, projection, offset, goals, recurring)
+        results.append(ScenarioResult(name=scenario.name, goals=goals, summary=summary))
+
+    baseline = GoalsSummary(target_savings_rate=target_savings_rate, current_savings_rate=float(rates[0]))
+    return SimulationResponse(baseline=baseline, scenarios=results)
+
+
+async def simulate_scenarios_async(
+    persona_id: str, scenarios: Sequence[SimulationScenario], include_summary: bool = True
+) -> SimulationResponse:
+    """Awaitable :func:`simulate_scenarios`; a cold aggregate load runs on the offload pool."""
+
+    # Hand the awaited aggregates through: the sync getters would join thread-blocking
+    # flights on the event loop if the shared version moved between the two calls.
+    groups = await get_group_totals_async(persona_id)
+    recurring = await get_recurring_async(persona_id) if include_summary else []
+    return simulate_scenarios(
+        persona_id, scenarios, include_summary=include_summary, groups=groups, recurring=recurring
+    )
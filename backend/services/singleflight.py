@@ -0,0 +1,173 @@
+"""Request coalescing for duplicate concurrent work.
+
+A :class:`SingleFlight` group ensures that concurrent callers asking for the
+same key share one in-flight computation instead of each running it. The
+first caller (the leader) runs the function; every caller that arrives while
+it is running waits for and receives the leader's result or exception.
+
+If the leader is cancelled or interrupted (a ``BaseException`` that is not an
+``Exception``, such as ``asyncio.CancelledError`` from a dropped client) the
+flight is abandoned rather than failed: waiters are woken and rejoin the key,
+so one of them becomes the new leader and runs the function again.
+
+Threads and asyncio tasks can share the same group: thread callers use
+:meth:`SingleFlight.do` and block on an event, while coroutines use
+:meth:`SingleFlight.do_async` and await a future that is resolved on their own
+event loop, so a coroutine never blocks the loop while a thread leads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """State for one in-flight computation shared by all callers of a key."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        # Set when the leader was cancelled; waiters must rejoin instead of reading the outcome.
+        self.abandoned = False
+        self.waiters = 0
+        self.loop_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[T]"]] = []
+
+    def outcome(self) -> T:
+        if self.error is not None:
+            raise self.error
+        return self.result  # type: ignore[return-value]
+
+
+def _resolve_future(future: "asyncio.Future[Any]", result: Any, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _reject_running_loop() -> None:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError("SingleFlight.do() would block the running event loop; await SingleFlight.do_async() instead.")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls that share a key into a single execution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[T]] = {}
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` for ``key`` unless a call for ``key`` is already running.
+
+        Blocks the calling thread until the shared result is available. Raises
+        ``RuntimeError`` when called on a thread running an event loop, where
+        that wait could never be released by a coroutine leader; use
+        :meth:`do_async` there instead.
+        """
+
+        _reject_running_loop()
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                break
+            call.done.wait()
+            if not call.abandoned:
+                return call.outcome()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key, call, None, exc)
+            raise
+        self._finish(key, call, result, None)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` for ``key`` unless a call for ``key`` is already running.
+
+        Followers await the leader's outcome without blocking their event loop,
+        regardless of whether the leader is a thread or another coroutine.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                    break
+                call.waiters += 1
+                future: "asyncio.Future[T]" = loop.create_future()
+                call.loop_waiters.append((loop, future))
+
+            # Shield so a cancelled follower doesn't cancel the shared future.
+            result = await asyncio.shield(future)
+            if not call.abandoned:
+                return result
+
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._finish(key, call, None, exc)
+            raise
+        self._finish(key, call, result, None)
+        return result
+
+    def _join(self, key: Hashable) -> Tuple[_Call[T], bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call[T], result: Optional[T], error: Optional[BaseException]) -> None:
+        # Publishing under the group lock guarantees that any waiter registered
+        # via the dict is notified, and later callers start a fresh flight.
+        abandoned = error is not None and not isinstance(error, Exception)
+        if abandoned:
+            # A cancelled leader says nothing about the work itself; don't hand its
+            # CancelledError to callers that are still waiting for a result.
+            error = None
+        with self._lock:
+            self._calls.pop(key, None)
+            call.result = result
+            call.error = error
+            call.abandoned = abandoned
+            call.done.set()
+            loop_waiters = list(call.loop_waiters)
+            call.loop_waiters.clear()
+
+        if abandoned and call.waiters:
+            logger.debug("Leader for key %r was cancelled; %d waiter(s) will retry", key, call.waiters)
+        elif call.waiters:
+            logger.debug("Coalesced %d duplicate call(s) for key %r", call.waiters, key)
+
+        for loop, future in loop_waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future, result, error)
+            except RuntimeError:
+                # The waiter's loop has already been closed; nobody is listening.
+                continue
@@ -0,0 +1,251 @@
+"""Sorted per-persona transaction index for paginated drill-down queries.
+
+Each persona ledger is indexed once into row-id lists sorted by
+``(sort_key, row_id)``, one per sort field and filter partition. Partitions
+cover every combination of ``category``, ``type`` and ``essential`` (each
+possibly unset), and for the amount sort also ``month``. The date sort does
+not need a month partition, because a month is a contiguous range of its keys.
+A page query picks the partition that matches its filters exactly,
+binary-searches to its starting point (the cursor, or the month/amount bounds
+along the sort key) and walks forward until the page is full. A page therefore
+costs O(log n + page) for every filter except an amount range under the date
+sort, which is checked row by row during the walk.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Literal, Optional, Tuple
+
+from backend.models.finance import TransactionPage, TransactionRecord
+from backend.services.finance_loader import load_transactions
+from backend.services.offload import run_blocking
+from backend.services.shared_cache import shared_cache_version
+from backend.services.singleflight import SingleFlight
+
+SortField = Literal["date", "amount"]
+SortOrder = Literal["asc", "desc"]
+
+SORT_FIELDS: Tuple[SortField, ...] = ("date", "amount")
+
+_IndexKey = Tuple[float, int]
+# (category, type, essential, month); None means "any".
+_PartitionKey = Tuple[Optional[str], Optional[str], Optional[bool], Optional[str]]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another query."""
+
+
+@dataclass(frozen=True)
+class TransactionQuery:
+    """Filters, ordering and page bounds for a transaction drill-down."""
+
+    month: Optional[str] = None
+    category: Optional[str] = None
+    type: Optional[str] = None
+    essential: Optional[bool] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    sort: SortField = "date"
+    order: SortOrder = "desc"
+    limit: int = 50
+    cursor: Optional[str] = None
+
+    def fingerprint(self) -> str:
+        """Identify the filter/sort combination a cursor is valid for."""
+        fields = [self.month, self.category, self.type, self.essential, self.min_amount, self.max_amount]
+        return json.dumps([*fields, self.sort, self.order], separators=(",", ":"))
+
+
+def _encode_cursor(query: TransactionQuery, key: _IndexKey) -> str:
+    payload = json.dumps({"q": query.fingerprint(), "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(query: TransactionQuery, cursor: str) -> _IndexKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        primary, row_id = payload["k"]
+        fingerprint = payload["q"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor.") from exc
+
+    if fingerprint != query.fingerprint():
+        raise InvalidCursorError("Cursor does not match the requested filters or sort order.")
+    return float(primary), int(row_id)
+
+
+def _month_bounds(month: str) -> Tuple[int, int]:
+    try:
+        year, month_number = (int(part) for part in month.split("-"))
+        start = date(year, month_number, 1)
+    except ValueError as exc:
+        raise ValueError(f"Invalid month '{month}', expected YYYY-MM.") from exc
+    end = date(year + 1, 1, 1) if month_number == 12 else date(year, month_number + 1, 1)
+    return start.toordinal(), end.toordinal()
+
+
+class PersonaTransactionIndex:
+    """Immutable sorted views over one persona's transactions."""
+
+    def __init__(self, records: List[TransactionRecord]) -> None:
+        self.records = records
+        self._keys: Dict[SortField, List[_IndexKey]] = {
+            "date": [(float(record.date.toordinal()), row_id) for row_id, record in enumerate(records)],
+            "amount": [(record.amount, row_id) for row_id, record in enumerate(records)],
+        }
+        self._orders: Dict[SortField, Dict[_PartitionKey, List[int]]] = {}
+
+        for sort, keys in self._keys.items():
+            partition_months = sort == "amount"
+            partitions: Dict[_PartitionKey, List[int]] = {}
+            # Walking rows in global key order appends to every partition in order, so none needs its own sort.
+            for _, row_id in sorted(keys):
+                record = records[row_id]
+                month = f"{record.date.year:04d}-{record.date.month:02d}" if partition_months else None
+                for category in (None, record.category):
+                    for kind in (None, record.type):
+                        for essential in (None, record.essential):
+                            partitions.setdefault((category, kind, essential, None), []).append(row_id)
+                            if month is not None:
+                                partitions.setdefault((category, kind, essential, month), []).append(row_id)
+            self._orders[sort] = partitions
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _matches(
+        self, record: TransactionRecord, query: TransactionQuery, month_range: Optional[Tuple[int, int]]
+    ) -> bool:
+        if query.type is not None and record.type != query.type:
+            return False
+        if query.essential is not None and record.essential != query.essential:
+            return False
+        if month_range is not None and not (month_range[0] <= record.date.toordinal() < month_range[1]):
+            return False
+        if query.min_amount is not None and record.amount < query.min_amount:
+            return False
+        if query.max_amount is not None and record.amount > query.max_amount:
+            return False
+        return True
+
+    def query(self, query: TransactionQuery) -> TransactionPage:
+        month_range = _month_bounds(query.month) if query.month else None
+        month = date.fromordinal(month_range[0]).strftime("%Y-%m") if month_range is not None else None
+        partition_month = month if query.sort == "amount" else None
+        order = self._orders[query.sort].get((query.category, query.type, query.essential, partition_month), [])
+        sort_key = self._keys[query.sort].__getitem__
+
+        # Bounds along the sort key; row ids are >= 0 so (x, -1) sorts before every (x, row).
+        low, high = 0, len(order)
+        if query.sort == "date" and month_range is not None:
+            low = bisect_left(order, (float(month_range[0]), -1), key=sort_key)
+            high = bisect_left(order, (float(month_range[1]), -1), key=sort_key)
+        elif query.sort == "amount":
+            if query.min_amount is not None:
+                low = bisect_left(order, (query.min_amount, -1), key=sort_key)
+            if query.max_amount is not None:
+                high = bisect_right(order, (query.max_amount, len(self.records)), key=sort_key)
+
+        if query.cursor:
+            position = _decode_cursor(query, query.cursor)
+            if query.order == "asc":
+                low = max(low, bisect_right(order, position, key=sort_key))
+            else:
+                high = min(high, bisect_left(order, position, key=sort_key))
+
+        indices = range(low, high) if query.order == "asc" else range(high - 1, low - 1, -1)
+
+        items: List[TransactionRecord] = []
+        last_key: Optional[_IndexKey] = None
+        has_more = False
+        for index in indices:
+            key = sort_key(order[index])
+            record = self.records[key[1]]
+            if not self._matches(record, query, month_range):
+                continue
+            if len(items) == query.limit:
+                has_more = True
+                break
+            items.append(record)
+            last_key = key
+
+        next_cursor = _encode_cursor(query, last_key) if has_more and last_key is not None else None
+        return TransactionPage(items=items, next_cursor=next_cursor)
+
+
+# (shared cache version, index), like the analytics aggregates: a shared invalidation drops it in every worker.
+_index_cache: Dict[str, Tuple[int, PersonaTransactionIndex]] = {}
+_index_flight: SingleFlight[PersonaTransactionIndex] = SingleFlight()
+
+
+def _cached_index(persona_id: str) -> Optional[PersonaTransactionIndex]:
+    cached = _index_cache.get(persona_id)
+    if cached is not None and cached[0] == shared_cache_version():
+        return cached[1]
+    return None
+
+
+def build_transaction_index(persona_id: str) -> PersonaTransactionIndex:
+    """Load a persona ledger and index it (uncached; safe to run on the offload pool)."""
+    return PersonaTransactionIndex(load_transactions(persona_id))
+
+
+def _build_index(persona_id: str) -> PersonaTransactionIndex:
+    cached = _cached_index(persona_id)
+    if cached is not None:
+        return cached
+
+    version = shared_cache_version()
+    index = build_transaction_index(persona_id)
+    _index_cache[persona_id] = (version, index)
+    return index
+
+
+async def _build_index_async(persona_id: str) -> PersonaTransactionIndex:
+    cached = _cached_index(persona_id)
+    if cached is not None:
+        return cached
+
+    version = shared_cache_version()
+    index = await run_blocking(build_transaction_index, persona_id)
+    _index_cache[persona_id] = (version, index)
+    return index
+
+
+def get_transaction_index(persona_id: str) -> PersonaTransactionIndex:
+    """Return the cached sorted index for a persona, building it on first use."""
+
+    cached = _cached_index(persona_id)
+    if cached is not None:
+        return cached
+    return _index_flight.do(persona_id, lambda: _build_index(persona_id))
+
+
+def query_transactions(persona_id: str, query: TransactionQuery) -> TransactionPage:
+    return get_transaction_index(persona_id).query(query)
+
+
+async def query_transactions_async(persona_id: str, query: TransactionQuery) -> TransactionPage:
+    """Awaitable :func:`query_transactions`; building a missing index is offloaded."""
+
+    index = _cached_index(persona_id)
+    if index is None:
+        index = await _index_flight.do_async(persona_id, lambda: _build_index_async(persona_id))
+    return index.query(query)
+
+
+def invalidate_transaction_index(persona_id: Optional[str] = None) -> None:
+    """Drop this process's cached index for one persona (or all)."""
+
+    if persona_id is None:
+        _index_cache.clear()
+    else:
+        _index_cache.pop(persona_id, None)
@@ -0,0 +1,293 @@
+"""SQLite-backed transaction storage.
+
+Enabled with ``FINANCE_STORAGE_BACKEND=sqlite``. Persona CSV files remain the
+source of truth: each file is ingested into a local SQLite database the first
+time it is queried and re-ingested whenever its size or mtime changes, or when
+the settings baked into the ingested rows change (base currency, FX rate
+table, category rules). Reads go through a small connection pool, and aggregations are pushed
+down to SQL ``GROUP BY`` queries served by the ``(persona_id, month, category)``
+index.
+
+Configuration:
+- ``FINANCE_SQLITE_PATH``: database file (default ``data/finance.sqlite3``)
+- ``FINANCE_SQLITE_POOL_SIZE``: pooled read connections (default 4)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.models.finance import TransactionRecord
+from backend.services.categorizer import category_rules_path
+from backend.services.finance_loader import DATA_DIR, GroupTotal, persona_data_path, read_transactions_csv
+from backend.services.fx import fx_rates_path, get_base_currency
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    persona_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    month TEXT NOT NULL,
+    description TEXT,
+    category TEXT NOT NULL,
+    amount REAL NOT NULL,
+    type TEXT NOT NULL,
+    essential INTEGER NOT NULL,
+    currency TEXT,
+    original_amount REAL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_persona_month_category
+    ON transactions (persona_id, month, category);
+CREATE TABLE IF NOT EXISTS sources (
+    persona_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inputs TEXT NOT NULL DEFAULT ''
+);
+"""
+
+# Columns added after the first schema; older databases are migrated in place.
+_ADDED_COLUMNS = (
+    ("transactions", "currency", "TEXT"),
+    ("transactions", "original_amount", "REAL"),
+    ("sources", "inputs", "TEXT NOT NULL DEFAULT ''"),
+)
+
+# (path, size, mtime_ns, inputs): the CSV's identity plus the settings applied while ingesting it.
+_SourceStamp = Tuple[str, int, int, str]
+
+
+def _default_db_path() -> Path:
+    return Path(os.getenv("FINANCE_SQLITE_PATH") or DATA_DIR / "finance.sqlite3")
+
+
+def _default_pool_size() -> int:
+    return max(1, int(os.getenv("FINANCE_SQLITE_POOL_SIZE") or 4))
+
+
+def _file_version(path: Path) -> str:
+    try:
+        return f"{path}@{path.stat().st_mtime_ns}"
+    except FileNotFoundError:
+        return f"{path}@missing"
+
+
+def _ingest_inputs() -> str:
+    """Settings baked into ingested rows: converted amounts and rule-filled categories."""
+
+    return (
+        f"base={get_base_currency()};fx={_file_version(fx_rates_path())};"
+        f"rules={_file_version(category_rules_path())}"
+    )
+
+
+def _source_stamp(file_path: Path) -> _SourceStamp:
+    stat = file_path.stat()
+    return str(file_path), stat.st_size, stat.st_mtime_ns, _ingest_inputs()
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of SQLite connections shared across threads."""
+
+    def __init__(self, db_path: Path, size: int) -> None:
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, creating one lazily until the pool is full."""
+
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            connection = self._connect() if can_create else self._idle.get()
+
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+class SQLiteTransactionStore:
+    """Persona transactions ingested from CSV into an indexed SQLite database."""
+
+    def __init__(self, db_path: Path, pool_size: int = 4) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pool = SQLiteConnectionPool(db_path, pool_size)
+        self._ingest_lock = threading.Lock()
+        self._fresh: Dict[str, _SourceStamp] = {}
+
+        with self.pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+            for table, column, column_type in _ADDED_COLUMNS:
+                existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def ingest_csv(self, persona_id: str, file_path: Path) -> int:
+        """Replace a persona's rows with the contents of ``file_path``."""
+
+        records = read_transactions_csv(persona_id, file_path)
+        rows = [
+            (
+                record.persona_id,
+                record.date.isoformat(),
+                record.date.strftime("%Y-%m"),
+                record.description,
+                record.category,
+                record.amount,
+                record.type,
+                int(record.essential),
+                record.currency,
+                record.original_amount,
+            )
+            for record in records
+        ]
+        stamp = _source_stamp(file_path)
+
+        with self.pool.connection() as connection:
+            with connection:
+                connection.execute("DELETE FROM transactions WHERE persona_id = ?", (persona_id,))
+                connection.executemany(
+                    "INSERT INTO transactions (persona_id, date, month, description, category, amount, type, essential,"
+                    " currency, original_amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO sources (persona_id, path, size, mtime_ns, inputs) VALUES (?, ?, ?, ?, ?)",
+                    (persona_id, *stamp),
+                )
+
+        self._fresh[persona_id] = stamp
+        logger.info("Ingested persona CSV into SQLite", extra={"persona_id": persona_id, "rows": len(rows)})
+        return len(rows)
+
+    def ensure_ingested(self, persona_id: str, file_path: Optional[Path] = None) -> None:
+        """Ingest the persona CSV unless the database already holds its current contents."""
+
+        source = file_path or persona_data_path(persona_id)
+        stamp = _source_stamp(source)
+        if self._fresh.get(persona_id) == stamp:
+            return
+
+        with self._ingest_lock:
+            if self._fresh.get(persona_id) == stamp:
+                return
+            with self.pool.connection() as connection:
+                stored = connection.execute(
+                    "SELECT path, size, mtime_ns, inputs FROM sources WHERE persona_id = ?", (persona_id,)
+                ).fetchone()
+            if stored is not None and tuple(stored) == stamp:
+                self._fresh[persona_id] = stamp
+                return
+            self.ingest_csv(persona_id, source)
+
+    def load_transactions(self, persona_id: str, file_path: Optional[Path] = None) -> List[TransactionRecord]:
+        self.ensure_ingested(persona_id, file_path)
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT date, description, category, amount, type, essential, currency, original_amount"
+                " FROM transactions"
+                " WHERE persona_id = ? ORDER BY id",
+                (persona_id,),
+            ).fetchall()
+
+        return [
+            TransactionRecord(
+                persona_id=persona_id,
+                date=date.fromisoformat(row[0]),
+                description=row[1],
+                category=row[2],
+                amount=row[3],
+                type=row[4],
+                essential=bool(row[5]),
+                currency=row[6],
+                original_amount=row[7],
+            )
+            for row in rows
+        ]
+
+    def transaction_frame(self, persona_id: str, file_path: Optional[Path] = None) -> pd.DataFrame:
+        """Return the row-level columns recurring detection needs, including currency and original_amount."""
+
+        self.ensure_ingested(persona_id, file_path)
+        with self.pool.connection() as connection:
+            frame = pd.read_sql_query(
+                "SELECT date, description, category, amount, type, currency, original_amount FROM transactions"
+                " WHERE persona_id = ? ORDER BY id",
+                connection,
+                params=(persona_id,),
+            )
+        frame["date"] = pd.to_datetime(frame["date"], format="%Y-%m-%d")
+        return frame
+
+    def group_totals(self, persona_id: str, file_path: Optional[Path] = None) -> List[GroupTotal]:
+        """Return per (month, type, category) totals computed by SQLite."""
+
+        self.ensure_ingested(persona_id, file_path)
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT month, type, category, SUM(amount), MAX(essential) FROM transactions"
+                " WHERE persona_id = ? GROUP BY month, category, type ORDER BY month",
+                (persona_id,),
+            ).fetchall()
+
+        return [
+            GroupTotal(month=month, type=kind, category=category, amount=float(amount), essential=bool(essential))
+            for month, kind, category, amount, essential in rows
+        ]
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+_stores: Dict[Path, SQLiteTransactionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_transaction_store() -> SQLiteTransactionStore:
+    """Return the process-wide store for the configured database path."""
+
+    db_path = _default_db_path()
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = SQLiteTransactionStore(db_path, pool_size=_default_pool_size())
+            _stores[db_path] = store
+    return store
@@ -0,0 +1,101 @@
+import React from 'react';
+import { cleanup, fireEvent, render, screen, waitFor } from '@testing-library/react';
+import { beforeEach, describe, expect, it, vi } from 'vitest';
+import useChat from '../useChat';
+import { FinanceSummary } from '../../types/finance';
+
+const createMockResponse = (body: Record<string, unknown>, ok = true, status = 200): Response => ({
+  ok,
+  status,
+  json: async () => body,
+} as Response);
+
+const staleSummary: FinanceSummary = {
+  monthly_overview: [],
+  categories: [],
+  goals: { target_savings_rate: 0.2, current_savings_rate: 0.1 },
+  fingerprint: 'v1.stale',
+};
+
+const reply = (content: string) => ({
+  message: { id: content, role: 'assistant', content },
+  metadata: { provider: 'mock', model: 'mock-model', latency_ms: 1 },
+});
+
+const TestComponent = ({ summary }: { summary: FinanceSummary }) => {
+  const { messages, input, setInput, sendMessage, error } = useChat('p1', summary);
+
+  return (
+    <div>
+      <input aria-label="message" value={input} onChange={(event) => setInput(event.target.value)} />
+      <button type="button" onClick={() => sendMessage()}>
+        Send
+      </button>
+      {error && <div role="alert">{error}</div>}
+      <ul>
+        {messages.map((message) => (
+          <li key={message.id}>{message.content}</li>
+        ))}
+      </ul>
+    </div>
+  );
+};
+
+const send = (text: string) => {
+  fireEvent.change(screen.getByLabelText('message'), { target: { value: text } });
+  fireEvent.click(screen.getByRole('button', { name: 'Send' }));
+};
+
+const chatBodies = (calls: unknown[][]) =>
+  calls
+    .filter(([url]) => url === '/chat')
+    .map(([, init]) => JSON.parse((init as RequestInit).body as string));
+
+describe('useChat', () => {
+  beforeEach(() => {
+    vi.restoreAllMocks();
+    cleanup();
+  });
+
+  it('refetches the summary and retries once when the summary ref is stale', async () => {
+    let chatCalls = 0;
+    const fetchMock = vi.fn((url: string, _init?: RequestInit) => {
+      if (url === '/personas/p1/summary') {
+        return Promise.resolve(createMockResponse({ ...staleSummary, fingerprint: 'v2.fresh' }));
+      }
+      if (url === '/chat') {
+        chatCalls += 1;
+        return Promise.resolve(
+          chatCalls === 1
+            ? createMockResponse({ detail: 'Summary reference is out of date' }, false, 409)
+            : createMockResponse(reply(`reply ${chatCalls}`))
+        );
+      }
+      throw new Error(`Unexpected request: ${url}`);
+    });
+    globalThis.fetch = fetchMock as unknown as typeof fetch;
+
+    render(<TestComponent summary={staleSummary} />);
+
+    send('Where can I save?');
+    await waitFor(() => expect(screen.getByText('reply 2')).toBeInTheDocument());
+    expect(screen.queryByRole('alert')).not.toBeInTheDocument();
+
+    send('And next month?');
+    await waitFor(() => expect(screen.getByText('reply 3')).toBeInTheDocument());
+
+    expect(chatBodies(fetchMock.mock.calls).map((body) => body.summaryRef)).toEqual(['v1.stale', 'v2.fresh', 'v2.fresh']);
+    expect(fetchMock.mock.calls.filter(([url]) => url === '/personas/p1/summary')).toHaveLength(1);
+  });
+
+  it('surfaces other chat errors without refetching the summary', async () => {
+    const fetchMock = vi.fn(() => Promise.resolve(createMockResponse({ error: 'Provider down' }, false, 503)));
+    globalThis.fetch = fetchMock as unknown as typeof fetch;
+
+    render(<TestComponent summary={staleSummary} />);
+
+    send('Where can I save?');
+    await waitFor(() => expect(screen.getByRole('alert')).toHaveTextContent('Provider down'));
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+});
@@ -1,7 +1,7 @@
 import React from 'react';
 import { cleanup, fireEvent, render, screen, waitFor } from '@testing-library/react';
 import { beforeEach, describe, expect, it, vi } from 'vitest';
-import useFinanceData from '../useFinanceData';
+import useFinanceData, { normalizeSummary } from '../useFinanceData';
 import { Persona } from '../../types/finance';
 
 type MockResponseBody = Record<string, unknown> | unknown[];
@@ -249,3 +249,38 @@ describe('useFinanceData', () => {
     expect(fetchMock).toHaveBeenCalledTimes(3);
   });
 });
+
+describe('normalizeSummary', () => {
+  it('keeps recurring series, including their original currency', () => {
+    const summary = normalizeSummary({
+      monthly_overview: [],
+      categories: [],
+      goals: { target_savings_rate: 0.2, current_savings_rate: 0.1 },
+      recurring: [
+        {
+          description: 'Streaming',
+          category: 'Entertainment',
+          type: 'expense',
+          cadence: 'monthly',
+          amount: 10.8,
+          monthly_amount: 10.8,
+          occurrences: 6,
+          first_date: '2024-01-05',
+          last_date: '2024-06-05',
+          next_date: '2024-07-05',
+          active: true,
+          currency: 'EUR',
+          original_amount: 9.99,
+        },
+        { description: '', cadence: 'monthly' },
+      ],
+      fingerprint: 'v2.abc',
+    });
+
+    expect(summary.recurring).toEqual([
+      expect.objectContaining({ description: 'Streaming', cadence: 'monthly', currency: 'EUR', original_amount: 9.99 }),
+    ]);
+    expect(summary.fingerprint).toBe('v2.abc');
+    expect(normalizeSummary({ goals: {} }).recurring).toEqual([]);
+  });
+});
@@ -1,7 +1,8 @@
 import { useEffect, useMemo, useState } from 'react';
-import { endpoints, postJson } from '../lib/api';
+import { ApiError, endpoints, getJson, postJson } from '../lib/api';
 import { ChatMessage, ChatMetadata, ChatResponse, FinanceSummary } from '../types/finance';
 import { generateId } from "../lib/uuid";
+import { normalizeSummary } from './useFinanceData';
 
 
 const useChat = (personaId: string, summary: FinanceSummary | null) => {
@@ -10,6 +11,12 @@ const useChat = (personaId: string, summary: FinanceSummary | null) => {
   const [isSending, setIsSending] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [metadata, setMetadata] = useState<ChatMetadata | null>(null);
+  // Summary refetched after the server rejected a stale summaryRef; replaces `summary` until it changes.
+  const [refreshedSummary, setRefreshedSummary] = useState<FinanceSummary | null>(null);
+
+  useEffect(() => {
+    setRefreshedSummary(null);
+  }, [personaId, summary]);
 
   useEffect(() => {
     const introMessages: ChatMessage[] = [
@@ -49,15 +56,29 @@ const useChat = (personaId: string, summary: FinanceSummary | null) => {
     setError(null);
 
     try {
-      if (!summary) {
+      const currentSummary = refreshedSummary ?? summary;
+      if (!currentSummary) {
         throw new Error('Finance summary is still loading. Please try again shortly.');
       }
 
-      const data = await postJson<ChatResponse>(endpoints.chat, {
-        personaId,
-        messages: history,
-        summary,
-      });
+      // Server-issued summaries are referenced by fingerprint instead of re-sent in full.
+      const send = (context: FinanceSummary) =>
+        postJson<ChatResponse>(endpoints.chat, {
+          personaId,
+          messages: history,
+          ...(context.fingerprint ? { summaryRef: context.fingerprint } : { summary: context }),
+        });
+
+      let data: ChatResponse;
+      try {
+        data = await send(currentSummary);
+      } catch (err) {
+        if (!(err instanceof ApiError && err.status === 409 && currentSummary.fingerprint)) throw err;
+        // 409: the server's data changed since this summary was fetched. Refetch it and retry once.
+        const freshSummary = normalizeSummary(await getJson<unknown>(endpoints.personaSummary(personaId)));
+        setRefreshedSummary(freshSummary);
+        data = await send(freshSummary);
+      }
 
       const assistantMessage: ChatMessage = data?.message ?? {
         id: generateId(),
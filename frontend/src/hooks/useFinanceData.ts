@@ -1,6 +1,6 @@
 import { useCallback, useEffect, useState } from 'react';
 import { endpoints, getJson } from '../lib/api';
-import { FinanceSummary, Persona } from '../types/finance';
+import { FinanceSummary, Persona, RecurringTransaction } from '../types/finance';
 
 type SummaryCache = Record<string, FinanceSummary>;
 
@@ -14,7 +14,31 @@ const normalizePersona = (data: any): Persona | null => {
   return { id, name, description };
 };
 
-const normalizeSummary = (data: any): FinanceSummary => {
+const CADENCES: RecurringTransaction['cadence'][] = ['weekly', 'monthly', 'yearly'];
+
+const normalizeRecurring = (item: any): RecurringTransaction | null => {
+  const description = typeof item?.description === 'string' ? item.description : '';
+  if (!description || !CADENCES.includes(item.cadence)) return null;
+
+  return {
+    description,
+    category: typeof item.category === 'string' ? item.category : '',
+    type: item.type === 'income' ? 'income' : 'expense',
+    cadence: item.cadence,
+    amount: Number(item.amount ?? 0),
+    monthly_amount: Number(item.monthly_amount ?? 0),
+    occurrences: Number(item.occurrences ?? 0),
+    first_date: String(item.first_date ?? ''),
+    last_date: String(item.last_date ?? ''),
+    next_date: String(item.next_date ?? ''),
+    active: Boolean(item.active),
+    // Only foreign-currency series carry these; base-currency ones leave them null.
+    currency: typeof item.currency === 'string' ? item.currency : null,
+    original_amount: item.original_amount == null ? null : Number(item.original_amount),
+  };
+};
+
+export const normalizeSummary = (data: any): FinanceSummary => {
   const payload = data?.summary ?? data ?? {};
 
   const monthly_overview = Array.isArray(payload.monthly_overview)
@@ -45,7 +69,16 @@ const normalizeSummary = (data: any): FinanceSummary => {
     current_savings_rate: Number(goalsPayload.current_savings_rate ?? 0),
   };
 
-  return { monthly_overview, categories, goals };
+  const recurring = Array.isArray(payload.recurring)
+    ? payload.recurring
+        .map(normalizeRecurring)
+        .filter((item: RecurringTransaction | null): item is RecurringTransaction => Boolean(item))
+    : [];
+
+  // Kept so chat requests can reference the server's copy instead of re-sending it.
+  const fingerprint = typeof payload.fingerprint === 'string' ? payload.fingerprint : null;
+
+  return { monthly_overview, categories, goals, recurring, fingerprint };
 };
 
 const useFinanceData = () => {
@@ -13,6 +13,16 @@ const parseJson = async (response: Response) => {
   }
 };
 
+export class ApiError extends Error {
+  status: number;
+
+  constructor(message: string, status: number) {
+    super(message);
+    this.name = "ApiError";
+    this.status = status;
+  }
+}
+
 const handleResponse = async <T>(response: Response): Promise<T> => {
   const data = await parseJson(response);
 
@@ -21,7 +31,7 @@ const handleResponse = async <T>(response: Response): Promise<T> => {
       (data as any)?.message ??
       (data as any)?.error ??
       `Request failed with status ${response.status}`;
-    throw new Error(message);
+    throw new ApiError(message, response.status);
   }
 
   return (data ?? {}) as T;
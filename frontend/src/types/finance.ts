@@ -17,6 +17,22 @@ export interface CategorySummary {
   essential: boolean;
 }
 
+export interface RecurringTransaction {
+  description: string;
+  category: string;
+  type: "income" | "expense";
+  cadence: "weekly" | "monthly" | "yearly";
+  amount: number;
+  monthly_amount: number;
+  occurrences: number;
+  first_date: string;
+  last_date: string;
+  next_date: string;
+  active: boolean;
+  currency?: string | null;
+  original_amount?: number | null;
+}
+
 export interface FinanceSummary {
   monthly_overview: MonthlyOverview[];
   categories: CategorySummary[];
@@ -24,6 +40,8 @@ export interface FinanceSummary {
     target_savings_rate: number;
     current_savings_rate: number;
   };
+  recurring?: RecurringTransaction[];
+  fingerprint?: string | null;
 }
 
 export interface ChatMessage {
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Benchmark rule-based categorization of description-only transactions.
+
+Generates a synthetic bank export (merchant names with store/reference
+numbers, so descriptions repeat but are not all identical) and categorizes it
+with the rule table at ``data/category_rules.json``:
+
+- cold:     compiled keyword matcher, empty description memo
+- warm:     same rule set again, every description already memoized
+- per-row:  every rule's regex tried against every row in order (the naive
+            baseline, timed on ``--naive-rows`` rows and extrapolated)
+
+Usage:
+    python scripts/bench_categorize.py --rows 1000000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.services.categorizer import UNCATEGORIZED, category_rules_path, get_category_rules  # noqa: E402
+
+MERCHANTS = [
+    "STARBUCKS STORE",
+    "WHOLE FOODS MKT",
+    "TRADER JOE'S",
+    "SHELL OIL",
+    "UBER TRIP",
+    "UBER EATS",
+    "LYFT RIDE",
+    "NETFLIX.COM",
+    "SPOTIFY USA",
+    "AMAZON MKTPLACE",
+    "TARGET",
+    "CVS PHARMACY",
+    "COMCAST CABLE",
+    "DELTA AIR",
+    "ZELLE TO",
+    "PAYROLL ACME CORP",
+    "CORNER DELI",
+    "LOCAL HARDWARE",
+]
+
+
+def build_export(rows: int, unique_suffixes: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    merchants = rng.choice(MERCHANTS, rows)
+    suffixes = rng.integers(0, unique_suffixes, rows)
+    descriptions = np.char.add(np.char.add(merchants.astype(str), " #"), suffixes.astype(str))
+    return pd.DataFrame(
+        {
+            "description": descriptions.astype(object),
+            "category": "",
+            "amount": rng.uniform(2, 400, rows),
+            "type": np.where(np.char.startswith(merchants.astype(str), "PAYROLL"), "income", "expense").astype(object),
+            "essential": False,
+        }
+    )
+
+
+def timed(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(f"{label:<18} median {median(samples):9.2f} ms   min {min(samples):9.2f} ms   n={len(samples)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--unique-suffixes", type=int, default=1_000)
+    parser.add_argument("--naive-rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rules = get_category_rules()
+    export = build_export(args.rows, args.unique_suffixes)
+    print(
+        f"Export: {args.rows:,} rows, {export['description'].nunique():,} distinct descriptions, "
+        f"{len(rules)} rules from {category_rules_path()}"
+    )
+
+    def cold() -> object:
+        rules.candidates.cache_clear()
+        return rules.categorize(export)
+
+    report("cold", timed(cold, args.repeat))
+    result = rules.categorize(export)
+    report("warm", timed(lambda: rules.categorize(export), args.repeat))
+    share = (result["category"] != UNCATEGORIZED).mean()
+    print(f"categorized        {share:9.1%} of rows")
+
+    matchers = [
+        (
+            rule,
+            re.compile(
+                "|".join(
+                    [r"(?<!\w)(?:" + "|".join(re.escape(keyword) for keyword in rule.keywords) + r")(?!\w)"]
+                    * bool(rule.keywords)
+                    + [rule.pattern] * bool(rule.pattern)
+                ),
+                re.IGNORECASE,
+            ),
+        )
+        for rule in rules.rules
+    ]
+    sample = export.head(args.naive_rows)
+
+    def naive() -> List[str]:
+        labels = []
+        for description, amount, kind in zip(sample["description"], sample["amount"], sample["type"], strict=True):
+            for rule, matcher in matchers:
+                if matcher.search(description) and rule.accepts(np.array([amount]), np.array([kind]))[0]:
+                    labels.append(rule.category)
+                    break
+            else:
+                labels.append(UNCATEGORIZED)
+        return labels
+
+    naive_samples = timed(naive, 1)
+    report(f"per-row ({len(sample):,})", naive_samples)
+    print(f"per-row (est. all) median {median(naive_samples) * args.rows / max(len(sample), 1):9.2f} ms")
+    assert naive() == result["category"].head(len(sample)).tolist(), "compiled and per-row categories disagree"
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Microbenchmark the chat/summary serialization paths.
+
+Compares, per operation, the pre-codec path with the fast codec path:
+
+- decode:   json.loads + ChatRequest.model_validate   vs  ChatRequest.model_validate_json
+- context:  model_dump + json.dumps(indent=2)         vs  model_dump + orjson (OPT_INDENT_2)
+- summary:  FinanceSummary.model_dump_json per call   vs  EncodedModelCache reuse
+
+Usage:
+    python scripts/bench_codec.py --repeat 2000 --messages 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.models.finance import ChatRequest  # noqa: E402
+from backend.services.analytics import get_finance_summary  # noqa: E402
+from backend.services.codec import EncodedModelCache, dumps_indented, orjson  # noqa: E402
+
+PERSONA_ID = "family"
+
+
+def timed_us(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def report(label: str, baseline: List[float], fast: List[float]) -> None:
+    base, quick = median(baseline), median(fast)
+    print(f"{label:<10} current {base:9.1f} us   fast {quick:9.1f} us   speed-up x{base / quick:5.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=12)
+    args = parser.parse_args()
+
+    summary = get_finance_summary(PERSONA_ID)
+    payload = {
+        "personaId": PERSONA_ID,
+        "messages": [
+            {"id": str(index), "role": "user" if index % 2 == 0 else "assistant", "content": f"Message {index} " * 20}
+            for index in range(args.messages)
+        ],
+        "summary": summary.model_dump(mode="json"),
+    }
+    body = json.dumps(payload).encode("utf-8")
+    print(f"Chat body: {len(body):,} bytes, {args.messages} messages; orjson {'on' if orjson else 'off'}")
+
+    report(
+        "decode",
+        timed_us(lambda: ChatRequest.model_validate(json.loads(body)), args.repeat),
+        timed_us(lambda: ChatRequest.model_validate_json(body), args.repeat),
+    )
+
+    report(
+        "context",
+        timed_us(lambda: json.dumps({"finance_summary": summary.model_dump(mode="json")}, indent=2), args.repeat),
+        timed_us(lambda: dumps_indented({"finance_summary": summary.model_dump(mode="json")}), args.repeat),
+    )
+
+    cache = EncodedModelCache()
+    report(
+        "summary",
+        timed_us(lambda: summary.model_dump_json().encode("utf-8"), args.repeat),
+        timed_us(lambda: cache.encode(PERSONA_ID, summary), args.repeat),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
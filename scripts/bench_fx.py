@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark converting a multi-currency ledger to the base currency.
+
+Generates a synthetic ledger frame with a ``currency`` column and a daily rate
+table, then times:
+
+- vectorized: one as-of join over the distinct (currency, date) pairs
+  (``FxRateTable.rates_for``)
+- scalar:     an ``FxRateTable.rate`` bisect lookup per row (the row-by-row
+  baseline, timed on ``--scalar-rows`` rows and extrapolated)
+- aggregate:  ``frame_group_totals`` over the converted frame
+
+Usage:
+    python scripts/bench_fx.py --rows 1000000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.services.finance_loader import frame_group_totals  # noqa: E402
+from backend.services.fx import FxRateTable  # noqa: E402
+
+BASE_CURRENCY = "USD"
+CURRENCIES = ["USD", "EUR", "GBP", "CAD", "JPY"]
+CATEGORIES = ["Rent", "Groceries", "Restaurants", "Transport", "Utilities", "Shopping", "Travel", "Health"]
+START = pd.Timestamp("2020-01-01")
+DAYS = 5 * 365
+
+
+def build_rates(seed: int = 7) -> FxRateTable:
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(START, periods=DAYS, freq="D")
+    frames = [
+        pd.DataFrame({"date": days, "currency": currency, "rate": base * np.exp(np.cumsum(rng.normal(0, 0.004, DAYS)))})
+        for currency, base in (("EUR", 1.1), ("GBP", 1.27), ("CAD", 0.74), ("JPY", 0.0068))
+    ]
+    return FxRateTable(pd.concat(frames, ignore_index=True), BASE_CURRENCY)
+
+
+def build_ledger(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "date": START + pd.to_timedelta(rng.integers(0, DAYS, rows), unit="D"),
+            "category": rng.choice(CATEGORIES, rows).astype(object),
+            "amount": rng.uniform(5, 400, rows),
+            "type": "expense",
+            "essential": rng.random(rows) < 0.4,
+            "currency": rng.choice(CURRENCIES, rows, p=[0.6, 0.2, 0.1, 0.05, 0.05]).astype(object),
+        }
+    )
+
+
+def timed(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(f"{label:<18} median {median(samples):9.2f} ms   min {min(samples):9.2f} ms   n={len(samples)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rates = build_rates()
+    ledger = build_ledger(args.rows)
+    print(f"Ledger: {args.rows:,} rows, {len(CURRENCIES)} currencies, {DAYS:,} rate days")
+
+    vectorized = timed(lambda: rates.rates_for(ledger["currency"], ledger["date"]), args.repeat)
+    report("vectorized", vectorized)
+
+    sample = ledger.head(args.scalar_rows)
+
+    def scalar() -> object:
+        days = sample["date"].dt.date
+        return [rates.rate(currency, day) for currency, day in zip(sample["currency"], days, strict=True)]
+
+    scalar_samples = timed(scalar, args.repeat)
+    report(f"scalar ({len(sample):,})", scalar_samples)
+    scale = args.rows / max(len(sample), 1)
+    print(f"scalar (est. all)  median {median(scalar_samples) * scale:9.2f} ms")
+
+    expected = np.array(scalar())
+    converted = rates.rates_for(sample["currency"], sample["date"])
+    assert np.allclose(converted, expected), "vectorized and scalar rates disagree"
+
+    converted_ledger = ledger.assign(amount=ledger["amount"] * rates.rates_for(ledger["currency"], ledger["date"]))
+    report("aggregate", timed(lambda: frame_group_totals(converted_ledger), args.repeat))
+    print(f"speedup (vectorized vs scalar): {median(scalar_samples) * scale / median(vectorized):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
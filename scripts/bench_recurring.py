@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark recurring-transaction detection on a large synthetic ledger.
+
+Generates ``--rows`` transactions: a few hundred weekly, monthly and yearly
+subscriptions and bills, plus random one-off purchases with reference numbers,
+then times ``detect_recurring`` (one sort plus vectorized gap analysis).
+Normalization runs once per distinct description, so ``--refs`` (store or
+reference numbers per merchant) drives most of the cost.
+
+Usage:
+    python scripts/bench_recurring.py --rows 1000000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.services.recurring import detect_recurring  # noqa: E402
+
+START = pd.Timestamp("2020-01-01")
+DAYS = 5 * 365
+# 40 x 50 merchant names; store numbers are appended and stripped again by normalization.
+MERCHANT_PREFIXES = [f"{first}{second}" for first in "BCDFGHKLMNPRSTVWZ" for second in ("ar", "el")][:40]
+MERCHANT_KINDS = [
+    "Bakery", "Books", "Cafe", "Deli", "Diner", "Florist", "Garage", "Grill", "Grocer", "Hardware",
+    "Kitchen", "Market", "Outfitters", "Pantry", "Pharmacy", "Pizza", "Salon", "Shoes", "Sports", "Supply",
+    "Tailor", "Tavern", "Toys", "Wine", "Bistro", "Boutique", "Cinema", "Cycles", "Dental", "Electric",
+    "Fitness", "Framing", "Games", "Gifts", "Hotel", "Jewelers", "Laundry", "Liquor", "Music", "Noodles",
+    "Optical", "Parking", "Pets", "Print", "Ramen", "Records", "Repair", "Studio", "Sushi", "Vintage",
+]
+MERCHANTS = [f"{prefix} {kind}" for prefix in MERCHANT_PREFIXES for kind in MERCHANT_KINDS]
+
+
+def build_ledger(rows: int, series: int, refs: int = 25, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    parts = []
+    for index in range(series):
+        step = (7, 30, 365)[index % 3]
+        dates = START + pd.to_timedelta(np.arange(int(rng.integers(0, step)), DAYS, step), unit="D")
+        parts.append(
+            pd.DataFrame(
+                {
+                    "date": dates,
+                    "description": f"Subscription {MERCHANTS[-1 - index]} REF#{index * 31}",
+                    "category": "Subscriptions",
+                    "amount": round(float(rng.uniform(5, 200)), 2),
+                    "type": "expense",
+                }
+            )
+        )
+    recurring_rows = sum(len(part) for part in parts)
+    noise = max(rows - recurring_rows, 0)
+    parts.append(
+        pd.DataFrame(
+            {
+                "date": START + pd.to_timedelta(rng.integers(0, DAYS, noise), unit="D"),
+                "description": np.char.add(
+                    np.char.add(rng.choice(MERCHANTS, noise).astype(str), " #"),
+                    rng.integers(0, refs, noise).astype(str),
+                ).astype(object),
+                "category": "Shopping",
+                "amount": np.round(rng.uniform(1, 500, noise), 2),
+                "type": "expense",
+            }
+        )
+    )
+    return pd.concat(parts, ignore_index=True).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def timed(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(f"{label:<18} median {median(samples):9.2f} ms   min {min(samples):9.2f} ms   n={len(samples)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--series", type=int, default=300)
+    parser.add_argument("--refs", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ledger = build_ledger(args.rows, args.series, args.refs)
+    print(
+        f"Ledger: {len(ledger):,} rows, {ledger['description'].nunique():,} distinct descriptions, "
+        f"{args.series} planted recurring series"
+    )
+
+    report("detect", timed(lambda: detect_recurring(ledger), args.repeat))
+    found = detect_recurring(ledger)
+    planted = sum(item.category == "Subscriptions" for item in found)
+    print(f"found              {planted} of {args.series} planted series, {len(found) - planted} among one-off noise")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark the CSV and SQLite transaction storage paths.
+
+Generates a synthetic persona ledger, then times building the
+(month, type, category) totals that feed the finance summary:
+
+- csv:    parse the CSV into a frame and aggregate it with pandas (the
+          production CSV path, ``frame_group_totals``)
+- sqlite: GROUP BY pushed down to the indexed SQLite table
+
+"cold" runs open a fresh store (new connections, no page cache inside
+SQLite); "warm" runs repeat the query on the same store.
+
+Usage:
+    python scripts/bench_storage.py --rows 50000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from statistics import median
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.services.finance_loader import frame_group_totals, read_transactions_frame  # noqa: E402
+from backend.services.transaction_store import SQLiteTransactionStore  # noqa: E402
+
+PERSONA_ID = "bench"
+CATEGORIES = ["Rent", "Groceries", "Restaurants", "Transport", "Utilities", "Shopping", "Travel", "Health"]
+
+
+def write_ledger(path: Path, rows: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("date,description,category,amount,type,essential\n")
+        for index in range(rows):
+            day = start + timedelta(days=rng.randrange(5 * 365))
+            if index % 20 == 0:
+                handle.write(f"{day.isoformat()},Salary,Income,{rng.uniform(3000, 6000):.2f},income,True\n")
+                continue
+            category = rng.choice(CATEGORIES)
+            essential = category in {"Rent", "Groceries", "Utilities", "Health"}
+            amount = rng.uniform(5, 400)
+            handle.write(f"{day.isoformat()},{category} purchase,{category},{amount:.2f},expense,{essential}\n")
+
+
+def timed(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(f"{label:<18} median {median(samples):9.2f} ms   min {min(samples):9.2f} ms   n={len(samples)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        csv_path = tmp_dir / "ledger.csv"
+        write_ledger(csv_path, args.rows)
+        print(f"Ledger: {args.rows:,} rows ({csv_path.stat().st_size / 1e6:.1f} MB)")
+
+        def csv_query() -> object:
+            return frame_group_totals(read_transactions_frame(csv_path))
+
+        report("csv cold", timed(csv_query, 1))
+        report("csv warm", timed(csv_query, args.repeat))
+
+        db_path = tmp_dir / "bench.sqlite3"
+        store = SQLiteTransactionStore(db_path)
+        start = time.perf_counter()
+        store.ensure_ingested(PERSONA_ID, csv_path)
+        print(f"sqlite ingest      {(time.perf_counter() - start) * 1000:9.2f} ms (one-off)")
+        store.close()
+
+        def sqlite_cold() -> object:
+            cold_store = SQLiteTransactionStore(db_path)
+            try:
+                return cold_store.group_totals(PERSONA_ID, csv_path)
+            finally:
+                cold_store.close()
+
+        report("sqlite cold", timed(sqlite_cold, args.repeat))
+
+        warm_store = SQLiteTransactionStore(db_path)
+        warm_store.group_totals(PERSONA_ID, csv_path)
+        report("sqlite warm", timed(lambda: warm_store.group_totals(PERSONA_ID, csv_path), args.repeat))
+        warm_store.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
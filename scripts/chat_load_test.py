@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Concurrent load test for the POST /chat/ endpoint.
+
+Fires --requests chat calls at --concurrency from a thread pool and reports
+throughput, latency percentiles and status codes. Pair it with
+MOCK_LATENCY_MS (mock provider) or scripts/openai_stub_server.py (real
+OpenAI provider against a local stub) to benchmark the chat path offline.
+
+Usage:
+    python scripts/chat_load_test.py --concurrency 16 --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+
+def post_chat(api_base: str, persona_id: str, index: int, timeout: float) -> Tuple[int, float]:
+    payload = {
+        "personaId": persona_id,
+        "messages": [{"id": "1", "role": "user", "content": f"Load test question #{index}: where can I save?"}],
+    }
+    req = Request(
+        f"{api_base.rstrip('/')}/chat/",
+        method="POST",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    start = time.perf_counter()
+    try:
+        with urlopen(req, timeout=timeout) as resp:  # nosec B310 (local dev tool)
+            resp.read()
+            status = resp.status
+    except HTTPError as exc:
+        status = exc.code
+    except (URLError, TimeoutError):
+        status = 0
+    return status, (time.perf_counter() - start) * 1000
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-base", default="http://localhost:8000")
+    parser.add_argument("--persona", default="family")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(
+            pool.map(lambda i: post_chat(args.api_base, args.persona, i, args.timeout), range(args.requests))
+        )
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    latencies = [latency for status, latency in results if status == 200]
+    print(f"Requests: {args.requests} at concurrency {args.concurrency} in {elapsed:.2f}s")
+    print(f"Throughput: {args.requests / elapsed:.1f} req/s")
+    print(f"Status codes: {dict(sorted(statuses.items()))} (0 = connection error/timeout)")
+    if latencies:
+        print(
+            "Latency (200s): "
+            + "  ".join(f"p{pct}={percentile(latencies, pct):.0f}ms" for pct in (50, 90, 95, 99))
+            + f"  max={max(latencies):.0f}ms"
+        )
+    return 0 if statuses.get(200) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
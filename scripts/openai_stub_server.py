@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Run a local OpenAI-compatible Chat Completions stub for offline load tests.
+
+Start the stub, then point the real OpenAI provider at it:
+
+    python scripts/openai_stub_server.py --latency-ms 800 --distribution lognormal \
+        --jitter-ms 300 --tokens-per-second 60 --rate-limit-rate 0.05
+    AI_PROVIDER=openai OPENAI_API_KEY=stub OPENAI_BASE_URL=http://localhost:8100/v1 \
+        uvicorn backend.main:app --port 8000
+    python scripts/chat_load_test.py --concurrency 32 --requests 500
+
+Every option can also be set through STUB_* environment variables
+(e.g. STUB_LATENCY_MS, STUB_ERROR_RATE). GET /stub/stats reports request,
+in-flight, 429 and error counters.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.devtools.openai_stub import create_stub_app  # noqa: E402
+from backend.services.latency_sim import DISTRIBUTIONS, LatencyProfile  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    defaults = LatencyProfile.from_env("STUB_")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Mean time to first token")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default=defaults.distribution)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms, help="Half-width or std deviation")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate, help="Share of 429s")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after_s, help="Retry-After seconds")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    profile = LatencyProfile(
+        latency_ms=args.latency_ms,
+        distribution=args.distribution,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"Serving OpenAI stub on http://{args.host}:{args.port}/v1 with {profile}")
+    uvicorn.run(create_stub_app(profile), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
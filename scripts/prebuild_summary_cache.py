@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Prebuild the shared finance summary cache before starting multiple workers.
+
+Computes every persona summary once and publishes it to the memory-mapped
+cache at SUMMARY_SHARED_CACHE_PATH, so `uvicorn --workers N` processes map
+the published summaries instead of each recomputing them on import.
+
+Usage:
+    SUMMARY_SHARED_CACHE_PATH=/tmp/sfc-summaries.bin python scripts/prebuild_summary_cache.py
+    SUMMARY_SHARED_CACHE_PATH=/tmp/sfc-summaries.bin uvicorn backend.main:app --workers 4
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.services.analytics import compute_finance_summary  # noqa: E402
+from backend.services.finance_loader import list_personas, load_transactions  # noqa: E402
+from backend.services.shared_cache import get_shared_summary_cache  # noqa: E402
+
+
+def main() -> int:
+    cache = get_shared_summary_cache()
+    if cache is None:
+        print("❌ SUMMARY_SHARED_CACHE_PATH is not set.")
+        return 1
+
+    summaries = {
+        persona.id: compute_finance_summary(persona.id, load_transactions(persona.id)) for persona in list_personas()
+    }
+    version = cache.publish(summaries, replace=True)
+    print(f"✅ Published {len(summaries)} summaries to {cache.path} (version {version})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
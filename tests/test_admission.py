@@ -0,0 +1,158 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.models.finance import ChatRequest
+from backend.routes import chat
+from backend.services.admission import AdmissionConfig, AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides: Any) -> AdmissionController:
+    options: Dict[str, Any] = {
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 4,
+        "max_queue": 1,
+        "queue_timeout_s": 1.0,
+        "latency_target_ms": 100.0,
+    }
+    return AdmissionController(AdmissionConfig(**{**options, **overrides}))
+
+
+def test_queues_over_limit_and_rejects_when_queue_is_full() -> None:
+    controller = _controller()
+
+    async def scenario() -> List[str]:
+        first = await controller.acquire()
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        assert rejected.value.reason == "queue_full"
+        assert rejected.value.retry_after_s >= 1
+
+        controller.release(first, latency_ms=10)
+        await queued
+        return [str(controller.in_flight), str(controller.queue_depth)]
+
+    assert asyncio.run(scenario()) == ["2", "0"]
+
+
+def test_queued_requests_are_shed_after_their_deadline() -> None:
+    controller = _controller(initial_limit=1, max_limit=1)
+
+    async def scenario() -> None:
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(timeout_s=0.1)
+        assert rejected.value.reason == "queue_timeout"
+
+    asyncio.run(scenario())
+    assert controller.snapshot()["shed_timeout"] == 1
+    assert controller.queue_depth == 0
+
+
+def test_requests_that_cannot_make_their_deadline_are_shed_without_queueing() -> None:
+    controller = _controller(initial_limit=1, max_limit=1)
+
+    async def scenario() -> None:
+        ticket = await controller.acquire()
+        controller.release(ticket, latency_ms=5000)
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(timeout_s=0.5)
+        assert rejected.value.reason == "deadline"
+        assert rejected.value.retry_after_s >= 5
+
+    asyncio.run(scenario())
+    assert controller.snapshot()["queued"] == 0
+
+
+def test_limit_grows_additively_and_shrinks_multiplicatively() -> None:
+    controller = _controller(initial_limit=2, max_limit=8, latency_target_ms=100, max_queue=8)
+
+    async def saturate(rounds: int, latency_ms: float) -> None:
+        for _ in range(rounds):
+            tickets = [await controller.acquire() for _ in range(controller.limit)]
+            for ticket in tickets:
+                controller.release(ticket, latency_ms=latency_ms)
+
+    asyncio.run(saturate(6, latency_ms=10))
+    grown = controller.limit
+    assert grown > 2
+
+    ticket = asyncio.run(controller.acquire())
+    controller.release(ticket, latency_ms=500)
+    assert controller.limit < grown
+
+
+def test_abandoned_tickets_free_the_slot_without_moving_the_limit() -> None:
+    controller = _controller(initial_limit=1, max_limit=1)
+
+    async def scenario() -> None:
+        ticket = await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        controller.abandon(ticket)
+        await queued
+
+    asyncio.run(scenario())
+    stats = controller.snapshot()
+    assert (stats["abandoned"], stats["failed"], stats["latency_ewma_ms"]) == (1, 0, 0)
+    assert controller.limit == 1
+    assert controller.in_flight == 1
+
+
+def test_chat_client_hang_up_is_not_a_provider_failure(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    controller = _controller()
+    monkeypatch.setattr(chat, "chat_admission", controller)
+
+    async def hang_up(*args: Any, **kwargs: Any) -> Any:
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(chat, "run_in_threadpool", hang_up)
+    request = ChatRequest.model_validate(
+        {"personaId": "single", "messages": [{"id": "1", "role": "user", "content": "Hello"}]}
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(chat.chat(request, request_timeout_ms=None))
+
+    stats = controller.snapshot()
+    assert (stats["abandoned"], stats["failed"], stats["in_flight"]) == (1, 0, 0)
+    assert controller.limit == 2
+
+
+def test_chat_route_returns_429_with_retry_after_when_saturated(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    controller = _controller(initial_limit=1, max_limit=1, max_queue=0)
+    asyncio.run(controller.acquire())
+    monkeypatch.setattr("backend.routes.chat.chat_admission", controller)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/chat/", json={"personaId": "single", "messages": [{"id": "1", "role": "user", "content": "Hello"}]}
+    )
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_admission_stats_are_exposed_for_monitoring(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    client = TestClient(create_app())
+    client.post("/chat/", json={"personaId": "single", "messages": [{"id": "1", "role": "user", "content": "Hi"}]})
+
+    stats = client.get("/health/chat-admission").json()
+
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] >= 1
+    assert stats["limit"] >= 1
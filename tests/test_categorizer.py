@@ -0,0 +1,170 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from backend.services import categorizer
+from backend.services.categorizer import (
+    UNCATEGORIZED,
+    CategoryRulesError,
+    get_category_rules,
+    parse_category_rules,
+)
+from backend.services.finance_loader import persona_data_path, read_transactions_csv, read_transactions_frame
+from backend.services.transaction_store import SQLiteTransactionStore
+
+_RULES = [
+    {"category": "Restaurants", "keywords": ["uber eats", "Starbucks"], "max_amount": 50},
+    {"category": "Transport", "keywords": ["uber", "lyft"], "essential": True},
+    {"category": "Travel", "keywords": ["starbucks"], "min_amount": 50},
+    {"category": "Refunds", "pattern": r"^refund\b", "type": "income"},
+]
+
+
+def _frame(rows: Any) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"description": description, "category": category, "amount": amount, "type": kind, "essential": False}
+            for description, category, amount, kind in rows
+        ]
+    )
+
+
+def test_first_matching_rule_wins_after_amount_and_type_bounds() -> None:
+    rules = parse_category_rules(_RULES)
+    frame = _frame(
+        [
+            ("UBER EATS 1234", "", 30.0, "expense"),
+            ("UBER EATS 1234", "", 80.0, "expense"),
+            ("Uber trip downtown", "", 12.0, "expense"),
+            ("STARBUCKS AIRPORT", "", 60.0, "expense"),
+            ("Refund Amazon", "", 20.0, "income"),
+            ("Refund Amazon", "", 20.0, "expense"),
+            ("Uberto's pizza", "", 20.0, "expense"),
+            (None, "", 5.0, "expense"),
+            ("Uber trip downtown", "Groceries", 12.0, "expense"),
+        ]
+    )
+
+    result = rules.categorize(frame)
+
+    assert result["category"].tolist() == [
+        "Restaurants",
+        "Transport",
+        "Transport",
+        "Travel",
+        "Refunds",
+        UNCATEGORIZED,
+        UNCATEGORIZED,
+        UNCATEGORIZED,
+        "Groceries",
+    ]
+    assert result["essential"].tolist() == [False, True, True, False, False, False, False, False, False]
+    assert frame["category"].iloc[0] == ""
+
+
+def test_overlapping_keywords_are_all_candidates() -> None:
+    rules = parse_category_rules(
+        [
+            {"category": "Transport", "keywords": ["uber"]},
+            {"category": "Restaurants", "keywords": ["uber eats", "eats now"]},
+            {"category": "Groceries", "keywords": ["now"]},
+        ]
+    )
+
+    assert rules.candidates("UBER EATS NOW") == (0, 1, 2)
+    assert rules.candidates("superuber eats") == ()
+
+
+def test_text_matching_is_memoized_per_description() -> None:
+    rules = parse_category_rules(_RULES)
+    frame = _frame([("UBER EATS 1234", "", float(amount), "expense") for amount in range(1000)])
+
+    rules.categorize(frame)
+    rules.categorize(frame)
+
+    info = rules.candidates.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "entries, message",
+    [
+        ([{"keywords": ["uber"]}], "'category'"),
+        ([{"category": "Transport"}], "'keywords' or a 'pattern'"),
+        ([{"category": "Transport", "pattern": "("}], "Invalid category rule pattern"),
+        ({"category": "Transport"}, "'category'"),
+    ],
+)
+def test_invalid_rules_are_rejected(entries: Any, message: str) -> None:
+    with pytest.raises(CategoryRulesError, match=message):
+        parse_category_rules(entries)
+
+
+def test_loader_categorizes_description_only_exports(tmp_path: Path, monkeypatch: Any) -> None:
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps(_RULES), encoding="utf-8")
+    monkeypatch.setenv("FINANCE_CATEGORY_RULES_PATH", str(rules_path))
+    ledger = tmp_path / "export.csv"
+    ledger.write_text(
+        "date,description,amount,type\n"
+        "2024-06-01,UBER EATS 1234,25,expense\n"
+        "2024-06-02,LYFT RIDE,18,expense\n"
+        "2024-06-03,Corner store,9,expense\n",
+        encoding="utf-8",
+    )
+
+    records = read_transactions_csv("export", ledger)
+
+    assert [(record.category, record.essential) for record in records] == [
+        ("Restaurants", False),
+        ("Transport", True),
+        (UNCATEGORIZED, False),
+    ]
+    assert get_category_rules() is get_category_rules()
+
+
+def test_sqlite_store_recategorizes_when_rules_change(tmp_path: Path, monkeypatch: Any) -> None:
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps(_RULES), encoding="utf-8")
+    monkeypatch.setenv("FINANCE_CATEGORY_RULES_PATH", str(rules_path))
+    ledger = tmp_path / "export.csv"
+    ledger.write_text("date,description,amount,type\n2024-06-01,Corner store,9,expense\n", encoding="utf-8")
+    db_path = tmp_path / "finance.sqlite3"
+
+    def stored_categories() -> list:
+        store = SQLiteTransactionStore(db_path)
+        try:
+            return [group.category for group in store.group_totals("export", ledger)]
+        finally:
+            store.close()
+
+    assert stored_categories() == [UNCATEGORIZED]
+
+    rules_path.write_text(json.dumps(_RULES + [{"category": "Groceries", "keywords": ["corner store"]}]))
+    stat = rules_path.stat()
+    os.utime(rules_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert stored_categories() == ["Groceries"]
+
+
+def test_default_rules_reproduce_the_demo_categories(monkeypatch: Any) -> None:
+    monkeypatch.delenv("FINANCE_CATEGORY_RULES_PATH", raising=False)
+    rules = get_category_rules()
+
+    for persona_id in ("single", "family", "recent_grad"):
+        frame = read_transactions_frame(persona_data_path(persona_id))
+        result = rules.categorize(frame.assign(category=""))
+        assert result["category"].tolist() == frame["category"].tolist()
+        assert result["essential"].tolist() == frame["essential"].tolist()
+
+
+def test_missing_rules_file_leaves_blank_rows_uncategorized(monkeypatch: Any) -> None:
+    monkeypatch.setenv("FINANCE_CATEGORY_RULES_PATH", "/nonexistent/rules.json")
+
+    result = get_category_rules().categorize(_frame([("Anything", "", 1.0, "expense")]))
+
+    assert result["category"].tolist() == [UNCATEGORIZED]
+    assert categorizer.category_rules_path() == Path("/nonexistent/rules.json")
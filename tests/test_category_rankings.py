@@ -0,0 +1,130 @@
+from collections import defaultdict
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.services import analytics
+from backend.services.category_rankings import CategoryRankingIndex
+from backend.services.finance_loader import GroupTotal, load_transactions
+
+
+def _expected_rankings(persona_id: str) -> Dict[str, List[Tuple[str, float]]]:
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for record in load_transactions(persona_id):
+        if record.type == "expense":
+            totals[record.date.strftime("%Y-%m")][record.category] += record.amount
+    return {
+        month: sorted(categories.items(), key=lambda item: (-item[1], item[0]))
+        for month, categories in totals.items()
+    }
+
+
+def _ranked(index: CategoryRankingIndex, month: str) -> List[Tuple[str, float]]:
+    return [(category.name, category.latest) for category in index.top(month)]
+
+
+def test_every_month_is_ranked_and_top_k_is_a_prefix() -> None:
+    expected = _expected_rankings("family")
+    index = CategoryRankingIndex.from_group_totals(analytics.get_group_totals("family"))
+
+    assert index.months == sorted(expected)
+    for month, ranking in expected.items():
+        assert _ranked(index, month) == pytest.approx(ranking)
+        assert [category.name for category in index.top(month, 3)] == [name for name, _ in ranking[:3]]
+
+
+def test_sync_only_touches_changed_categories() -> None:
+    groups = analytics.get_group_totals("single")
+    index = CategoryRankingIndex.from_group_totals(groups)
+    latest = index.latest_month
+    expense = [group for group in groups if group.type == "expense" and group.month == latest]
+    bumped, dropped = expense[0], expense[1]
+
+    changed_groups = [
+        replace(group, amount=group.amount + 5000) if group is bumped else group
+        for group in groups
+        if group is not dropped
+    ]
+    changed_groups.append(GroupTotal("2099-01", "expense", "Travel", 42.0, False))
+
+    assert index.sync(changed_groups) == 3
+    assert index.top(latest, 1)[0].name == bumped.category
+    rebuilt = CategoryRankingIndex.from_group_totals(changed_groups)
+    for month in rebuilt.months:
+        assert index.top(month) == rebuilt.top(month)
+    assert index.sync(changed_groups) == 0
+
+
+def test_add_repositions_a_single_category() -> None:
+    index = CategoryRankingIndex()
+    index.add("2024-06", "Groceries", 100.0, essential=True)
+    index.add("2024-06", "Dining", 80.0)
+    index.add("2024-06", "Dining", 50.0)
+
+    assert [(c.name, c.latest, c.essential) for c in index.top("2024-06")] == [
+        ("Dining", 130.0, False),
+        ("Groceries", 100.0, True),
+    ]
+
+
+def test_movers_rank_by_absolute_change() -> None:
+    groups = [
+        GroupTotal("2024-05", "expense", "Dining", 300.0, False),
+        GroupTotal("2024-05", "expense", "Rent", 1500.0, True),
+        GroupTotal("2024-05", "expense", "Gym", 40.0, False),
+        GroupTotal("2024-06", "expense", "Dining", 120.0, False),
+        GroupTotal("2024-06", "expense", "Rent", 1500.0, True),
+        GroupTotal("2024-06", "expense", "Travel", 600.0, False),
+        GroupTotal("2024-06", "income", "Income", 4000.0, True),
+    ]
+    index = CategoryRankingIndex.from_group_totals(groups)
+
+    movers = index.movers("2024-06", 3)
+
+    assert [(mover.name, mover.change) for mover in movers] == [
+        ("Travel", 600.0),
+        ("Dining", -180.0),
+        ("Gym", -40.0),
+    ]
+    assert movers[0].change_pct is None
+    assert movers[1].change_pct == pytest.approx(-0.6)
+
+
+def test_category_endpoints() -> None:
+    client = TestClient(create_app())
+    expected = _expected_rankings("family")
+    month = sorted(expected)[0]
+
+    ranking = client.get("/personas/family/categories", params={"month": month, "limit": 3})
+    assert ranking.status_code == 200
+    assert [item["name"] for item in ranking.json()["categories"]] == [name for name, _ in expected[month][:3]]
+
+    latest = client.get("/personas/family/categories").json()
+    summary = analytics.get_finance_summary("family")
+    assert latest["month"] == summary.monthly_overview[-1].month
+    assert [item["name"] for item in latest["categories"]] == [category.name for category in summary.categories]
+
+    movers = client.get("/personas/family/categories/movers", params={"limit": 2})
+    assert movers.status_code == 200
+    assert len(movers.json()["movers"]) == 2
+    assert movers.json()["previous_month"] < movers.json()["month"]
+
+    assert client.get("/personas/family/categories", params={"month": "1999-01"}).status_code == 404
+
+
+def test_default_month_matches_the_summary_when_it_only_has_income(monkeypatch: pytest.MonkeyPatch) -> None:
+    groups = [*analytics.get_group_totals("single"), GroupTotal("2099-01", "income", "Salary", 3000.0, True)]
+    monkeypatch.setitem(analytics._group_totals_cache, "single", (analytics.shared_cache_version(), groups))
+    monkeypatch.setattr(analytics, "_rankings_cache", {})
+    summary = analytics.summarize_group_totals("single", groups)
+    client = TestClient(create_app())
+
+    latest = client.get("/personas/single/categories")
+
+    assert latest.status_code == 200
+    assert latest.json()["month"] == summary.monthly_overview[-1].month == "2099-01"
+    assert latest.json()["categories"] == summary.categories == []
+    assert client.get("/personas/single/categories/movers").json()["month"] == "2099-01"
@@ -0,0 +1,88 @@
+import json
+from typing import Any
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.models.finance import ChatRequest, FinanceSummary
+from backend.services.analytics import get_finance_summary
+from backend.services.codec import EncodedModelCache, decode_model, dumps_indented
+
+
+def _chat_body(**overrides: Any) -> bytes:
+    payload = {
+        "personaId": "family",
+        "messages": [{"id": "1", "role": "user", "content": "How am I doing?"}],
+        "summary": get_finance_summary("family").model_dump(mode="json"),
+        **overrides,
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def test_decode_matches_the_regular_validation_path() -> None:
+    body = _chat_body()
+
+    assert decode_model(ChatRequest, body) == ChatRequest.model_validate(json.loads(body))
+
+
+@pytest.mark.parametrize(
+    "overrides, loc",
+    [
+        ({"personaId": ""}, ["body", "personaId"]),
+        ({"messages": []}, ["body", "messages"]),
+        ({"messages": [{"id": "1", "role": "user", "content": "   "}]}, ["body", "messages", 0, "content"]),
+    ],
+)
+def test_decode_keeps_validation_rules(overrides: Any, loc: Any) -> None:
+    with pytest.raises(RequestValidationError) as exc_info:
+        decode_model(ChatRequest, _chat_body(**overrides))
+
+    assert [list(error["loc"]) for error in exc_info.value.errors()] == [loc]
+
+
+def test_chat_route_reports_decode_errors_as_422(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    client = TestClient(create_app())
+
+    invalid = client.post("/chat/", content=b"{not json", headers={"content-type": "application/json"})
+    blank = client.post("/chat/", content=_chat_body(personaId=""), headers={"content-type": "application/json"})
+    ok = client.post("/chat/", content=_chat_body(), headers={"content-type": "application/json"})
+
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["type"] == "json_invalid"
+    assert blank.status_code == 422
+    assert blank.json()["detail"][0]["loc"] == ["body", "personaId"]
+    assert ok.status_code == 200
+    schema = client.get("/openapi.json").json()["paths"]["/chat/"]["post"]["requestBody"]
+    assert schema["content"]["application/json"]["schema"]["title"] == "ChatRequest"
+
+
+def test_summary_encoding_is_reused_until_the_summary_changes() -> None:
+    cache = EncodedModelCache()
+    summary = get_finance_summary("single")
+
+    first = cache.encode("single", summary)
+    assert cache.encode("single", summary) is first
+    assert FinanceSummary.model_validate_json(first) == summary
+
+    replaced = summary.model_copy(deep=True)
+    assert cache.encode("single", replaced) is not first
+
+
+def test_summary_endpoint_serves_the_cached_encoding() -> None:
+    client = TestClient(create_app())
+
+    response = client.get("/personas/single/summary")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert FinanceSummary.model_validate(response.json()) == get_finance_summary("single")
+
+
+def test_dumps_indented_round_trips() -> None:
+    payload = {"finance_summary": get_finance_summary("family").model_dump(mode="json"), "note": "café"}
+
+    assert json.loads(dumps_indented(payload)) == payload
+    assert "\n  " in dumps_indented(payload)
@@ -0,0 +1,168 @@
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from backend.services import analytics
+from backend.services.analytics import _group_totals, compute_finance_summary
+from backend.services.finance_loader import frame_group_totals, read_transactions_csv, read_transactions_frame
+from backend.services.fx import FxRateTable, MissingFxRateError, get_fx_rates
+from backend.services.transaction_store import SQLiteTransactionStore
+
+_RATES = pd.DataFrame(
+    {
+        "date": ["2024-06-01", "2024-06-15", "2024-06-01", "2024-07-01"],
+        "currency": ["EUR", "EUR", "gbp", "EUR"],
+        "rate": [1.10, 1.20, 1.30, 1.05],
+    }
+)
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def fx_rates_file(tmp_path: Path, monkeypatch: Any) -> Path:
+    path = tmp_path / "fx_rates.csv"
+    _RATES.to_csv(path, index=False)
+    monkeypatch.setenv("FINANCE_FX_RATES_PATH", str(path))
+    monkeypatch.setenv("FINANCE_BASE_CURRENCY", "usd")
+    return path
+
+
+def test_scalar_lookup_uses_the_latest_rate_on_or_before_the_date() -> None:
+    table = FxRateTable(_RATES, "USD")
+
+    assert table.rate("USD", date(2020, 1, 1)) == 1.0
+    assert table.rate("EUR", date(2024, 6, 1)) == 1.10
+    assert table.rate("EUR", date(2024, 6, 14)) == 1.10
+    assert table.rate("EUR", date(2024, 6, 30)) == 1.20
+    assert table.rate("GBP", date(2025, 1, 1)) == 1.30
+    assert table.currencies == ("EUR", "GBP")
+    with pytest.raises(MissingFxRateError, match="EUR"):
+        table.rate("EUR", date(2024, 5, 31))
+
+
+def test_vectorized_lookup_matches_scalar_lookups() -> None:
+    table = FxRateTable(_RATES, "USD")
+    days = pd.to_datetime(["2024-06-20", "2024-06-01", "2024-07-03", "2024-06-20", "2024-06-02", "2024-06-10"])
+    currencies = pd.Series(["EUR", "USD", "EUR", "EUR", "GBP", "EUR"])
+
+    rates = table.rates_for(currencies, pd.Series(days))
+
+    assert rates.tolist() == [table.rate(currency, day.date()) for currency, day in zip(currencies, days, strict=True)]
+
+
+def test_vectorized_lookup_rejects_unknown_or_early_currencies() -> None:
+    table = FxRateTable(_RATES, "USD")
+
+    with pytest.raises(MissingFxRateError, match="JPY"):
+        table.rates_for(pd.Series(["EUR", "JPY"]), pd.Series(pd.to_datetime(["2024-06-02", "2024-06-02"])))
+    with pytest.raises(MissingFxRateError, match="2024-05-01"):
+        table.rates_for(pd.Series(["EUR"]), pd.Series(pd.to_datetime(["2024-05-01"])))
+
+
+def test_rate_table_reloads_when_the_file_changes(fx_rates_file: Path) -> None:
+    table = get_fx_rates()
+    assert get_fx_rates() is table
+
+    _write(fx_rates_file, "date,currency,rate\n2024-01-01,EUR,2.0\n")
+    reloaded = get_fx_rates()
+
+    assert reloaded is not table
+    assert reloaded.rate("EUR", date(2024, 6, 1)) == 2.0
+
+
+def test_currency_column_converts_amounts_before_aggregation(tmp_path: Path, fx_rates_file: Path) -> None:
+    ledger = _write(
+        tmp_path / "ledger.csv",
+        "date,description,category,amount,type,essential,currency\n"
+        "2024-06-01,Salary,Income,3000,income,True,USD\n"
+        "2024-06-02,Rent,Rent,1000,expense,True,EUR\n"
+        "2024-06-20,Dinner,Restaurants,100,expense,False,eur\n"
+        "2024-06-21,Books,Shopping,50,expense,False,GBP\n"
+        "2024-06-22,Coffee,Restaurants,4,expense,False,\n",
+    )
+
+    records = read_transactions_csv("fx", ledger)
+    groups = frame_group_totals(read_transactions_frame(ledger))
+    totals = {(group.month, group.category): group.amount for group in groups}
+
+    assert [record.currency for record in records] == ["USD", "EUR", "EUR", "GBP", "USD"]
+    assert [record.original_amount for record in records] == [3000, 1000, 100, 50, 4]
+    assert [record.amount for record in records] == pytest.approx([3000, 1100, 120, 65, 4])
+    assert totals[("2024-06", "Restaurants")] == pytest.approx(124)
+    assert totals[("2024-06", "Rent")] == pytest.approx(1100)
+
+    summary = compute_finance_summary("single", records)
+    assert summary.monthly_overview[0].total == pytest.approx(1289)
+    assert summary.monthly_overview[0].income == pytest.approx(3000)
+
+
+def test_sqlite_store_keeps_original_currency_amounts(tmp_path: Path, fx_rates_file: Path) -> None:
+    ledger = _write(
+        tmp_path / "ledger.csv",
+        "date,description,category,amount,type,essential,currency\n"
+        "2024-06-02,Rent,Rent,1000,expense,True,EUR\n"
+        "2024-06-03,Coffee,Restaurants,4,expense,False,USD\n",
+    )
+    store = SQLiteTransactionStore(tmp_path / "finance.sqlite3")
+    try:
+        records = store.load_transactions("fx", ledger)
+    finally:
+        store.close()
+
+    assert records == read_transactions_csv("fx", ledger)
+    assert [(record.currency, record.original_amount) for record in records] == [("EUR", 1000), ("USD", 4)]
+
+
+def test_sqlite_store_reingests_when_rates_or_base_currency_change(
+    tmp_path: Path, fx_rates_file: Path, monkeypatch: Any
+) -> None:
+    ledger = _write(
+        tmp_path / "ledger.csv",
+        "date,description,category,amount,type,essential,currency\n2024-06-02,Rent,Rent,10,expense,True,EUR\n",
+    )
+    db_path = tmp_path / "finance.sqlite3"
+
+    def stored_amounts() -> list:
+        # A fresh store per read: the freshness stamp must survive restarts, not just live in memory.
+        store = SQLiteTransactionStore(db_path)
+        try:
+            return [group.amount for group in store.group_totals("fx", ledger)]
+        finally:
+            store.close()
+
+    assert stored_amounts() == [pytest.approx(11.0)]
+
+    new_rates = _write(tmp_path / "fx_rates_v2.csv", "date,currency,rate\n2024-06-01,EUR,2.0\n")
+    monkeypatch.setenv("FINANCE_FX_RATES_PATH", str(new_rates))
+    assert stored_amounts() == [pytest.approx(20.0)]
+
+    monkeypatch.setenv("FINANCE_BASE_CURRENCY", "EUR")
+    assert stored_amounts() == [pytest.approx(10.0)]
+
+
+def test_missing_rates_surface_as_value_errors(tmp_path: Path, fx_rates_file: Path) -> None:
+    ledger = _write(
+        tmp_path / "ledger.csv",
+        "date,description,category,amount,type,essential,currency\n"
+        "2024-06-02,Sushi,Restaurants,900,expense,False,JPY\n",
+    )
+
+    with pytest.raises(ValueError, match="No JPY rate"):
+        read_transactions_csv("fx", ledger)
+
+
+def test_single_currency_ledgers_skip_conversion(monkeypatch: Any) -> None:
+    monkeypatch.setenv("FINANCE_FX_RATES_PATH", "/nonexistent/fx_rates.csv")
+    path = analytics.persona_data_path("family")
+
+    records = read_transactions_csv("family", path)
+
+    assert all(record.currency is None and record.original_amount is None for record in records)
+    assert frame_group_totals(read_transactions_frame(path)) == _group_totals(records)
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from typing import Any, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.services import ai_client
+
+_ROUTES = json.dumps(
+    [
+        {"model": "gpt-small", "max_prompt_tokens": 3000, "max_history": 2},
+        {"model": "gpt-medium", "max_prompt_tokens": 6000},
+    ]
+)
+
+
+class _Models:
+    def __init__(self, calls: List[str]) -> None:
+        self._calls = calls
+
+    def list(self) -> List[str]:
+        self._calls.append("models.list")
+        return []
+
+
+class _Completions:
+    def create(self, **kwargs: Any) -> Any:
+        message = type("Message", (), {"content": f"reply from {kwargs['model']}"})
+        return type("Completion", (), {"choices": [type("Choice", (), {"message": message})]})
+
+
+class _Client:
+    def __init__(self, calls: List[str]) -> None:
+        self.models = _Models(calls)
+        self.chat = type("Chat", (), {"completions": _Completions()})
+
+
+class _Factory:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def __call__(self, **_options: Any) -> _Client:
+        self.calls.append("client")
+        return _Client(self.calls)
+
+
+@pytest.fixture
+def openai_factory(monkeypatch: Any) -> _Factory:
+    factory = _Factory()
+    monkeypatch.setenv("AI_PROVIDER", "openai")
+    monkeypatch.setenv("AI_MODEL", "gpt-large")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(
+        "backend.services.ai_client.OpenAIProvider._load_openai_dependencies",
+        staticmethod(lambda: (factory, RuntimeError, RuntimeError)),
+    )
+    ai_client.model_latency.reset()
+    return factory
+
+
+def test_select_model_picks_first_fitting_route(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_MODEL", "gpt-large")
+    monkeypatch.setenv("AI_MODEL_ROUTES", _ROUTES)
+    short = [{"role": "user", "content": "Hi"}]
+
+    assert ai_client.select_model(messages=short, system_prompt="x" * 400).model == "gpt-small"
+    assert ai_client.select_model(messages=short * 3, system_prompt="x" * 400).model == "gpt-medium"
+    fallback = ai_client.select_model(messages=short, system_prompt="x" * 40_000)
+    assert fallback.model == "gpt-large"
+    assert not fallback.routed
+
+
+def test_invalid_route_table_is_a_config_error(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_MODEL_ROUTES", '{"model": "not-a-list"}')
+
+    with pytest.raises(ai_client.ProviderConfigError, match="AI_MODEL_ROUTES"):
+        ai_client.load_model_routes()
+
+
+def test_chat_uses_routed_model_and_records_latency(monkeypatch: Any, openai_factory: _Factory) -> None:
+    monkeypatch.setenv("AI_MODEL_ROUTES", json.dumps([{"model": "gpt-small", "max_prompt_tokens": 100_000}]))
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/chat/", json={"personaId": "single", "messages": [{"id": "1", "role": "user", "content": "Hello"}]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["metadata"]["model"] == "gpt-small"
+    assert response.json()["message"]["content"] == "reply from gpt-small"
+    stats = client.get("/health/models").json()["models"]["gpt-small"]
+    assert stats["selected"] == 1
+    assert stats["completed"] == 1
+
+
+def _wait_for_warmup(client: TestClient) -> None:
+    deadline = time.monotonic() + 5
+    while not client.app.state.provider_warmup.done():
+        assert time.monotonic() < deadline, "provider warm-up did not finish"
+        time.sleep(0.01)
+
+
+def test_lifespan_warms_up_and_reuses_the_sdk_client(openai_factory: _Factory) -> None:
+    with TestClient(create_app()) as client:
+        _wait_for_warmup(client)
+        assert openai_factory.calls == ["client", "models.list"]
+        for index in range(3):
+            client.post(
+                "/chat/",
+                json={"personaId": "single", "messages": [{"id": "1", "role": "user", "content": f"Q{index}"}]},
+            )
+
+    assert openai_factory.calls.count("client") == 1
+
+
+def test_warm_up_failures_do_not_block_startup(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    assert ai_client.warm_up_provider() is False
+    with TestClient(create_app()) as client:
+        assert client.get("/health/").status_code == 200
+
+
+def test_slow_warm_up_runs_in_the_background(monkeypatch: Any) -> None:
+    release = threading.Event()
+
+    def hanging_warm_up() -> bool:
+        # Stands in for an unreachable provider retrying until its timeout.
+        release.wait(5)
+        return False
+
+    monkeypatch.setattr("backend.main.warm_up_provider", hanging_warm_up)
+    started = time.monotonic()
+    with TestClient(create_app()) as client:
+        assert client.get("/health/").status_code == 200
+        assert time.monotonic() - started < 1
+        assert not client.app.state.provider_warmup.done()
+        release.set()
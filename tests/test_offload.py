@@ -0,0 +1,189 @@
+import asyncio
+import gc
+import logging
+import time
+from contextlib import contextmanager, suppress
+from itertools import pairwise
+from typing import Any, Awaitable, Callable, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.models.finance import SimulationScenario
+from backend.services import analytics, offload, simulation, transaction_index
+from backend.services.analytics import get_finance_summary, get_finance_summary_async
+
+_BLOCK_S = 0.2
+_SLOW_CALLBACK_S = 0.05
+
+
+@pytest.fixture(autouse=True)
+def fresh_offload_pool() -> Iterator[None]:
+    offload.shutdown_offload_executor()
+    yield
+    offload.shutdown_offload_executor()
+
+
+@pytest.fixture
+def slow_loader(monkeypatch: Any) -> List[str]:
+    """Cold caches and a loader that blocks its thread like a big CSV parse would."""
+
+    loads: List[str] = []
+    original = analytics._load_ledger
+
+    def blocking_load(persona_id: str) -> Any:
+        loads.append(persona_id)
+        time.sleep(_BLOCK_S)
+        return original(persona_id)
+
+    monkeypatch.setattr(analytics, "_load_ledger", blocking_load)
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+    return loads
+
+
+@contextmanager
+def _without_gc() -> Iterator[None]:
+    # A full-suite GC pass can take longer than the threshold; keep it out of the measurement.
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def _slow_callbacks(caplog: Any, scenario: Callable[[], Awaitable[Any]]) -> List[str]:
+    async def main() -> None:
+        asyncio.get_running_loop().slow_callback_duration = _SLOW_CALLBACK_S
+        await scenario()
+
+    with _without_gc(), caplog.at_level(logging.WARNING, logger="asyncio"):
+        asyncio.run(main(), debug=True)
+    return [record.getMessage() for record in caplog.records if record.getMessage().startswith("Executing")]
+
+
+def test_debug_mode_flags_blocking_summary_loads_on_the_loop(caplog: Any, slow_loader: List[str]) -> None:
+    async def scenario() -> None:
+        # SingleFlight.do refuses to run on the loop, so build the summary directly.
+        analytics._build_finance_summary("family")
+
+    assert _slow_callbacks(caplog, scenario)
+
+
+def test_async_summary_loading_never_blocks_the_loop(caplog: Any, slow_loader: List[str]) -> None:
+    ticks: List[float] = []
+
+    async def ticker() -> None:
+        for _ in range(20):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> None:
+        tick_task = asyncio.create_task(ticker())
+        summaries = await asyncio.gather(*(get_finance_summary_async("family") for _ in range(8)))
+        await tick_task
+        assert all(summary is summaries[0] for summary in summaries)
+
+    assert _slow_callbacks(caplog, scenario) == []
+    assert slow_loader == ["family"]
+    assert max(later - earlier for earlier, later in pairwise(ticks)) < _BLOCK_S
+    assert analytics._summary_cache["family"].fingerprint
+
+
+def test_concurrent_cold_group_total_loads_are_coalesced(monkeypatch: Any) -> None:
+    loads: List[str] = []
+    original = analytics._load_group_totals
+
+    def blocking_load(persona_id: str) -> Any:
+        loads.append(persona_id)
+        time.sleep(_BLOCK_S)
+        return original(persona_id)
+
+    monkeypatch.setattr(analytics, "_load_group_totals", blocking_load)
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+
+    async def main() -> List[Any]:
+        return list(await asyncio.gather(*(analytics.get_group_totals_async("family") for _ in range(6))))
+
+    results = asyncio.run(main())
+
+    assert loads == ["family"]
+    assert all(groups is results[0] for groups in results)
+
+
+def test_async_rankings_and_simulation_never_load_on_the_loop(monkeypatch: Any) -> None:
+    loop_loads: List[str] = []
+    versions = iter(range(1_000))
+
+    def tracking(loader: Callable[[str], Any]) -> Callable[[str], Any]:
+        def load(persona_id: str) -> Any:
+            with suppress(RuntimeError):
+                asyncio.get_running_loop()
+                loop_loads.append(loader.__name__)
+            return loader(persona_id)
+
+        return load
+
+    # Every lookup sees a new shared version, as if another worker kept invalidating.
+    monkeypatch.setattr(analytics, "shared_cache_version", lambda: next(versions))
+    monkeypatch.setattr(analytics, "_load_group_totals", tracking(analytics._load_group_totals))
+    monkeypatch.setattr(analytics, "_load_recurring", tracking(analytics._load_recurring))
+
+    async def main() -> Any:
+        rankings = await analytics.get_category_rankings_async("family")
+        response = await simulation.simulate_scenarios_async("family", [SimulationScenario(name="as-is")])
+        return rankings, response
+
+    rankings, response = asyncio.run(main())
+
+    assert loop_loads == []
+    assert rankings.top(rankings.latest_month, None)
+    assert response.scenarios[0].summary is not None
+    assert response.scenarios[0].summary.recurring
+
+
+def test_routes_offload_cold_loads(monkeypatch: Any, caplog: Any, slow_loader: List[str]) -> None:
+    original_load = transaction_index.load_transactions
+
+    def blocking_transactions(persona_id: str) -> Any:
+        time.sleep(_BLOCK_S)
+        return original_load(persona_id)
+
+    monkeypatch.setattr(transaction_index, "load_transactions", blocking_transactions)
+    monkeypatch.setattr(transaction_index, "_index_cache", {})
+    monkeypatch.setenv("ASYNCIO_SLOW_CALLBACK_MS", str(_SLOW_CALLBACK_S * 1000))
+    monkeypatch.setenv("AI_WARMUP", "0")
+
+    client = TestClient(create_app())
+    with _without_gc(), caplog.at_level(logging.WARNING, logger="asyncio"), client:
+        assert client.get("/personas/single/summary").status_code == 200
+        assert client.get("/personas/single/categories").status_code == 200
+        assert client.get("/personas/single/transactions", params={"limit": 5}).status_code == 200
+
+    assert slow_loader == ["single"]
+    assert [record for record in caplog.records if record.getMessage().startswith("Executing")] == []
+
+
+def test_process_pool_builds_the_same_summary(monkeypatch: Any) -> None:
+    monkeypatch.setenv("FINANCE_OFFLOAD_POOL", "process")
+    monkeypatch.setenv("FINANCE_OFFLOAD_WORKERS", "1")
+    expected = get_finance_summary("recent_grad")
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+
+    summary = asyncio.run(get_finance_summary_async("recent_grad"))
+
+    assert isinstance(offload.get_offload_executor(), offload.ProcessPoolExecutor)
+    assert summary == expected
+    assert analytics._group_totals_cache["recent_grad"][1] == analytics.get_group_totals("recent_grad")
+
+
+def test_offload_pool_rejects_unknown_kinds(monkeypatch: Any) -> None:
+    monkeypatch.setenv("FINANCE_OFFLOAD_POOL", "gpu")
+
+    with pytest.raises(ValueError, match="Unsupported FINANCE_OFFLOAD_POOL"):
+        offload.get_offload_executor()
@@ -0,0 +1,105 @@
+import json
+import time
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.devtools.openai_stub import create_stub_app
+from backend.main import create_app
+from backend.services import ai_client
+from backend.services.admission import AdmissionConfig, AdmissionController
+from backend.services.latency_sim import LatencyProfile
+
+_COMPLETION_REQUEST = {"model": "gpt-stub", "messages": [{"role": "user", "content": "Hello"}]}
+
+
+def test_stub_returns_chat_completion_shape() -> None:
+    client = TestClient(create_stub_app(LatencyProfile(latency_ms=5)))
+
+    response = client.post("/v1/chat/completions", json=_COMPLETION_REQUEST)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["object"] == "chat.completion"
+    assert payload["model"] == "gpt-stub"
+    assert payload["choices"][0]["message"]["role"] == "assistant"
+    assert payload["usage"]["completion_tokens"] > 0
+
+
+def test_stub_streams_sse_chunks() -> None:
+    client = TestClient(create_stub_app(LatencyProfile(tokens_per_second=1000)))
+
+    with client.stream("POST", "/v1/chat/completions", json={**_COMPLETION_REQUEST, "stream": True}) as response:
+        lines = [line for line in response.iter_lines() if line]
+
+    assert lines[-1] == "data: [DONE]"
+    chunks = [json.loads(line.removeprefix("data: ")) for line in lines[:-1]]
+    assert all(chunk["object"] == "chat.completion.chunk" for chunk in chunks)
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    content = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks)
+    assert content.startswith("This is a simulated")
+    assert client.get("/stub/stats").json()["in_flight"] == 0
+
+
+def test_stub_injects_rate_limits_with_retry_after() -> None:
+    client = TestClient(create_stub_app(LatencyProfile(rate_limit_rate=1.0, retry_after_s=2)))
+
+    response = client.post("/v1/chat/completions", json=_COMPLETION_REQUEST)
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2"
+    assert response.json()["error"]["type"] == "requests"
+    assert client.get("/stub/stats").json()["rate_limited"] == 1
+
+
+def test_latency_profile_distributions_are_non_negative_and_seeded() -> None:
+    first = LatencyProfile(latency_ms=100, distribution="lognormal", jitter_ms=50, seed=3)
+    second = LatencyProfile(latency_ms=100, distribution="lognormal", jitter_ms=50, seed=3)
+
+    samples = [first.first_token_delay_s() for _ in range(200)]
+
+    assert samples == [second.first_token_delay_s() for _ in range(200)]
+    assert all(sample >= 0 for sample in samples)
+    assert 0.07 < sum(samples) / len(samples) < 0.13
+    with pytest.raises(ValueError, match="Unsupported latency distribution"):
+        LatencyProfile(distribution="pareto")  # type: ignore[arg-type]
+
+
+def test_mock_provider_simulates_latency_and_failures(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    monkeypatch.setenv("MOCK_LATENCY_MS", "50")
+    messages = [{"role": "user", "content": "Hi"}]
+
+    start = time.perf_counter()
+    reply = ai_client.generate_chat(messages=messages, system_prompt="latency")
+    assert time.perf_counter() - start >= 0.05
+    assert "mock" in reply
+
+    monkeypatch.setenv("MOCK_LATENCY_MS", "0")
+    monkeypatch.setenv("MOCK_ERROR_RATE", "1")
+    with pytest.raises(ai_client.ProviderUnavailableError):
+        ai_client.generate_chat(messages=messages, system_prompt="errors")
+
+
+def test_mock_rate_limits_surface_as_429_with_retry_after(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    monkeypatch.setenv("MOCK_RETRY_AFTER_S", "2.5")
+    monkeypatch.setattr("backend.routes.chat.chat_admission", AdmissionController(AdmissionConfig()))
+    client = TestClient(create_app())
+
+    def post(prompt: str) -> Any:
+        return client.post(
+            "/chat/", json={"personaId": "single", "messages": [{"id": "1", "role": "user", "content": prompt}]}
+        )
+
+    monkeypatch.setenv("MOCK_RATE_LIMIT_RATE", "1")
+    limited = post("rate limited")
+    assert limited.status_code == 429
+    assert limited.headers["retry-after"] == "3"
+
+    monkeypatch.setenv("MOCK_RATE_LIMIT_RATE", "0")
+    monkeypatch.setenv("MOCK_ERROR_RATE", "1")
+    failed = post("errors")
+    assert failed.status_code == 503
+    assert "retry-after" not in failed.headers
@@ -0,0 +1,87 @@
+import pstats
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.routes import chat
+from backend.services import profiling
+
+_CHAT_PAYLOAD = {"personaId": "single", "messages": [{"id": "1", "role": "user", "content": "Hello"}]}
+_CHAT_SPANS = [
+    "validate_persona",
+    "get_finance_summary",
+    "model_dump",
+    "build_system_prompt",
+    "prepare_history",
+    "generate_chat",
+]
+
+
+def test_unprofiled_requests_have_no_timing_headers(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    monkeypatch.delenv("PROFILE_SAMPLE_RATE", raising=False)
+    client = TestClient(create_app())
+
+    response = client.post("/chat/", json=_CHAT_PAYLOAD)
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+    assert profiling.span("anything") is profiling._NOOP_SPAN
+
+
+def test_profile_header_returns_chat_span_breakdown(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    # Start without a cached system prompt so the model_dump span is recorded.
+    monkeypatch.setattr(chat, "_SYSTEM_PROMPTS", {})
+    client = TestClient(create_app())
+
+    response = client.post("/chat/", json=_CHAT_PAYLOAD, headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    for name in [*_CHAT_SPANS, "total"]:
+        assert f"{name};dur=" in timing
+    assert response.headers["x-profile-id"]
+
+
+def test_sample_rate_profiles_without_header(monkeypatch: Any) -> None:
+    monkeypatch.setenv("PROFILE_SAMPLE_RATE", "1.0")
+    client = TestClient(create_app())
+
+    response = client.get("/health/")
+
+    assert response.headers["server-timing"].startswith("total;dur=")
+
+
+def test_cprofile_and_sample_modes_write_dumps(monkeypatch: Any, tmp_path: Path) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_ALLOW_HEADER", "1")
+    monkeypatch.setenv("PROFILE_SAMPLE_INTERVAL_MS", "1")
+    client = TestClient(create_app())
+
+    client.post("/chat/", json=_CHAT_PAYLOAD, headers={"X-Profile": "cprofile"})
+    client.post("/chat/", json=_CHAT_PAYLOAD, headers={"X-Profile": "sample"})
+
+    dumps = list(tmp_path.glob("*chat*.prof"))
+    assert len(dumps) == 1
+    assert len(list(tmp_path.glob("*chat*.folded"))) == 1
+    # The provider call runs in the threadpool; its profile is merged into the request's dump.
+    profiled_functions = {name for _, _, name in pstats.Stats(str(dumps[0])).stats}
+    assert "generate_chat" in profiled_functions
+
+
+def test_header_captures_require_opt_in(monkeypatch: Any, tmp_path: Path) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.delenv("PROFILE_ALLOW_HEADER", raising=False)
+    client = TestClient(create_app())
+
+    responses = [
+        client.post("/chat/", json=_CHAT_PAYLOAD, headers={"X-Profile": mode}) for mode in ("cprofile", "sample")
+    ]
+
+    assert all("generate_chat;dur=" in response.headers["server-timing"] for response in responses)
+    assert list(tmp_path.iterdir()) == []
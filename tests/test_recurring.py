@@ -0,0 +1,182 @@
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pandas as pd
+import pytest
+
+from backend.services import analytics
+from backend.services.finance_loader import (
+    load_transactions,
+    persona_data_path,
+    read_transactions_csv,
+    read_transactions_frame,
+)
+from backend.services.recurring import detect_recurring, detect_recurring_records
+from backend.services.transaction_store import SQLiteTransactionStore
+
+_Row = Tuple[date, str, str, float, str]
+
+
+def _frame(rows: List[_Row]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime([row[0] for row in rows]),
+            "description": pd.Series([row[1] for row in rows], dtype=object),
+            "category": [row[2] for row in rows],
+            "amount": [row[3] for row in rows],
+            "type": [row[4] for row in rows],
+        }
+    )
+
+
+def _series(start: date, step: timedelta, count: int, description: str, category: str, amount: float) -> List[_Row]:
+    return [(start + step * index, description, category, amount, "expense") for index in range(count)]
+
+
+def _months(start: date, count: int) -> List[date]:
+    return [(pd.Timestamp(start) + pd.DateOffset(months=index)).date() for index in range(count)]
+
+
+def _monthly(start: date, count: int, description: str, category: str, amount: float) -> List[_Row]:
+    return [(day, description, category, amount, "expense") for day in _months(start, count)]
+
+
+def test_detects_weekly_monthly_and_yearly_cadences() -> None:
+    rows = (
+        [
+            (day, f"NETFLIX.COM {1000 + day.month}", "Entertainment", 15.49, "expense")
+            for day in _months(date(2024, 1, 15), 6)
+        ]
+        + _series(date(2024, 4, 1), timedelta(days=7), 10, "Gym class", "Health", 12.0)
+        + [(date(2023, 3, 10), "Domain renewal", "Utilities", 20.0, "expense")]
+        + [(date(2024, 3, 10), "Domain renewal", "Utilities", 20.0, "expense")]
+        + [(date(2024, 6, 20), "Coffee", "Restaurants", 4.5, "expense")]
+    )
+
+    recurring = {item.description: item for item in detect_recurring(_frame(rows))}
+
+    assert set(recurring) == {"NETFLIX.COM 1006", "Gym class", "Domain renewal"}
+    netflix = recurring["NETFLIX.COM 1006"]
+    assert (netflix.cadence, netflix.occurrences, netflix.amount) == ("monthly", 6, 15.49)
+    assert (netflix.first_date, netflix.last_date, netflix.next_date) == (
+        date(2024, 1, 15),
+        date(2024, 6, 15),
+        date(2024, 7, 15),
+    )
+    gym = recurring["Gym class"]
+    assert (gym.cadence, gym.occurrences, gym.monthly_amount) == ("weekly", 10, pytest.approx(52.18, abs=0.01))
+    assert (recurring["Domain renewal"].cadence, recurring["Domain renewal"].monthly_amount) == ("yearly", 1.67)
+
+
+def test_irregular_short_or_changing_series_are_ignored() -> None:
+    rows = (
+        _series(date(2024, 1, 1), timedelta(days=30), 2, "Insurance", "Insurance", 90.0)
+        + [
+            (day, "Dinner out", "Restaurants", 40.0, "expense")
+            for day in (date(2024, 1, 3), date(2024, 1, 19), date(2024, 3, 2), date(2024, 3, 9))
+        ]
+        + [
+            (date(2024, 1, 5) + timedelta(days=30 * index), "Power co", "Utilities", 80.0 + index, "expense")
+            for index in range(4)
+        ]
+        + [(date(2024, 1, 1), None, "", 10.0, "expense"), (date(2024, 2, 1), None, "", 10.0, "expense")]
+    )
+
+    assert detect_recurring(_frame(rows)) == []
+    assert detect_recurring(_frame([])) == []
+
+
+def test_series_that_stopped_are_inactive_and_sorted_by_monthly_cost() -> None:
+    rows = (
+        _monthly(date(2024, 1, 1), 3, "Old streaming", "Entertainment", 9.99)
+        + _monthly(date(2024, 1, 3), 6, "Rent", "Rent", 1500.0)
+        + [(day, "Payroll ACME", "Income", 2000.0, "income") for day in _months(date(2024, 1, 1), 6)]
+    )
+
+    recurring = detect_recurring(_frame(rows))
+
+    assert [(item.description, item.type, item.active) for item in recurring] == [
+        ("Payroll ACME", "income", True),
+        ("Rent", "expense", True),
+        ("Old streaming", "expense", False),
+    ]
+
+
+def test_foreign_currency_series_recur_in_their_original_amount(tmp_path: Path, monkeypatch: Any) -> None:
+    rates = tmp_path / "fx_rates.csv"
+    rates.write_text(
+        "date,currency,rate\n"
+        + "".join(
+            f"{day.isoformat()},EUR,{1.05 + index / 100}\n" for index, day in enumerate(_months(date(2024, 1, 1), 6))
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("FINANCE_FX_RATES_PATH", str(rates))
+    monkeypatch.setenv("FINANCE_BASE_CURRENCY", "USD")
+    ledger = tmp_path / "ledger.csv"
+    ledger.write_text(
+        "date,description,category,amount,type,essential,currency\n"
+        + "".join(
+            f"{day.isoformat()},SPOTIFY,Entertainment,9.99,expense,False,EUR\n"
+            f"{day.isoformat()},NETFLIX,Entertainment,15.49,expense,False,\n"
+            for day in _months(date(2024, 1, 5), 6)
+        ),
+        encoding="utf-8",
+    )
+
+    recurring = detect_recurring(read_transactions_frame(ledger))
+
+    assert [(item.description, item.currency, item.original_amount, item.amount) for item in recurring] == [
+        ("NETFLIX", None, None, 15.49),
+        ("SPOTIFY", "EUR", 9.99, round(9.99 * 1.10, 2)),
+    ]
+    assert detect_recurring_records(read_transactions_csv("fx", ledger)) == recurring
+    store = SQLiteTransactionStore(tmp_path / "finance.sqlite3")
+    try:
+        assert detect_recurring(store.transaction_frame("fx", ledger)) == recurring
+    finally:
+        store.close()
+
+
+def test_records_and_frames_agree() -> None:
+    records = load_transactions("family")
+
+    assert detect_recurring_records(records) == detect_recurring(read_transactions_frame(persona_data_path("family")))
+
+
+def test_summary_carries_cached_recurring_series(monkeypatch: Any) -> None:
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+    loads: List[str] = []
+    original = analytics._load_ledger
+
+    def counting_load(persona_id: str) -> Any:
+        loads.append(persona_id)
+        return original(persona_id)
+
+    monkeypatch.setattr(analytics, "_load_ledger", counting_load)
+
+    summary = analytics.get_finance_summary("single")
+
+    assert [(item.description, item.cadence, item.amount) for item in summary.recurring] == [
+        ("Salary", "monthly", 4500.0),
+        ("Apartment Rent", "monthly", 1500.0),
+    ]
+    assert analytics.get_recurring("single") == summary.recurring
+    analytics.get_category_rankings("single")
+    assert loads == ["single"]
+    assert summary == analytics.compute_finance_summary("single", load_transactions("single"))
+
+
+def test_sqlite_backend_detects_the_same_series(monkeypatch: Any, tmp_path: Path) -> None:
+    expected = detect_recurring(read_transactions_frame(persona_data_path("recent_grad")))
+    monkeypatch.setenv("FINANCE_STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("FINANCE_SQLITE_PATH", str(tmp_path / "finance.sqlite3"))
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+
+    assert analytics.get_finance_summary("recent_grad").recurring == expected
+    assert len(expected) == 4
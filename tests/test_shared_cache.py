@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, List
+
+from backend.services import analytics
+from backend.services.shared_cache import SharedSummaryCache
+
+
+def _publish_from_worker(path: str) -> None:
+    cache = SharedSummaryCache(Path(path))
+    cache.get_or_build("family", analytics._compute_persona_summary)
+    cache.close()
+
+
+def _invalidate_from_worker(path: str) -> None:
+    cache = SharedSummaryCache(Path(path))
+    cache.invalidate("family")
+    cache.close()
+
+
+def _run_in_worker(target: Any, path: Path) -> None:
+    process = multiprocessing.get_context("spawn").Process(target=target, args=(str(path),))
+    process.start()
+    process.join(timeout=30)
+    assert process.exitcode == 0
+
+
+def test_summaries_published_by_one_worker_are_visible_to_another(tmp_path: Path) -> None:
+    path = tmp_path / "summaries.bin"
+    reader = SharedSummaryCache(path)
+    assert reader.get("family") is None
+
+    _run_in_worker(_publish_from_worker, path)
+
+    summary = reader.get("family")
+    assert summary == analytics._compute_persona_summary("family")
+    assert reader.get("family") is summary
+    assert reader.version == 1
+
+    _run_in_worker(_invalidate_from_worker, path)
+
+    assert reader.get("family") is None
+    assert reader.version == 2
+    reader.close()
+
+
+def test_get_or_build_computes_once_across_cache_instances(tmp_path: Path) -> None:
+    path = tmp_path / "summaries.bin"
+    first, second = SharedSummaryCache(path), SharedSummaryCache(path)
+    built: List[str] = []
+
+    def builder(persona_id: str) -> Any:
+        built.append(persona_id)
+        return analytics._compute_persona_summary(persona_id)
+
+    first.get_or_build("single", builder)
+    second.get_or_build("single", builder)
+    second.get_or_build("family", builder)
+
+    assert built == ["single", "family"]
+    assert first.get("family") == second.get("family")
+    first.close()
+    second.close()
+
+
+def test_get_finance_summary_uses_shared_cache_when_configured(monkeypatch: Any, tmp_path: Path) -> None:
+    monkeypatch.setenv("SUMMARY_SHARED_CACHE_PATH", str(tmp_path / "summaries.bin"))
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+
+    summary = analytics.get_finance_summary("recent_grad")
+    assert analytics.get_finance_summary("recent_grad") is summary
+    assert analytics._summary_cache == {}
+
+    analytics.invalidate_finance_summary("recent_grad")
+    rebuilt = analytics.get_finance_summary("recent_grad")
+
+    assert rebuilt is not summary
+    assert rebuilt == summary
+
+
+def test_async_reads_remap_and_decode_off_the_event_loop(monkeypatch: Any, tmp_path: Path) -> None:
+    path = tmp_path / "summaries.bin"
+    monkeypatch.setenv("SUMMARY_SHARED_CACHE_PATH", str(path))
+    expected = analytics.get_finance_summary("recent_grad")
+    # Another worker republishes, so this worker has to remap and decode again.
+    other = SharedSummaryCache(path)
+    other.publish({"recent_grad": expected})
+    other.close()
+
+    loop_reads: List[str] = []
+    original_get = SharedSummaryCache.get
+
+    def tracking_get(self: SharedSummaryCache, persona_id: str) -> Any:
+        with suppress(RuntimeError):
+            asyncio.get_running_loop()
+            loop_reads.append(persona_id)
+        return original_get(self, persona_id)
+
+    monkeypatch.setattr(SharedSummaryCache, "get", tracking_get)
+
+    async def main() -> Any:
+        first = await analytics.get_finance_summary_async("recent_grad")
+        return first, await analytics.get_finance_summary_async("recent_grad")
+
+    first, second = asyncio.run(main())
+
+    assert loop_reads == []
+    assert first == expected
+    assert second is first
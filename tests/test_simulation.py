@@ -0,0 +1,106 @@
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.models.finance import BudgetAdjustment, FinanceSummary, SimulationScenario
+from backend.services import analytics
+from backend.services.finance_loader import GroupTotal
+from backend.services.simulation import simulate_scenarios
+
+
+def _assert_summaries_match(actual: FinanceSummary, expected: FinanceSummary) -> None:
+    assert [item.month for item in actual.monthly_overview] == [item.month for item in expected.monthly_overview]
+    for got, want in zip(actual.monthly_overview, expected.monthly_overview, strict=True):
+        assert got.total == pytest.approx(want.total)
+        assert got.income == pytest.approx(want.income)
+        assert got.savings == pytest.approx(want.savings)
+    assert [(c.name, c.essential) for c in actual.categories] == [(c.name, c.essential) for c in expected.categories]
+    assert [c.latest for c in actual.categories] == pytest.approx([c.latest for c in expected.categories])
+    assert actual.goals.current_savings_rate == pytest.approx(expected.goals.current_savings_rate)
+    assert actual.goals.target_savings_rate == expected.goals.target_savings_rate
+    assert actual.recurring == expected.recurring
+
+
+def test_empty_scenario_reproduces_the_cached_summary() -> None:
+    response = simulate_scenarios("family", [SimulationScenario(name="as-is")])
+
+    baseline = analytics.get_finance_summary("family")
+    _assert_summaries_match(response.scenarios[0].summary, baseline)
+    assert response.baseline.current_savings_rate == pytest.approx(baseline.goals.current_savings_rate)
+
+
+def test_adjustments_match_recomputing_from_adjusted_group_totals() -> None:
+    groups = analytics.get_group_totals("single")
+    scenario = SimulationScenario(
+        adjustments=[
+            BudgetAdjustment(category="restaurants", change_pct=-30),
+            BudgetAdjustment(type="income", change_pct=10),
+        ]
+    )
+
+    def adjusted(group: GroupTotal) -> GroupTotal:
+        factor = 1.0
+        if group.type == "expense" and group.category == "Restaurants":
+            factor = 0.7
+        elif group.type == "income":
+            factor = 1.1
+        return GroupTotal(group.month, group.type, group.category, group.amount * factor, group.essential)
+
+    expected = analytics.summarize_group_totals(
+        "single", [adjusted(group) for group in groups], recurring=analytics.get_recurring("single")
+    )
+    response = simulate_scenarios("single", [scenario])
+
+    _assert_summaries_match(response.scenarios[0].summary, expected)
+
+
+def test_batch_results_match_scenarios_evaluated_one_at_a_time() -> None:
+    scenarios = [
+        SimulationScenario(name=f"cut-{pct}", adjustments=[BudgetAdjustment(essential=False, change_pct=-pct)])
+        for pct in range(0, 100, 5)
+    ]
+
+    batch = simulate_scenarios("recent_grad", scenarios, include_summary=False)
+    single = [simulate_scenarios("recent_grad", [scenario]).scenarios[0] for scenario in scenarios]
+
+    assert [result.name for result in batch.scenarios] == [scenario.name for scenario in scenarios]
+    assert all(result.summary is None for result in batch.scenarios)
+    assert [result.goals.current_savings_rate for result in batch.scenarios] == pytest.approx(
+        [result.goals.current_savings_rate for result in single]
+    )
+    rates = [result.goals.current_savings_rate for result in batch.scenarios]
+    assert rates == sorted(rates)
+
+
+def test_simulate_endpoint_projects_scenarios() -> None:
+    client = TestClient(create_app())
+    payload: Dict[str, Any] = {
+        "scenarios": [
+            {"name": "dining", "adjustments": [{"category": "Restaurants", "change_pct": -50}]},
+            {"name": "raise", "adjustments": [{"type": "income", "change_pct": 10}]},
+        ]
+    }
+
+    response = client.post("/personas/single/simulate", json=payload)
+
+    assert response.status_code == 200
+    body = response.json()
+    results: List[Dict[str, Any]] = body["scenarios"]
+    assert [result["name"] for result in results] == ["dining", "raise"]
+    baseline_rate = body["baseline"]["current_savings_rate"]
+    assert all(result["goals"]["current_savings_rate"] > baseline_rate for result in results)
+    dining = {category["name"]: category["latest"] for category in results[0]["summary"]["categories"]}
+    current = {category.name: category.latest for category in analytics.get_finance_summary("single").categories}
+    assert dining["Restaurants"] == pytest.approx(current["Restaurants"] / 2)
+
+
+def test_simulate_endpoint_rejects_unknown_categories_and_personas() -> None:
+    client = TestClient(create_app())
+    payload = {"scenarios": [{"adjustments": [{"category": "Yachts", "change_pct": -10}]}]}
+
+    assert client.post("/personas/single/simulate", json=payload).status_code == 422
+    assert client.post("/personas/nobody/simulate", json=payload).status_code == 404
+    too_deep = {"scenarios": [{"adjustments": [{"change_pct": -150}]}]}
+    assert client.post("/personas/single/simulate", json=too_deep).status_code == 422
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import pytest
+
+from backend.services import ai_client, analytics
+from backend.services.singleflight import SingleFlight
+
+
+def test_concurrent_thread_callers_share_one_execution() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls: List[int] = []
+    release = threading.Event()
+
+    def compute() -> int:
+        calls.append(1)
+        release.wait(timeout=5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(flight.do, "key", compute) for _ in range(16)]
+        # Give every caller time to join the in-flight call before releasing it.
+        time.sleep(0.1)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == [42] * 16
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+def test_errors_propagate_to_all_waiters_and_next_call_retries() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    release = threading.Event()
+
+    def explode() -> int:
+        release.wait(timeout=5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "key", explode) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result(timeout=5)
+
+    assert flight.do("key", lambda: 7) == 7
+
+
+def test_async_callers_coalesce_with_a_thread_leader() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+    calls: List[int] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute() -> str:
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "shared"
+
+    async def never_called() -> str:
+        calls.append(2)
+        return "unexpected"
+
+    async def main() -> List[str]:
+        loop = asyncio.get_running_loop()
+        leader = loop.run_in_executor(None, flight.do, "key", compute)
+        await loop.run_in_executor(None, started.wait, 5)
+        followers = [asyncio.create_task(flight.do_async("key", never_called)) for _ in range(8)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return [await leader, *await asyncio.gather(*followers)]
+
+    results = asyncio.run(main())
+
+    assert results == ["shared"] * 9
+    assert calls == [1]
+
+
+def test_async_callers_share_one_coroutine() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls: List[int] = []
+
+    async def compute() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 5
+
+    async def main() -> List[int]:
+        return list(await asyncio.gather(*(flight.do_async("key", compute) for _ in range(10))))
+
+    assert asyncio.run(main()) == [5] * 10
+    assert calls == [1]
+
+
+def test_cancelled_leader_hands_the_flight_to_a_follower() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls: List[int] = []
+
+    async def compute() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 9
+
+    async def main() -> List[int]:
+        leader = asyncio.create_task(flight.do_async("key", compute))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.create_task(flight.do_async("key", compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return list(await asyncio.gather(*followers))
+
+    assert asyncio.run(main()) == [9] * 3
+    assert calls == [1, 1]
+    assert flight.in_flight() == 0
+
+
+def test_blocking_do_is_rejected_on_a_running_loop() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+
+    async def main() -> None:
+        with pytest.raises(RuntimeError, match="do_async"):
+            flight.do("key", lambda: 1)
+
+    asyncio.run(main())
+    assert flight.in_flight() == 0
+    assert flight.do("key", lambda: 2) == 2
+
+
+def test_get_finance_summary_coalesces_cold_cache_misses(monkeypatch: Any) -> None:
+    loads: List[str] = []
+    original_load = analytics._load_ledger
+
+    def slow_load(persona_id: str) -> Any:
+        loads.append(persona_id)
+        time.sleep(0.1)
+        return original_load(persona_id)
+
+    monkeypatch.setattr(analytics, "_load_ledger", slow_load)
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        summaries = list(pool.map(analytics.get_finance_summary, ["family"] * 12))
+
+    assert loads == ["family"]
+    assert all(summary is summaries[0] for summary in summaries)
+
+
+def test_generate_chat_coalesces_identical_prompts(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    calls: List[int] = []
+    original = ai_client.MockAIProvider.generate_chat
+
+    def slow_generate(self: Any, **kwargs: Any) -> str:
+        calls.append(1)
+        time.sleep(0.1)
+        return original(self, **kwargs)
+
+    monkeypatch.setattr(ai_client.MockAIProvider, "generate_chat", slow_generate)
+
+    def ask(_: int) -> str:
+        return ai_client.generate_chat(
+            messages=[{"role": "user", "content": "Same question"}], system_prompt="prompt"
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        replies = list(pool.map(ask, range(8)))
+
+    assert len(set(replies)) == 1
+    assert len(calls) == 1
@@ -0,0 +1,93 @@
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.routes import chat
+from backend.services import analytics
+from backend.services.analytics import compute_finance_summary, fingerprint_summary, get_finance_summary
+from backend.services.finance_loader import load_transactions
+
+_MESSAGES = [{"id": "1", "role": "user", "content": "Where can I save?"}]
+
+
+def _capture_prompts(monkeypatch: Any) -> List[str]:
+    prompts: List[str] = []
+
+    def fake_generate_chat(*, messages: Any, system_prompt: str, model: Any = None) -> str:
+        prompts.append(system_prompt)
+        return "ok"
+
+    monkeypatch.setattr(chat, "generate_chat", fake_generate_chat)
+    return prompts
+
+
+def test_summaries_carry_a_stable_fingerprint() -> None:
+    client = TestClient(create_app())
+
+    first = client.get("/personas/family/summary").json()
+    second = client.get("/personas/family/summary").json()
+
+    assert first["fingerprint"] == second["fingerprint"]
+    assert first["fingerprint"].startswith(f"v{analytics.SUMMARY_FINGERPRINT_VERSION}.")
+    summary = get_finance_summary("family")
+    assert fingerprint_summary("family", summary) == summary.fingerprint
+    # Summaries prebuilt from records (scripts/prebuild_summary_cache.py) carry the same fingerprint.
+    assert compute_finance_summary("family", load_transactions("family")).fingerprint == summary.fingerprint
+    assert fingerprint_summary("single", summary) != summary.fingerprint
+
+    changed = summary.model_copy(deep=True)
+    changed.goals.current_savings_rate += 0.01
+    assert fingerprint_summary("family", changed) != summary.fingerprint
+
+
+def test_summary_ref_reuses_the_prompt_built_for_the_full_summary(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    monkeypatch.setattr(chat, "_SYSTEM_PROMPTS", {})
+    prompts = _capture_prompts(monkeypatch)
+    builds: List[str] = []
+    original_build = chat._build_system_prompt
+
+    def counting_build(persona: Any, summary_json: Dict[str, Any]) -> str:
+        builds.append(persona.id)
+        return original_build(persona, summary_json)
+
+    monkeypatch.setattr(chat, "_build_system_prompt", counting_build)
+    client = TestClient(create_app())
+    summary = client.get("/personas/family/summary").json()
+
+    full = client.post("/chat/", json={"personaId": "family", "messages": _MESSAGES, "summary": summary})
+    by_ref = [
+        client.post("/chat/", json={"personaId": "family", "messages": _MESSAGES, "summaryRef": summary["fingerprint"]})
+        for _ in range(3)
+    ]
+
+    assert full.status_code == 200
+    assert all(response.status_code == 200 for response in by_ref)
+    assert len(set(prompts)) == 1
+    assert summary["fingerprint"] not in prompts[0]
+    # One build for the client-supplied summary, one for the first ref lookup, none after.
+    assert builds == ["family", "family"]
+
+
+def test_stale_summary_ref_is_rejected(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "mock")
+    _capture_prompts(monkeypatch)
+    client = TestClient(create_app())
+
+    response = client.post("/chat/", json={"personaId": "family", "messages": _MESSAGES, "summaryRef": "v1.deadbeef"})
+
+    assert response.status_code == 409
+    assert "refetch" in response.json()["detail"]
+
+
+def test_summary_and_ref_are_mutually_exclusive() -> None:
+    client = TestClient(create_app())
+    summary = client.get("/personas/family/summary").json()
+
+    response = client.post(
+        "/chat/",
+        json={"personaId": "family", "messages": _MESSAGES, "summary": summary, "summaryRef": summary["fingerprint"]},
+    )
+
+    assert response.status_code == 422
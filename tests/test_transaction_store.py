@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from backend.services import analytics
+from backend.services.finance_loader import get_storage_backend, list_personas, load_transactions
+from backend.services.transaction_store import SQLiteTransactionStore, get_transaction_store
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch: Any, tmp_path: Path) -> SQLiteTransactionStore:
+    monkeypatch.setenv("FINANCE_STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("FINANCE_SQLITE_PATH", str(tmp_path / "finance.sqlite3"))
+    monkeypatch.setattr(analytics, "_summary_cache", {})
+    monkeypatch.setattr(analytics, "_group_totals_cache", {})
+    monkeypatch.setattr(analytics, "_recurring_cache", {})
+    return get_transaction_store()
+
+
+def test_storage_backend_rejects_unknown_values(monkeypatch: Any) -> None:
+    monkeypatch.setenv("FINANCE_STORAGE_BACKEND", "parquet")
+
+    with pytest.raises(ValueError, match="Unsupported FINANCE_STORAGE_BACKEND"):
+        get_storage_backend()
+
+
+def test_sqlite_summary_matches_csv_summary(monkeypatch: Any, sqlite_backend: SQLiteTransactionStore) -> None:
+    for persona in list_personas():
+        monkeypatch.setenv("FINANCE_STORAGE_BACKEND", "csv")
+        expected = analytics.compute_finance_summary(persona.id, load_transactions(persona.id))
+        monkeypatch.setenv("FINANCE_STORAGE_BACKEND", "sqlite")
+        actual = analytics.get_finance_summary(persona.id)
+
+        assert [item.month for item in actual.monthly_overview] == [
+            item.month for item in expected.monthly_overview
+        ]
+        for got, want in zip(actual.monthly_overview, expected.monthly_overview, strict=True):
+            assert got.total == pytest.approx(want.total)
+            assert got.income == pytest.approx(want.income)
+        assert [(c.name, c.essential) for c in actual.categories] == [
+            (c.name, c.essential) for c in expected.categories
+        ]
+
+
+def test_sqlite_load_transactions_round_trips_records(sqlite_backend: SQLiteTransactionStore, monkeypatch: Any) -> None:
+    from_sqlite = load_transactions("single")
+    monkeypatch.setenv("FINANCE_STORAGE_BACKEND", "csv")
+
+    assert from_sqlite == load_transactions("single")
+
+
+def test_store_reingests_when_csv_changes(tmp_path: Path) -> None:
+    csv_path = tmp_path / "ledger.csv"
+    csv_path.write_text(
+        "date,description,category,amount,type,essential\n2024-06-01,Salary,Income,1000,income,True\n"
+    )
+    store = SQLiteTransactionStore(tmp_path / "store.sqlite3", pool_size=2)
+
+    store.ensure_ingested("single", csv_path)
+    assert [group.amount for group in store.group_totals("single", csv_path)] == [1000.0]
+
+    csv_path.write_text(
+        "date,description,category,amount,type,essential\n"
+        "2024-06-01,Salary,Income,1000,income,True\n"
+        "2024-06-02,Bonus,Income,250,income,False\n"
+    )
+    assert [group.amount for group in store.group_totals("single", csv_path)] == [1250.0]
+    store.close()
+
+
+def test_pool_serves_concurrent_readers(sqlite_backend: SQLiteTransactionStore) -> None:
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(sqlite_backend.group_totals, ["family"] * 32))
+
+    assert all(result == results[0] for result in results)
+    assert sqlite_backend.pool.size == 4
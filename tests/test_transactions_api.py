@@ -0,0 +1,150 @@
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+
+from backend.main import create_app
+from backend.services import analytics, transaction_index
+from backend.services.finance_loader import load_transactions
+from backend.services.shared_cache import SharedSummaryCache
+from backend.services.transaction_index import PersonaTransactionIndex, TransactionQuery
+
+
+def _collect_pages(client: TestClient, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    cursor = None
+    while True:
+        page_params = {**params, "cursor": cursor} if cursor else params
+        response = client.get("/personas/family/transactions", params=page_params)
+        assert response.status_code == 200
+        payload = response.json()
+        assert len(payload["items"]) <= params.get("limit", 50)
+        items.extend(payload["items"])
+        cursor = payload["next_cursor"]
+        if not cursor:
+            return items
+
+
+def test_cursor_pagination_walks_the_full_ledger_in_order() -> None:
+    client = TestClient(create_app())
+    records = load_transactions("family")
+
+    items = _collect_pages(client, {"limit": 4, "sort": "amount", "order": "desc"})
+
+    assert len(items) == len(records)
+    amounts = [item["amount"] for item in items]
+    assert amounts == sorted(amounts, reverse=True)
+
+
+def test_filters_combine_with_pagination() -> None:
+    client = TestClient(create_app())
+    records = load_transactions("family")
+    expected = [
+        record
+        for record in records
+        if record.type == "expense" and record.essential and 100 <= record.amount <= 2000
+    ]
+
+    items = _collect_pages(
+        client,
+        {"limit": 2, "type": "expense", "essential": True, "min_amount": 100, "max_amount": 2000, "order": "asc"},
+    )
+
+    assert sorted(item["amount"] for item in items) == sorted(record.amount for record in expected)
+    dates = [item["date"] for item in items]
+    assert dates == sorted(dates)
+
+
+def test_month_and_category_filters_use_index_bounds() -> None:
+    records = load_transactions("family")
+    index = PersonaTransactionIndex(records)
+    month = records[0].date.strftime("%Y-%m")
+    category = records[-1].category
+
+    page = index.query(TransactionQuery(month=month, category=category, limit=100))
+
+    assert page.next_cursor is None
+    assert all(item.category == category and item.date.strftime("%Y-%m") == month for item in page.items)
+    assert len(page.items) == sum(
+        1 for record in records if record.category == category and record.date.strftime("%Y-%m") == month
+    )
+
+
+def test_selective_filters_walk_only_the_page(monkeypatch: Any) -> None:
+    records = load_transactions("family")
+    index = PersonaTransactionIndex(records)
+    month = records[0].date.strftime("%Y-%m")
+    expected = sorted(
+        (record.amount for record in records if record.type == "income" and record.date.strftime("%Y-%m") == month),
+        reverse=True,
+    )
+    walked: List[int] = []
+    matches = PersonaTransactionIndex._matches
+
+    def counting_matches(self: PersonaTransactionIndex, *args: Any) -> bool:
+        walked.append(1)
+        return matches(self, *args)
+
+    monkeypatch.setattr(PersonaTransactionIndex, "_matches", counting_matches)
+
+    query = TransactionQuery(type="income", month=month, sort="amount", order="desc", limit=1)
+    amounts: List[float] = []
+    cursor = None
+    while True:
+        page = index.query(replace(query, cursor=cursor))
+        amounts.extend(item.amount for item in page.items)
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    assert amounts == expected
+    # Each page reads its row plus one lookahead row, never the rest of the ledger.
+    assert len(walked) <= 2 * len(expected)
+
+
+def test_rejects_cursor_from_a_different_query() -> None:
+    client = TestClient(create_app())
+    first = client.get("/personas/family/transactions", params={"limit": 1, "sort": "amount"}).json()
+
+    response = client.get(
+        "/personas/family/transactions", params={"limit": 1, "sort": "date", "cursor": first["next_cursor"]}
+    )
+
+    assert response.status_code == 400
+    assert client.get("/personas/family/transactions", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_unknown_persona_returns_404() -> None:
+    client = TestClient(create_app())
+
+    assert client.get("/personas/nobody/transactions").status_code == 404
+
+
+def test_summary_invalidation_drops_the_transaction_index(monkeypatch: Any, tmp_path: Path) -> None:
+    monkeypatch.setenv("SUMMARY_SHARED_CACHE_PATH", str(tmp_path / "summaries.bin"))
+    monkeypatch.setattr(transaction_index, "_index_cache", {})
+    builds: List[str] = []
+    original_build = transaction_index.build_transaction_index
+
+    def counting_build(persona_id: str) -> PersonaTransactionIndex:
+        builds.append(persona_id)
+        return original_build(persona_id)
+
+    monkeypatch.setattr(transaction_index, "build_transaction_index", counting_build)
+    client = TestClient(create_app())
+
+    def first_page() -> Any:
+        return client.get("/personas/single/transactions", params={"limit": 5}).json()
+
+    page = first_page()
+    assert first_page() == page
+    analytics.invalidate_finance_summary("single")
+    assert first_page() == page
+    # Another worker's invalidation only moves the shared version; this process must notice it too.
+    other_worker = SharedSummaryCache(tmp_path / "summaries.bin")
+    other_worker.invalidate("single")
+    other_worker.close()
+    assert first_page() == page
+
+    assert builds == ["single"] * 3